@@ -1,37 +1,228 @@
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_change import PanelChange, PanelChangePage, PanelChangeType
+from app.domain.model.value_objects.panel_event import PanelEvent, PanelEventType
+from app.domain.model.value_objects.panel_page import PanelPage
+from app.domain.model.value_objects.panel_revision import PanelRevision
+from app.domain.model.value_objects.panel_stats import PanelStatsDimension, PanelStatsGroup
+from app.domain.model.value_objects.panel_view import PanelView
 from app.domain.repositories.electronic_panel_repository import ElectronicPanelRepository
 from app.domain.services.electronic_panel_service import ElectronicPanelService
+from app.domain.services.panel_event_publisher import PanelEventPublisher
+from app.domain.exceptions.electronic_panel_exceptions import (
+    PanelChangesCompactedError,
+    PanelNotFoundError,
+    PanelVersionConflictError
+)
+
+
+def encode_cursor(panel_id: UUID) -> str:
+    """
+    Encode the last panel id of a page into an opaque cursor.
+    """
+    return base64.urlsafe_b64encode(panel_id.bytes).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> UUID:
+    """
+    Decode an opaque cursor back into the panel id it points after.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return UUID(bytes=base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeEncodeError, ValueError):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
 
 class ElectronicPanelServiceImpl(ElectronicPanelService):
     """
     Electronic Panel Service Implementation
+
+    Every committed write is reported to the event publisher, when one is
+    configured, as one event per affected panel. While nobody listens the
+    events are not built: the write only marks the gap, so that resuming
+    clients reload instead.
     """
     
-    def __init__(self, repository: ElectronicPanelRepository):
+    def __init__(self, repository: ElectronicPanelRepository, publisher: Optional[PanelEventPublisher] = None):
         self._electronic_panel_repository = repository
+        self._publisher = publisher
+
+    def _publishing(self) -> bool:
+        """
+        Whether events of a write are worth building; marks the gap when nobody listens.
+        """
+        if self._publisher is None:
+            return False
+        if not self._publisher.has_subscribers:
+            self._publisher.mark_unpublished()
+            return False
+        return True
+
+    def _publish(self, event_type: PanelEventType, panels: List[ElectronicPanel]) -> None:
+        if not panels or not self._publishing():
+            return
+        occurred_at = datetime.now(timezone.utc)
+        self._publisher.publish([PanelEvent(event_type, panel.id, panel, occurred_at) for panel in panels])
+
+    def _publish_updates(self, revisions: List[PanelRevision]) -> None:
+        if not revisions or not self._publishing():
+            return
+        occurred_at = datetime.now(timezone.utc)
+        self._publisher.publish([
+            PanelEvent(PanelEventType.UPDATED, revision.panel.id, revision.panel, occurred_at, revision.previous)
+            for revision in revisions
+        ])
     
     async def create_panel(self, panel: ElectronicPanel) -> ElectronicPanel:
         created_panel = await self._electronic_panel_repository.create(panel)
+        self._publish(PanelEventType.CREATED, [created_panel])
         return created_panel
+
+    async def create_panels(self, panels: List[ElectronicPanel], chunk_size: int) -> List[ElectronicPanel]:
+        if not panels:
+            return []
+        created_panels = await self._electronic_panel_repository.create_many(panels, chunk_size)
+        self._publish(PanelEventType.CREATED, created_panels)
+        return created_panels
     
     async def get_panel_by_id(self, panel_id: UUID) -> Optional[ElectronicPanel]:
         return await self._electronic_panel_repository.get_by_id(panel_id)
     
     async def list_all_panels(self) -> List[ElectronicPanel]:
         return await self._electronic_panel_repository.list_all()
+
+    async def list_panels(
+        self,
+        filters: PanelFilter,
+        limit: int,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> PanelPage:
+        after_id = decode_cursor(cursor) if cursor is not None else None
+        # Fetch one extra row to learn whether another page exists without counting.
+        panels = await self._electronic_panel_repository.list_page(filters, limit + 1, after_id)
+        next_cursor = None
+        if len(panels) > limit:
+            panels = panels[:limit]
+            next_cursor = encode_cursor(panels[-1].id)
+        total = None
+        if include_total:
+            total = await self._electronic_panel_repository.count(filters)
+        return PanelPage(items=panels, next_cursor=next_cursor, total=total)
+
+    def export_panels(self, filters: PanelFilter) -> AsyncIterator[PanelView]:
+        return self._electronic_panel_repository.stream(filters)
     
-    async def update_panel(self, panel_id: UUID, panel: ElectronicPanel) -> ElectronicPanel:
-        existing_entity = await self._electronic_panel_repository.get_by_id(panel_id)
-        if existing_entity is None:
-            raise ValueError(f"Electronic panel with ID {panel_id} not found")
-        updated_panel = await self._electronic_panel_repository.update(panel)
-        return updated_panel
+    async def update_panel(
+        self,
+        panel_id: UUID,
+        panel: ElectronicPanel,
+        expected_version: Optional[int] = None
+    ) -> ElectronicPanel:
+        revision = await self._electronic_panel_repository.update(panel, expected_version)
+        self._publish_updates([revision])
+        return revision.panel
+
+    async def patch_panel(
+        self,
+        panel_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> ElectronicPanel:
+        changes = ElectronicPanel.validate_patch(changes)
+        if not changes:
+            # Nothing to write: keep the version, the caches and the subscribers as they are.
+            panel = await self._electronic_panel_repository.get_by_id(panel_id)
+            if panel is None:
+                raise PanelNotFoundError(panel_id)
+            if expected_version is not None and panel.version != expected_version:
+                raise PanelVersionConflictError(panel_id, expected_version, panel.version)
+            return panel
+        revision = await self._electronic_panel_repository.patch(panel_id, changes, expected_version)
+        self._publish_updates([revision])
+        return revision.panel
     
+    async def update_panels(
+        self,
+        filters: PanelFilter,
+        changes: Dict[str, Any],
+        returning: bool = False
+    ) -> Tuple[int, List[ElectronicPanel]]:
+        changes = ElectronicPanel.validate_patch(changes)
+        if not changes:
+            raise ValueError("No fields to update")
+        # Events need the updated rows, so fetch them whenever someone listens.
+        publishing = self._publisher is not None and self._publisher.has_subscribers
+        updated_count, revisions = await self._electronic_panel_repository.update_where(
+            filters, changes, returning or publishing
+        )
+        if publishing:
+            self._publish_updates(revisions)
+        elif self._publisher is not None and updated_count:
+            self._publisher.mark_unpublished()
+        return updated_count, [revision.panel for revision in revisions] if returning else []
+
     async def delete_panel(self, panel_id: UUID) -> None:
-        exists = await self._electronic_panel_repository.exists(panel_id)
-        if not exists:
-            raise ValueError(f"Electronic panel with ID {panel_id} not found")
-        await self._electronic_panel_repository.delete(panel_id)
+        deleted = await self._electronic_panel_repository.delete(panel_id)
+        if not deleted:
+            raise PanelNotFoundError(panel_id)
+        if self._publishing():
+            self._publisher.publish([PanelEvent(PanelEventType.DELETED, panel_id, None, datetime.now(timezone.utc))])
+
+    async def get_panel_version(self, panel_id: UUID) -> Optional[Tuple[int, datetime]]:
+        return await self._electronic_panel_repository.get_version(panel_id)
+
+    async def get_panels_generation(self) -> Tuple[int, datetime]:
+        return await self._electronic_panel_repository.get_generation()
+
+    async def get_panel_stats(
+        self,
+        filters: PanelFilter,
+        group_by: List[PanelStatsDimension]
+    ) -> List[PanelStatsGroup]:
+        # Keep the requested order but drop duplicates, they would only repeat columns.
+        return await self._electronic_panel_repository.stats(filters, list(dict.fromkeys(group_by)))
+
+    async def search_panels(self, query: str, filters: PanelFilter, limit: int) -> List[PanelView]:
+        return await self._electronic_panel_repository.search(query, filters, limit)
+
+    async def list_changes(self, since: int, limit: int, client_id: Optional[str] = None) -> PanelChangePage:
+        if since < 0:
+            raise ValueError(f"since ({since}) must be >= 0")
+        # Fetch one extra entry to learn whether more changes follow.
+        compacted_through, entries = await self._electronic_panel_repository.list_changes(since, limit + 1)
+        # A sync from 0 starts from an empty copy, so the pruned tombstones never mattered to it.
+        if 0 < since < compacted_through:
+            raise PanelChangesCompactedError(since, compacted_through)
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        latest: Dict[UUID, PanelChange] = {}
+        for change in entries:
+            if change.type == PanelChangeType.UPSERT and change.panel is None:
+                # Deleted since; its tombstone comes later in the log.
+                continue
+            latest.pop(change.panel_id, None)
+            latest[change.panel_id] = change
+
+        next_since = entries[-1].seq if entries else since
+        if since == 0 and not has_more:
+            # A full copy read to the end already lacks every panel whose tombstone was pruned.
+            next_since = max(next_since, compacted_through)
+        if client_id is not None and since > 0:
+            await self._electronic_panel_repository.record_sync_client(client_id, since)
+        return PanelChangePage(
+            changes=list(latest.values()),
+            next_since=next_since,
+            has_more=has_more
+        )
+
+    async def compact_changes(self, tombstone_retention: timedelta, client_ttl: timedelta) -> Tuple[int, int]:
+        return await self._electronic_panel_repository.compact_changes(tombstone_retention, client_ttl)
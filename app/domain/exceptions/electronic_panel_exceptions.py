@@ -0,0 +1,41 @@
+from uuid import UUID
+from typing import Optional
+
+
+class PanelVersionConflictError(ValueError):
+    """
+    Raised when a panel was modified after the version the caller based its change on.
+    """
+
+    def __init__(self, panel_id: UUID, expected_version: int, current_version: Optional[int] = None):
+        self.panel_id = panel_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+        super().__init__(
+            f"Electronic panel with ID {panel_id} is at version {current_version}, "
+            f"expected version {expected_version}"
+        )
+
+
+class PanelNotFoundError(ValueError):
+    """
+    Raised when a single-panel write targets a panel that does not exist.
+    """
+
+    def __init__(self, panel_id: UUID):
+        self.panel_id = panel_id
+        super().__init__(f"Electronic panel with ID {panel_id} not found")
+
+
+class PanelChangesCompactedError(ValueError):
+    """
+    Raised when a delta sync starts before the oldest change the log still holds.
+    """
+
+    def __init__(self, since: int, compacted_through: int):
+        self.since = since
+        self.compacted_through = compacted_through
+        super().__init__(
+            f"Changes up to {compacted_through} were compacted; "
+            f"cannot sync from {since}, resynchronize from 0"
+        )
@@ -1,6 +1,7 @@
 import uuid 
-from datetime import date
+from datetime import date, datetime, timezone
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field 
 
 from pydantic import (
@@ -24,9 +25,19 @@ class ElectronicPanel(SQLModel, table=True):
         state (PanelState): Current state of the electronic panel.
         year_manufactured (int): Year the electronic panel was manufactured.
         year_installed (int): Year the electronic panel was installed.
+        version (int): Row version, incremented on every update.
+        updated_at (datetime): When the electronic panel was last written (UTC).
     """
     
     __tablename__ = "electronic_panels"
+    __table_args__ = (
+        Index("ix_electronic_panels_state_location", "state", "location"),
+        Index("ix_electronic_panels_state_id", "state", "id"),
+        Index("ix_electronic_panels_location_id", "location", "id"),
+        Index("ix_electronic_panels_brand_id", "brand", "id"),
+        Index("ix_electronic_panels_year_manufactured", "year_manufactured"),
+        Index("ix_electronic_panels_year_installed", "year_installed"),
+    )
     
     model_config = {
         "validate_assignment": True,
@@ -44,6 +55,9 @@ class ElectronicPanel(SQLModel, table=True):
     year_manufactured: int = Field(..., ge=1900)
     year_installed: int = Field(..., ge=1900)
 
+    version: int = Field(default=1, ge=1)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
     @validator("year_manufactured", "year_installed", mode="after")
     def _year_not_in_future(cls, value: int, info: ValidationInfo):
         """
@@ -70,6 +84,29 @@ class ElectronicPanel(SQLModel, table=True):
             )
         return self
     
+    @classmethod
+    def validate_patch(cls, changes: dict) -> dict:
+        """
+        Validate a partial set of field values against the panel rules.
+
+        Field rules are applied to every value, and the installation-year rule
+        is applied when both years are part of the patch. Returns the coerced
+        values.
+        """
+        current_year = date.today().year
+        probe = cls(
+            name="probe",
+            location="probe",
+            amperage_capacity=1,
+            year_manufactured=1900,
+            year_installed=current_year
+        )
+        for field, value in changes.items():
+            if field not in cls.model_fields or field in ("id", "version", "updated_at"):
+                raise ValueError(f"Field '{field}' cannot be updated")
+            setattr(probe, field, value)
+        return {field: getattr(probe, field) for field in changes}
+    
     @validator("state", mode="before")
     def _validate_state(cls, value, info: ValidationInfo):
         """
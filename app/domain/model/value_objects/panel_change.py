@@ -0,0 +1,53 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, NamedTuple, Optional
+from uuid import UUID
+from pydantic import BaseModel, SkipValidation
+
+from app.domain.model.value_objects.panel_view import PanelView
+
+
+class PanelChangeType(str, Enum):
+    """
+    Kind of entry in the panel change log.
+
+    Attributes:
+        UPSERT (str): The panel was created or updated.
+        DELETE (str): The panel was deleted (tombstone).
+    """
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class PanelChange(NamedTuple):
+    """
+    One entry of the panel change log.
+
+    Attributes:
+        seq (int): Position in the change log; strictly increasing.
+        type (PanelChangeType): Whether the panel was upserted or deleted.
+        panel_id (UUID): Identifier of the changed panel.
+        panel (Optional[PanelView]): Current state of the panel; None for deletions.
+        changed_at (datetime): When the change was written (UTC).
+    """
+
+    seq: int
+    type: PanelChangeType
+    panel_id: UUID
+    panel: Optional[PanelView]
+    changed_at: datetime
+
+
+class PanelChangePage(BaseModel):
+    """
+    A page of the change log, in sequence order.
+
+    Attributes:
+        changes (List[PanelChange]): At most one change per panel, its latest in the page.
+        next_since (int): Sequence number to pass as `since` for the next page.
+        has_more (bool): Whether more changes follow right away.
+    """
+
+    changes: SkipValidation[List[PanelChange]]
+    next_since: int
+    has_more: bool
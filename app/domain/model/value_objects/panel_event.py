@@ -0,0 +1,35 @@
+from datetime import datetime
+from enum import Enum
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_revision import PanelPlacement
+
+
+class PanelEventType(str, Enum):
+    """
+    Kind of change a panel event reports.
+    """
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+class PanelEvent(NamedTuple):
+    """
+    A committed change to one electronic panel, as published by the service layer.
+
+    Attributes:
+        type (PanelEventType): What happened to the panel.
+        panel_id (UUID): Identifier of the changed panel.
+        panel (Optional[ElectronicPanel]): The panel as written; None for deletions.
+        occurred_at (datetime): When the change was published (UTC).
+        previous (Optional[PanelPlacement]): Location and state before an update; None otherwise.
+    """
+
+    type: PanelEventType
+    panel_id: UUID
+    panel: Optional[ElectronicPanel]
+    occurred_at: datetime
+    previous: Optional[PanelPlacement] = None
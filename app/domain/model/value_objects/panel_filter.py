@@ -0,0 +1,69 @@
+from typing import Hashable, List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field, model_validator
+
+from app.domain.model.value_objects.panel_state import PanelState
+
+
+class PanelFilter(BaseModel):
+    """
+    Criteria used to narrow down queries over electronic panels.
+
+    Every criterion is optional; unset criteria do not restrict the result.
+    Range bounds are inclusive.
+
+    Attributes:
+        ids (Optional[List[UUID]]): Only panels with one of these ids.
+        state (Optional[PanelState]): Only panels in this state.
+        location (Optional[str]): Only panels at this exact location.
+        brand (Optional[str]): Only panels of this exact brand.
+        year_manufactured_from (Optional[int]): Lower bound for year_manufactured.
+        year_manufactured_to (Optional[int]): Upper bound for year_manufactured.
+        year_installed_from (Optional[int]): Lower bound for year_installed.
+        year_installed_to (Optional[int]): Upper bound for year_installed.
+        amperage_min (Optional[float]): Lower bound for amperage_capacity.
+        amperage_max (Optional[float]): Upper bound for amperage_capacity.
+    """
+
+    model_config = {
+        "frozen": True
+    }
+
+    ids: Optional[List[UUID]] = None
+    state: Optional[PanelState] = None
+    location: Optional[str] = Field(default=None, min_length=1, max_length=200)
+    brand: Optional[str] = Field(default=None, min_length=1, max_length=100)
+
+    year_manufactured_from: Optional[int] = None
+    year_manufactured_to: Optional[int] = None
+    year_installed_from: Optional[int] = None
+    year_installed_to: Optional[int] = None
+
+    amperage_min: Optional[float] = None
+    amperage_max: Optional[float] = None
+
+    def key(self) -> Hashable:
+        """
+        Hashable form of the criteria, for caches keyed by query (the id list is not hashable as is).
+        """
+        return tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in self
+        )
+
+    @model_validator(mode="after")
+    def _validate_ranges(self) -> "PanelFilter":
+        """
+        Ensure that every range has its lower bound below its upper bound.
+        """
+        ranges = (
+            ("year_manufactured_from", "year_manufactured_to"),
+            ("year_installed_from", "year_installed_to"),
+            ("amperage_min", "amperage_max"),
+        )
+        for lower_name, upper_name in ranges:
+            lower = getattr(self, lower_name)
+            upper = getattr(self, upper_name)
+            if lower is not None and upper is not None and lower > upper:
+                raise ValueError(f"{lower_name} ({lower}) must be <= {upper_name} ({upper})")
+        return self
@@ -0,0 +1,29 @@
+from enum import Enum
+
+
+class PanelImportFormat(str, Enum):
+    """
+    File formats accepted by panel imports.
+
+    Attributes:
+        CSV (str): Comma-separated values with a header row naming the panel fields.
+        NDJSON (str): One JSON object per line.
+    """
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class PanelImportStatus(str, Enum):
+    """
+    Lifecycle of a panel import job.
+
+    Attributes:
+        QUEUED (str): Spooled and waiting for the import worker.
+        RUNNING (str): Being imported; also the state of a job interrupted by a shutdown.
+        COMPLETED (str): Every row was read; rejected rows are in the error report.
+        FAILED (str): Stopped by an error other than an invalid row.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
@@ -0,0 +1,20 @@
+from typing import List, Optional
+from pydantic import BaseModel, SkipValidation
+
+from app.domain.model.value_objects.panel_view import PanelView
+
+
+class PanelPage(BaseModel):
+    """
+    A single page of electronic panels produced by keyset pagination.
+
+    Attributes:
+        items (List[PanelView]): Panels in this page, ordered by id.
+        next_cursor (Optional[str]): Opaque cursor for the next page, None on the last page.
+        total (Optional[int]): Number of panels matching the filter, only when requested.
+    """
+
+    # Rows come straight from the database, re-validating them would undo the point of PanelView.
+    items: SkipValidation[List[PanelView]]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
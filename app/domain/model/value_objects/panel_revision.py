@@ -0,0 +1,30 @@
+from typing import NamedTuple
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_state import PanelState
+
+
+class PanelPlacement(NamedTuple):
+    """
+    Where a panel is and what state it is in: the fields change subscribers filter on.
+
+    Attributes:
+        location (str): Physical location of the electronic panel.
+        state (PanelState): State of the electronic panel.
+    """
+
+    location: str
+    state: PanelState
+
+
+class PanelRevision(NamedTuple):
+    """
+    A panel as an update left it, with its placement from before the update.
+
+    Attributes:
+        panel (ElectronicPanel): The panel as written.
+        previous (PanelPlacement): Location and state the panel had before, read in the same transaction.
+    """
+
+    panel: ElectronicPanel
+    previous: PanelPlacement
@@ -0,0 +1,33 @@
+from enum import Enum
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+
+
+class PanelStatsDimension(str, Enum):
+    """
+    Panel attributes that fleet statistics can be grouped by.
+    """
+    STATE = "state"
+    LOCATION = "location"
+    BRAND = "brand"
+    YEAR_MANUFACTURED = "year_manufactured"
+    YEAR_INSTALLED = "year_installed"
+
+
+class PanelStatsGroup(BaseModel):
+    """
+    Aggregates over the panels sharing the same values for the grouped dimensions.
+
+    Attributes:
+        dimensions (Dict[str, Any]): Value of each grouped dimension; empty for the global rollup.
+        panel_count (int): Number of panels in the group.
+        amperage_total (float): Sum of amperage_capacity over the group.
+    """
+
+    dimensions: Dict[str, Any]
+    panel_count: int
+    amperage_total: float
+
+    @property
+    def amperage_average(self) -> Optional[float]:
+        return self.amperage_total / self.panel_count if self.panel_count else None
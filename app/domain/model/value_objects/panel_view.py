@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from app.domain.model.value_objects.panel_state import PanelState
+
+
+class PanelView(NamedTuple):
+    """
+    Immutable, read-only snapshot of an electronic panel row.
+
+    Read queries hydrate it straight from column tuples, skipping the
+    SQLModel/Pydantic validation and ORM bookkeeping an ElectronicPanel
+    entity costs; the values were validated when the row was written.
+    Use ElectronicPanel for anything that writes.
+
+    Attributes:
+        id (UUID): Unique identifier for the electronic panel.
+        name (str): Name of the electronic panel.
+        location (str): Physical location of the electronic panel.
+        brand (Optional[str]): Brand of the electronic panel.
+        amperage_capacity (float): Amperage capacity of the electronic panel.
+        state (PanelState): Current state of the electronic panel.
+        year_manufactured (int): Year the electronic panel was manufactured.
+        year_installed (int): Year the electronic panel was installed.
+        version (int): Row version, incremented on every update.
+        updated_at (datetime): When the electronic panel was last written (UTC).
+    """
+
+    id: UUID
+    name: str
+    location: str
+    brand: Optional[str]
+    amperage_capacity: float
+    state: PanelState
+    year_manufactured: int
+    year_installed: int
+    version: int
+    updated_at: datetime
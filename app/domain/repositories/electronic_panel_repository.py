@@ -1,7 +1,13 @@
+from datetime import datetime, timedelta
 from uuid import UUID
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
 from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_change import PanelChange
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_revision import PanelRevision
+from app.domain.model.value_objects.panel_stats import PanelStatsDimension, PanelStatsGroup
+from app.domain.model.value_objects.panel_view import PanelView
 
 class ElectronicPanelRepository(ABC):
     """
@@ -11,6 +17,10 @@ class ElectronicPanelRepository(ABC):
     async def create(self, panel: ElectronicPanel) -> ElectronicPanel:
         raise NotImplementedError()
     
+    @abstractmethod
+    async def create_many(self, panels: List[ElectronicPanel], chunk_size: int) -> List[ElectronicPanel]:
+        raise NotImplementedError()
+    
     @abstractmethod
     async def get_by_id(self, panel_id: UUID) -> Optional[ElectronicPanel]:
         raise NotImplementedError()
@@ -18,9 +28,44 @@ class ElectronicPanelRepository(ABC):
     @abstractmethod
     async def list_all(self) -> List[ElectronicPanel]:
         raise NotImplementedError()
+
+    @abstractmethod
+    async def list_page(
+        self,
+        filters: PanelFilter,
+        limit: int,
+        after_id: Optional[UUID] = None
+    ) -> List[PanelView]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def count(self, filters: PanelFilter) -> int:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def stream(self, filters: PanelFilter) -> AsyncIterator[PanelView]:
+        raise NotImplementedError()
+    
+    @abstractmethod
+    async def update(self, panel: ElectronicPanel, expected_version: Optional[int] = None) -> PanelRevision:
+        raise NotImplementedError()
     
     @abstractmethod
-    async def update(self, panel: ElectronicPanel) -> ElectronicPanel:
+    async def patch(
+        self,
+        panel_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> PanelRevision:
+        raise NotImplementedError()
+    
+    @abstractmethod
+    async def update_where(
+        self,
+        filters: PanelFilter,
+        changes: Dict[str, Any],
+        returning: bool = False
+    ) -> Tuple[int, List[PanelRevision]]:
         raise NotImplementedError()
     
     @abstractmethod
@@ -30,3 +75,39 @@ class ElectronicPanelRepository(ABC):
     @abstractmethod
     async def exists(self, panel_id: UUID) -> bool:
         raise NotImplementedError()
+
+    @abstractmethod
+    async def get_version(self, panel_id: UUID) -> Optional[Tuple[int, datetime]]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_generation(self) -> Tuple[int, datetime]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def stats(
+        self,
+        filters: PanelFilter,
+        group_by: List[PanelStatsDimension]
+    ) -> List[PanelStatsGroup]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def search(self, query: str, filters: PanelFilter, limit: int) -> List[PanelView]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def list_changes(self, since: int, limit: int) -> Tuple[int, List[PanelChange]]:
+        """
+        Read up to `limit` change log entries after `since`, in sequence order,
+        together with the log's compacted_through, from one snapshot.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def record_sync_client(self, client_id: str, since: int) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def compact_changes(self, tombstone_retention: timedelta, client_ttl: timedelta) -> Tuple[int, int]:
+        raise NotImplementedError()
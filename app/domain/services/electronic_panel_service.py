@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_change import PanelChangePage
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_page import PanelPage
+from app.domain.model.value_objects.panel_stats import PanelStatsDimension, PanelStatsGroup
+from app.domain.model.value_objects.panel_view import PanelView
 
 
 class ElectronicPanelService(ABC):
@@ -14,6 +20,10 @@ class ElectronicPanelService(ABC):
     async def create_panel(self, panel: ElectronicPanel) -> ElectronicPanel:
         raise NotImplementedError()
     
+    @abstractmethod
+    async def create_panels(self, panels: List[ElectronicPanel], chunk_size: int) -> List[ElectronicPanel]:
+        raise NotImplementedError()
+    
     @abstractmethod
     async def get_panel_by_id(self, panel_id: UUID) -> Optional[ElectronicPanel]:
         raise NotImplementedError()
@@ -21,11 +31,76 @@ class ElectronicPanelService(ABC):
     @abstractmethod
     async def list_all_panels(self) -> List[ElectronicPanel]:
         raise NotImplementedError()
+
+    @abstractmethod
+    async def list_panels(
+        self,
+        filters: PanelFilter,
+        limit: int,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> PanelPage:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def export_panels(self, filters: PanelFilter) -> AsyncIterator[PanelView]:
+        raise NotImplementedError()
     
     @abstractmethod
-    async def update_panel(self, panel_id: UUID, panel: ElectronicPanel) -> ElectronicPanel:
+    async def update_panel(
+        self,
+        panel_id: UUID,
+        panel: ElectronicPanel,
+        expected_version: Optional[int] = None
+    ) -> ElectronicPanel:
+        raise NotImplementedError()
+    
+    @abstractmethod
+    async def patch_panel(
+        self,
+        panel_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> ElectronicPanel:
+        raise NotImplementedError()
+    
+    @abstractmethod
+    async def update_panels(
+        self,
+        filters: PanelFilter,
+        changes: Dict[str, Any],
+        returning: bool = False
+    ) -> Tuple[int, List[ElectronicPanel]]:
         raise NotImplementedError()
     
     @abstractmethod
     async def delete_panel(self, panel_id: UUID) -> None:
         raise NotImplementedError()
+
+    @abstractmethod
+    async def get_panel_version(self, panel_id: UUID) -> Optional[Tuple[int, datetime]]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_panels_generation(self) -> Tuple[int, datetime]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_panel_stats(
+        self,
+        filters: PanelFilter,
+        group_by: List[PanelStatsDimension]
+    ) -> List[PanelStatsGroup]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def search_panels(self, query: str, filters: PanelFilter, limit: int) -> List[PanelView]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def list_changes(self, since: int, limit: int, client_id: Optional[str] = None) -> PanelChangePage:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def compact_changes(self, tombstone_retention: timedelta, client_ttl: timedelta) -> Tuple[int, int]:
+        raise NotImplementedError()
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from app.domain.model.value_objects.panel_event import PanelEvent
+
+
+class PanelEventPublisher(ABC):
+    """
+    Abstract outlet for panel change events, fed by the service layer after every committed write.
+    """
+
+    @property
+    @abstractmethod
+    def has_subscribers(self) -> bool:
+        """
+        Whether anyone listens; lets callers skip work that only feeds events.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def publish(self, events: List[PanelEvent]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def mark_unpublished(self) -> None:
+        """
+        Record that a committed write was not published, so nobody resumes across it.
+        """
+        raise NotImplementedError()
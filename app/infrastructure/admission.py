@@ -0,0 +1,166 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# Weight of the latest request in the moving average of how long a slot is held.
+HOLD_TIME_SMOOTHING = 0.2
+MAX_RETRY_AFTER_SECONDS = 60
+
+READ_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class AdmissionRejectedError(Exception):
+    """
+    Raised when a request is shed instead of being admitted.
+
+    Attributes:
+        reason (str): "queue_full" or "deadline".
+        retry_after (int): Seconds after which a retry is likely to be admitted.
+    """
+
+    def __init__(self, route_class: str, reason: str, retry_after: int) -> None:
+        self.reason = reason
+        self.retry_after = retry_after
+        if reason == "queue_full":
+            detail = f"Too many {route_class} requests are waiting"
+        else:
+            detail = f"The {route_class} request could not be started before its deadline"
+        super().__init__(detail)
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit for one class of requests, with a bounded FIFO wait queue.
+
+    At most `max_concurrency` requests hold a slot at a time; up to
+    `max_queue` more wait for one, at most `max_wait_seconds` or until their
+    deadline, whichever comes first. Anything beyond is rejected at once
+    with AdmissionRejectedError, so excess load fails fast instead of piling
+    up in the connection pools.
+
+    The time a slot is held is tracked as a moving average. It predicts how
+    long a newcomer would wait: a request that would not get a slot before
+    its deadline is rejected immediately rather than after waiting in vain,
+    and the same estimate gives the Retry-After of rejected requests.
+
+    A released slot is handed directly to the oldest waiter. Not
+    thread-safe; meant to be used from a single event loop.
+    """
+
+    def __init__(self, route_class: str, max_concurrency: int, max_queue: int, max_wait_seconds: float) -> None:
+        self.route_class = route_class
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._hold_seconds = 0.0
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_deadline = 0
+        self.wait_seconds = 0.0
+
+    def expected_wait(self) -> float:
+        """
+        Estimated seconds until a request arriving now would get a slot.
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            return 0.0
+        return self._hold_seconds * (len(self._waiters) + 1) / self.max_concurrency
+
+    def retry_after(self) -> int:
+        return min(MAX_RETRY_AFTER_SECONDS, max(1, math.ceil(self.expected_wait())))
+
+    def _reject(self, reason: str) -> AdmissionRejectedError:
+        if reason == "queue_full":
+            self.shed_queue_full += 1
+        else:
+            self.shed_deadline += 1
+        return AdmissionRejectedError(self.route_class, reason, self.retry_after())
+
+    async def acquire(self, deadline: Optional[float] = None) -> None:
+        """
+        Wait for a slot.
+
+        Args:
+            deadline (Optional[float]): time.monotonic() by which the slot must be granted.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the slot would come too late.
+        """
+        timeout = self.max_wait_seconds
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+        if timeout <= 0:
+            raise self._reject("deadline")
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full")
+        if self.expected_wait() > timeout:
+            raise self._reject("deadline")
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait((waiter,), timeout=timeout)
+        except BaseException:
+            if waiter.done():
+                # Handed a slot just as the request was cancelled.
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        finally:
+            self.wait_seconds += time.monotonic() - started
+        if not waiter.done():
+            self._waiters.remove(waiter)
+            raise self._reject("deadline")
+        self.admitted += 1
+
+    def release(self, held_seconds: Optional[float] = None) -> None:
+        if held_seconds is not None:
+            self._hold_seconds += HOLD_TIME_SMOOTHING * (held_seconds - self._hold_seconds)
+        if self._waiters:
+            # The slot passes to the oldest waiter, so in_flight stays the same.
+            self._waiters.popleft().set_result(None)
+        else:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_deadline": self.shed_deadline,
+            "wait_seconds": self.wait_seconds
+        }
+
+
+class AdmissionController:
+    """
+    The admission limiters of the database-bound routes: one for reads, one for writes.
+
+    Reads and writes are limited separately, so a backlog of writes
+    contending for the SQLite writer lock does not hold up reads, which run
+    on their own engine.
+    """
+
+    def __init__(self, read: AdmissionLimiter, write: AdmissionLimiter) -> None:
+        self.read = read
+        self.write = write
+
+    def limiter_for(self, method: str) -> AdmissionLimiter:
+        return self.read if method in READ_METHODS else self.write
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            **{f"read_{key}": value for key, value in self.read.stats().items()},
+            **{f"write_{key}": value for key, value in self.write.stats().items()}
+        }
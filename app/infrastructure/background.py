@@ -0,0 +1,20 @@
+import asyncio
+
+# How long to wait for a cancelled task before cancelling it again.
+CANCEL_RETRY_SECONDS = 0.5
+
+
+async def cancel_and_wait(task: asyncio.Task) -> None:
+    """
+    Cancel a background task and wait until it has finished.
+
+    A cancellation that arrives while SQLAlchemy resets a pooled aiosqlite
+    connection can be swallowed there, leaving the task running, so it is
+    repeated until the task ends. Exceptions other than the cancellation
+    propagate.
+    """
+    while not task.done():
+        task.cancel()
+        await asyncio.wait({task}, timeout=CANCEL_RETRY_SECONDS)
+    if not task.cancelled():
+        task.result()
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Dict, Optional
+
+from app.domain.services.electronic_panel_service import ElectronicPanelService
+from app.infrastructure.background import cancel_and_wait
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeLogCompactor:
+    """
+    Background task that compacts the panel change log at a fixed interval.
+
+    Compaction is idempotent, so several worker processes may run it
+    against the same database. A failed run is logged and retried at the
+    next interval.
+    """
+
+    def __init__(
+        self,
+        service: ElectronicPanelService,
+        interval_seconds: float,
+        tombstone_retention: timedelta,
+        client_ttl: timedelta
+    ) -> None:
+        self._service = service
+        self._interval_seconds = interval_seconds
+        self._tombstone_retention = tombstone_retention
+        self._client_ttl = client_ttl
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.pruned_entries = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {"runs": self.runs, "pruned_entries": self.pruned_entries}
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="change-log-compactor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        await cancel_and_wait(self._task)
+        self._task = None
+
+    async def compact(self) -> None:
+        pruned, compacted_through = await self._service.compact_changes(self._tombstone_retention, self._client_ttl)
+        self.runs += 1
+        self.pruned_entries += pruned
+        logger.info("Compacted the change log: %d entries pruned, compacted through %d", pruned, compacted_through)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_seconds)
+            try:
+                await self.compact()
+            except Exception:
+                logger.exception("Change log compaction failed")
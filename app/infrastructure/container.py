@@ -0,0 +1,284 @@
+import importlib
+import logging
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.domain.repositories.electronic_panel_repository import ElectronicPanelRepository
+from app.domain.services.electronic_panel_service import ElectronicPanelService
+from app.infrastructure import db
+from app.infrastructure.metrics import REGISTRY
+from app.infrastructure.settings import Settings
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from app.infrastructure.admission import AdmissionController
+    from app.infrastructure.event_broker import PanelEventBroker
+    from app.infrastructure.panel_importer import PanelImporter
+    from app.infrastructure.profiling import ProfileStore
+    from app.infrastructure.response_cache import ResponseCache
+    from app.infrastructure.write_batcher import WriteBatcher
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[[], Awaitable[None]]
+
+STARTUP_SECONDS = REGISTRY.gauge(
+    "app_startup_seconds",
+    "Time spent in each startup hook of the application container.",
+    ("hook",)
+)
+
+
+def _sqlmodel_repository(container: "Container") -> ElectronicPanelRepository:
+    from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import ElectronicPanelSQLModelRepository
+
+    return ElectronicPanelSQLModelRepository(
+        db.get_async_session_factory(),
+        db.get_async_read_session_factory(),
+        container.write_batcher
+    )
+
+
+def _sharded_repository(container: "Container") -> ElectronicPanelRepository:
+    from app.infrastructure.repositories.electronic_panel_sharded_repository import create_sharded_repository
+
+    return create_sharded_repository(container)
+
+
+# Repository implementations selectable through REMS_PANEL_REPOSITORY.
+PANEL_REPOSITORIES: Dict[str, Callable[["Container"], ElectronicPanelRepository]] = {
+    "sqlmodel": _sqlmodel_repository,
+    "sharded": _sharded_repository,
+}
+
+
+def _resolve_repository_factory(name: str) -> Callable[["Container"], ElectronicPanelRepository]:
+    """
+    Look up a repository factory by registered name or by "package.module:factory" path.
+    """
+    if name in PANEL_REPOSITORIES:
+        return PANEL_REPOSITORIES[name]
+    module_name, _, attribute = name.partition(":")
+    if not attribute:
+        known = ", ".join(sorted(PANEL_REPOSITORIES))
+        raise ValueError(f"Unknown panel repository '{name}'. Known: {known}, or use 'package.module:factory'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class Container:
+    """
+    Application-scoped object graph, built once by the lifespan and kept on app.state.
+
+    Holds the long-lived components (write batcher, repository chain,
+    event broker, response cache, service, panel importer, admission controller,
+    profile store) and runs their startup and shutdown hooks.
+    Optional components are imported only when the settings enable them.
+    Startup hooks run in registration order and are timed; shutdown hooks
+    run in reverse order and all of them run even if one fails.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self.startup_timings: Dict[str, float] = {}
+        self._startup_hooks: List[Tuple[str, Hook]] = []
+        self._shutdown_hooks: List[Tuple[str, Hook]] = []
+        self._profile_store: Optional["ProfileStore"] = None
+        # Engines of databases beyond the main one (shards), checked by /health.
+        self.database_engines: List["AsyncEngine"] = []
+
+        self.on_startup("database", db.init_db)
+        self.on_shutdown("database", db.dispose_engines)
+
+        self.write_batcher = self._build_write_batcher()
+        self.panel_repository = self._build_panel_repository()
+        self.event_broker = self._build_event_broker()
+        self.response_cache = self._build_response_cache()
+
+        from app.application.internal.services.electronic_panel_service_impl import ElectronicPanelServiceImpl
+        self.panel_service: ElectronicPanelService = ElectronicPanelServiceImpl(
+            self.panel_repository,
+            self.event_broker
+        )
+        self._schedule_change_log_compaction()
+        self.panel_importer = self._build_panel_importer()
+        self.admission_controller = self._build_admission_controller()
+
+    def on_startup(self, name: str, hook: Hook) -> None:
+        self._startup_hooks.append((name, hook))
+
+    def on_shutdown(self, name: str, hook: Hook) -> None:
+        self._shutdown_hooks.append((name, hook))
+
+    def export_stats(self, prefix: str, stats: Callable[[], Dict[str, float]], counters: Tuple[str, ...]) -> None:
+        if not self.settings.metrics_enabled:
+            return
+        collector = REGISTRY.add_stats_collector(prefix, stats, counters)
+
+        async def remove() -> None:
+            REGISTRY.remove_collector(collector)
+
+        self.on_shutdown(f"{prefix} metrics", remove)
+
+    def _build_write_batcher(self) -> Optional["WriteBatcher"]:
+        if not self.settings.write_batching_enabled:
+            return None
+        from app.infrastructure.write_batcher import WriteBatcher
+
+        write_batcher = WriteBatcher(
+            db.get_async_session_factory(),
+            max_batch_size=self.settings.write_batch_max_size,
+            max_wait_ms=self.settings.write_batch_max_wait_ms
+        )
+        self.on_startup("write batcher", write_batcher.start)
+        # Registered after the database hook, so it runs first: pending writes are drained before engines close.
+        self.on_shutdown("write batcher", write_batcher.stop)
+        self.export_stats("write_batcher", write_batcher.stats, ("batches", "operations", "failed_operations"))
+        return write_batcher
+
+    def _build_panel_repository(self) -> ElectronicPanelRepository:
+        repository = _resolve_repository_factory(self.settings.panel_repository)(self)
+        if self.settings.panel_cache_enabled:
+            from app.infrastructure.repositories.electronic_panel_caching_repository import CachingElectronicPanelRepository
+
+            repository = CachingElectronicPanelRepository(
+                repository,
+                max_entries=self.settings.panel_cache_max_entries,
+                ttl_seconds=self.settings.panel_cache_ttl_seconds,
+                negative_ttl_seconds=self.settings.panel_cache_negative_ttl_seconds
+            )
+            self.export_stats(
+                "panel_cache",
+                repository.cache_stats,
+                ("hits", "misses", "evictions", "expirations", "negative_hits")
+            )
+        if self.settings.read_coalescing_enabled:
+            from app.infrastructure.repositories.electronic_panel_coalescing_repository import CoalescingElectronicPanelRepository
+
+            # Outermost, so it sees every write the service makes.
+            repository = CoalescingElectronicPanelRepository(repository)
+            self.export_stats("read_coalescing", repository.coalescing_stats, ("calls", "coalesced"))
+        return repository
+
+    def _build_event_broker(self) -> Optional["PanelEventBroker"]:
+        if not self.settings.events_enabled:
+            return None
+        from app.infrastructure.event_broker import PanelEventBroker
+
+        event_broker = PanelEventBroker(
+            buffer_size=self.settings.events_buffer_size,
+            queue_size=self.settings.events_queue_size,
+            max_subscribers=self.settings.events_max_subscribers
+        )
+        self.on_shutdown("event broker", event_broker.close)
+        self.export_stats("panel_events", event_broker.stats, ("published", "delivered", "evicted"))
+        return event_broker
+
+    def _build_response_cache(self) -> Optional["ResponseCache"]:
+        if not self.settings.response_cache_enabled:
+            return None
+        from app.infrastructure.response_cache import ResponseCache
+
+        response_cache = ResponseCache(self.settings.response_cache_max_bytes)
+        self.export_stats("response_cache", response_cache.stats, ("hits", "misses", "stores", "evictions"))
+        return response_cache
+
+    def _schedule_change_log_compaction(self) -> None:
+        if not self.settings.changes_compaction_interval_seconds:
+            return
+        from app.infrastructure.change_log_compactor import ChangeLogCompactor
+
+        compactor = ChangeLogCompactor(
+            self.panel_service,
+            interval_seconds=self.settings.changes_compaction_interval_seconds,
+            tombstone_retention=timedelta(hours=self.settings.changes_tombstone_retention_hours),
+            client_ttl=timedelta(days=self.settings.changes_client_ttl_days)
+        )
+        self.on_startup("change log compactor", compactor.start)
+        self.on_shutdown("change log compactor", compactor.stop)
+        self.export_stats("change_log_compactor", compactor.stats, ("runs", "pruned_entries"))
+
+    def _build_panel_importer(self) -> Optional["PanelImporter"]:
+        if not self.settings.imports_enabled:
+            return None
+        from app.infrastructure.panel_importer import PanelImporter
+
+        panel_importer = PanelImporter(
+            self.panel_service,
+            db.get_async_session_factory(),
+            db.get_async_read_session_factory(),
+            spool_dir=db.imports_spool_dir(self.settings),
+            max_bytes=self.settings.imports_max_bytes,
+            chunk_rows=self.settings.imports_chunk_rows,
+            insert_chunk_size=self.settings.bulk_insert_chunk_size,
+            validation_workers=self.settings.imports_validation_workers
+        )
+        self.on_startup("panel importer", panel_importer.start)
+        self.on_shutdown("panel importer", panel_importer.stop)
+        self.export_stats(
+            "panel_imports",
+            panel_importer.stats,
+            ("jobs_completed", "jobs_failed", "rows_imported", "rows_rejected")
+        )
+        return panel_importer
+
+    def _build_admission_controller(self) -> Optional["AdmissionController"]:
+        if not self.settings.admission_control_enabled:
+            return None
+        from app.infrastructure.admission import AdmissionController, AdmissionLimiter
+
+        admission_controller = AdmissionController(
+            read=AdmissionLimiter(
+                "read",
+                max_concurrency=self.settings.admission_read_concurrency,
+                max_queue=self.settings.admission_read_queue_size,
+                max_wait_seconds=self.settings.admission_max_wait_seconds
+            ),
+            write=AdmissionLimiter(
+                "write",
+                max_concurrency=self.settings.admission_write_concurrency,
+                max_queue=self.settings.admission_write_queue_size,
+                max_wait_seconds=self.settings.admission_max_wait_seconds
+            )
+        )
+        self.export_stats(
+            "admission",
+            admission_controller.stats,
+            tuple(
+                f"{route_class}_{key}"
+                for route_class in ("read", "write")
+                for key in ("admitted", "shed_queue_full", "shed_deadline", "wait_seconds")
+            )
+        )
+        return admission_controller
+
+    @property
+    def profile_store(self) -> "ProfileStore":
+        if self._profile_store is None:
+            from app.infrastructure.profiling import ProfileStore
+
+            self._profile_store = ProfileStore(self.settings.profiling_max_profiles)
+        return self._profile_store
+
+    async def startup(self) -> None:
+        started = time.perf_counter()
+        for name, hook in self._startup_hooks:
+            hook_started = time.perf_counter()
+            await hook()
+            self.startup_timings[name] = time.perf_counter() - hook_started
+            STARTUP_SECONDS.set(self.startup_timings[name], (name,))
+        total = time.perf_counter() - started
+        STARTUP_SECONDS.set(total, ("total",))
+        logger.info(
+            "Started in %.1f ms (%s)",
+            total * 1000,
+            ", ".join(f"{name}: {seconds * 1000:.1f} ms" for name, seconds in self.startup_timings.items())
+        )
+
+    async def shutdown(self) -> None:
+        for name, hook in reversed(self._shutdown_hooks):
+            try:
+                await hook()
+            except Exception:
+                logger.exception("Shutdown hook '%s' failed", name)
@@ -1,29 +1,184 @@
-from typing import AsyncIterator
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Iterable, List, Optional
 
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.sql import Executable
+from sqlalchemy.engine import make_url
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 
 from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.infrastructure.settings import Settings, get_settings
+from app.infrastructure.tables import PanelTableState
+from app.infrastructure.migrations import run_migrations
+from app.infrastructure.metrics import InstrumentedAsyncAdaptedQueuePool, instrument_engine
+from app.infrastructure.request_accounting import instrument_request_accounting
 
-DATABASE_URL = "sqlite+aiosqlite:///./panels.db"
 
-async_engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,
-)
+def _is_memory_database(url: str) -> bool:
+    database = make_url(url).database
+    return database in (None, "", ":memory:") or database.startswith("file::memory:")
+
+
+def imports_spool_dir(settings: Settings) -> str:
+    """
+    Where import uploads are spooled: REMS_IMPORTS_SPOOL_DIR, else beside the database
+    file ("panels.db" -> "panels.db-imports"), like SQLite's own -wal and -shm files.
+    In-memory databases have no file, so their uploads go to the system temp dir.
+    """
+    if settings.imports_spool_dir:
+        return settings.imports_spool_dir
+    if _is_memory_database(settings.database_url):
+        return os.path.join(tempfile.gettempdir(), "rems-imports")
+    return f"{make_url(settings.database_url).database}-imports"
+
+
+def _sqlite_pragmas(settings: Settings, read_only: bool) -> Callable:
+    """
+    Build a connect-event listener that applies the configured SQLite pragmas.
+    """
+    pragmas = [
+        f"PRAGMA busy_timeout = {settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+        f"PRAGMA mmap_size = {settings.sqlite_mmap_size}",
+        f"PRAGMA cache_size = {settings.sqlite_cache_size}",
+        f"PRAGMA temp_store = {settings.sqlite_temp_store}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        # The journal mode is persistent and only needs to be set by the writer.
+        pragmas.insert(0, f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+
+    def on_connect(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return on_connect
+
+
+def _disable_driver_transactions(dbapi_connection, connection_record) -> None:
+    dbapi_connection.isolation_level = None
+
+
+def _emit_begin(connection) -> None:
+    # IMMEDIATE takes the write lock up front: a deferred transaction that
+    # reads first and then writes fails with "database is locked" instead of
+    # waiting on busy_timeout when another connection already holds the lock.
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_engine(settings: Settings, read_only: bool = False, label: Optional[str] = None) -> AsyncEngine:
+    """
+    Create an async engine for the panels database from the settings.
+
+    The writer engine keeps a small pool (SQLite has a single writer anyway);
+    the read-only engine keeps a larger one so reads run concurrently under WAL.
+    `label` names the engine in metrics and logs (default: writer or reader).
+    """
+    options = {"echo": settings.database_echo}
+    if not _is_memory_database(settings.database_url):
+        options["pool_timeout"] = settings.database_pool_timeout_seconds
+        if read_only:
+            options["pool_size"] = settings.database_reader_pool_size
+            options["max_overflow"] = settings.database_reader_max_overflow
+        else:
+            options["pool_size"] = settings.database_writer_pool_size
+            options["max_overflow"] = 0
+        if settings.metrics_enabled:
+            options["poolclass"] = InstrumentedAsyncAdaptedQueuePool
+
+    engine = create_async_engine(settings.database_url, **options)
+    label = label or ("reader" if read_only else "writer")
+    if settings.metrics_enabled:
+        instrument_engine(engine, label)
+    if settings.request_accounting_enabled or settings.slow_query_threshold_ms:
+        instrument_request_accounting(engine, label, settings.slow_query_threshold_ms)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _sqlite_pragmas(settings, read_only))
+        if not read_only:
+            # Let SQLAlchemy emit BEGIN itself instead of the driver, which
+            # is required for SAVEPOINTs to behave (used by the write batcher).
+            event.listen(engine.sync_engine, "connect", _disable_driver_transactions)
+            event.listen(engine.sync_engine, "begin", _emit_begin)
+    return engine
+
+
+_settings = get_settings()
+
+DATABASE_URL = _settings.database_url
+
+async_engine = create_engine(_settings)
+
+# An in-memory database only exists inside its own connection, so it cannot have a separate reader.
+if _settings.database_separate_reader and not _is_memory_database(DATABASE_URL):
+    async_read_engine = create_engine(_settings, read_only=True)
+else:
+    async_read_engine = async_engine
 
 async_session_factory = async_sessionmaker(
     bind=async_engine,
     expire_on_commit=False,
 )
 
+async_read_session_factory = async_sessionmaker(
+    bind=async_read_engine,
+    expire_on_commit=False,
+)
+
 async def init_db() -> None:
     """
-    Create database tables (async).
+    Create missing database tables and bring existing ones up to date (async).
+    """
+    await init_engine(async_engine)
+
+async def init_engine(engine: AsyncEngine) -> None:
     """
-    async with async_engine.begin() as conn:
+    Create missing tables in the database behind `engine` and bring existing ones up to date.
+    """
+    async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(run_migrations)
+        await conn.exec_driver_sql("PRAGMA optimize")
+        await conn.execute(insert(PanelTableState.__table__).values(id=1, generation=0, updated_at=datetime.now(timezone.utc)).on_conflict_do_nothing())
+
+async def dispose_engines() -> None:
+    """
+    Close every pooled connection of the reader and writer engines.
+    """
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+async def ping_database(engines: Iterable[AsyncEngine] = ()) -> None:
+    """
+    Run a trivial query on the writer, the reader when separate, and `engines`.
+    """
+    for engine in {async_engine, async_read_engine, *engines}:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+async def explain_query_plan(statement: Executable) -> List[str]:
+    """
+    Return the SQLite query plan of a statement, one detail line per step.
+    """
+    compiled = statement.compile(dialect=sqlite.dialect(paramstyle="named"))
+    explain = text(f"EXPLAIN QUERY PLAN {compiled.string}").bindparams(*[
+        bindparam(name, value, type_=compiled.binds[name].type)
+        for name, value in compiled.params.items()
+    ])
+    async with async_read_engine.connect() as conn:
+        results = await conn.execute(explain)
+        return [row[-1] for row in results]
 
 async def get_session() -> AsyncIterator[AsyncSession]:
     """
@@ -36,4 +191,10 @@ def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
     """
     Get the async session factory for database interactions.
     """
-    return async_session_factory
\ No newline at end of file
+    return async_session_factory
+
+def get_async_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Get the async session factory bound to the read-only engine.
+    """
+    return async_read_session_factory
@@ -1,18 +1,70 @@
-from app.infrastructure.db import get_async_session_factory
+from typing import TYPE_CHECKING, Optional
+from starlette.requests import HTTPConnection
+
+from app.infrastructure.container import Container
 from app.domain.services.electronic_panel_service import ElectronicPanelService
-from app.application.internal.services.electronic_panel_service_impl import ElectronicPanelServiceImpl
-from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import ElectronicPanelSQLModelRepository
 
-def get_electronic_panel_service() -> ElectronicPanelService:
+# Optional components; their modules are only imported when the settings enable them.
+if TYPE_CHECKING:
+    from app.infrastructure.event_broker import PanelEventBroker
+    from app.infrastructure.panel_importer import PanelImporter
+    from app.infrastructure.profiling import ProfileStore
+    from app.infrastructure.response_cache import ResponseCache
+
+def get_container(request: HTTPConnection) -> Container:
+    """
+    Dependency returning the application container built by the lifespan.
+
+    Returns:
+        Container: The process-wide container stored on app.state.
+    """
+    return request.app.state.container
+
+def get_profile_store(request: HTTPConnection) -> "ProfileStore":
     """
-    Factory function for Electronic Panel Service.
-    
-    Creates the complete dependency chain:
-    Session Factory → Repository → Service
-    
+    Dependency returning the store of captured request profiles.
+
+    Returns:
+        ProfileStore: The process-wide profile store.
+    """
+    return get_container(request).profile_store
+
+def get_electronic_panel_service(request: HTTPConnection) -> ElectronicPanelService:
+    """
+    Dependency returning the Electronic Panel Service.
+
+    The service and its repository chain (Session Factory → Repository →
+    Service) are built once by the container, so state such as the panel
+    cache and the write batcher is shared between requests.
+
+    Returns:
+        ElectronicPanelService: The configured service instance.
+    """
+    return get_container(request).panel_service
+
+def get_event_broker(request: HTTPConnection) -> "PanelEventBroker":
+    """
+    Dependency returning the broker of the live change feed.
+
+    Returns:
+        PanelEventBroker: The process-wide event broker.
+    """
+    return get_container(request).event_broker
+
+def get_panel_importer(request: HTTPConnection) -> "PanelImporter":
+    """
+    Dependency returning the runner of bulk import jobs.
+
+    Returns:
+        PanelImporter: The process-wide panel importer.
+    """
+    return get_container(request).panel_importer
+
+def get_response_cache(request: HTTPConnection) -> Optional["ResponseCache"]:
+    """
+    Dependency returning the cache of encoded list responses.
+
     Returns:
-        ElectronicPanelService: A configured service instance.
+        Optional[ResponseCache]: The process-wide response cache, or None when disabled.
     """
-    session_factory = get_async_session_factory()
-    repository = ElectronicPanelSQLModelRepository(session_factory)
-    return ElectronicPanelServiceImpl(repository)
+    return get_container(request).response_cache
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import secrets
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Set
+
+from app.domain.model.value_objects.panel_event import PanelEvent
+from app.domain.model.value_objects.panel_state import PanelState
+from app.domain.services.panel_event_publisher import PanelEventPublisher
+
+logger = logging.getLogger(__name__)
+
+
+class TooManySubscribersError(RuntimeError):
+    """
+    Raised when a subscription would exceed the broker's subscriber limit.
+    """
+
+
+@dataclass
+class PublishedEvent:
+    """
+    A panel event with its position in the broker's sequence.
+
+    Attributes:
+        seq (int): Position in the sequence, starting at 1 for each broker.
+        event (PanelEvent): The published event.
+        payload (Optional[bytes]): Encoded form, filled in by the first
+            subscriber that sends it so it is encoded once per event.
+    """
+    seq: int
+    event: PanelEvent
+    payload: Optional[bytes] = None
+
+
+class Subscription:
+    """
+    One subscriber's bounded queue of events matching its filters.
+
+    `replay` holds the buffered events after the resume point, to be sent
+    before anything from the queue. `reset` is set when the resume point
+    was no longer buffered, so the client must reload instead.
+    `start_seq` is the position the subscription starts from: the resume
+    point when replaying, otherwise the latest published event.
+    """
+
+    def __init__(
+        self,
+        broker: "PanelEventBroker",
+        location: Optional[str],
+        state: Optional[PanelState],
+        queue_size: int
+    ) -> None:
+        self._broker = broker
+        self.location = location
+        self.state = state
+        self.queue: "asyncio.Queue[Optional[PublishedEvent]]" = asyncio.Queue(queue_size)
+        self.replay: List[PublishedEvent] = []
+        self.reset = False
+        self.start_seq = 0
+        self.evicted = False
+        self.closed = False
+
+    def _matches(self, location: str, state: PanelState) -> bool:
+        return (self.location is None or location == self.location) and (self.state is None or state == self.state)
+
+    def matches(self, event: PanelEvent) -> bool:
+        """
+        Deletions carry no panel, so they reach every subscriber. Updates reach
+        the subscribers matching the panel before or after the change, so
+        they also learn about panels leaving their selection.
+        """
+        panel = event.panel
+        if panel is None:
+            return True
+        if self._matches(panel.location, panel.state):
+            return True
+        return event.previous is not None and self._matches(*event.previous)
+
+    async def next(self) -> Optional[PublishedEvent]:
+        """
+        Wait for the next event; None once the subscription was evicted or closed.
+        """
+        if self.closed:
+            return None
+        published = await self.queue.get()
+        if published is None:
+            self.closed = True
+        return published
+
+    def close(self) -> None:
+        self.closed = True
+        self._broker.unsubscribe(self)
+
+
+class PanelEventBroker(PanelEventPublisher):
+    """
+    In-process pub/sub fan-out of panel change events.
+
+    Publishing never waits: every event is numbered, kept in a ring buffer
+    of the last `buffer_size` events for resuming clients and put on each
+    matching subscriber's bounded queue. A subscriber whose queue is full
+    is evicted instead of slowing down the writer or buffering without
+    limit; it can reconnect with its last resume token.
+
+    Resume tokens embed a random epoch, so tokens issued by another
+    process or before a restart are recognised and answered with a reset.
+    Events only reach subscribers of the worker process that handled the
+    write.
+    """
+
+    def __init__(self, buffer_size: int = 1024, queue_size: int = 256, max_subscribers: int = 1000) -> None:
+        self.epoch = secrets.token_hex(4)
+        self._queue_size = queue_size
+        self._max_subscribers = max_subscribers
+        self._buffer: Deque[PublishedEvent] = deque(maxlen=buffer_size)
+        self._subscribers: Set[Subscription] = set()
+        self._seq = 0
+        # Sequence number of the latest write that was not published, see mark_unpublished.
+        self._unpublished_seq = 0
+        self.published = 0
+        self.delivered = 0
+        self.evicted = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def resume_token(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def parse_resume_token(self, token: str) -> Optional[int]:
+        """
+        Return the sequence number of a token, or None when another broker issued it.
+
+        Raises:
+            ValueError: If the token is malformed.
+        """
+        epoch, _, seq = token.partition("-")
+        if not seq.isdigit():
+            raise ValueError(f"Invalid resume token '{token}'")
+        return int(seq) if epoch == self.epoch else None
+
+    def publish(self, events: List[PanelEvent]) -> None:
+        for event in events:
+            self._seq += 1
+            published = PublishedEvent(self._seq, event)
+            self._buffer.append(published)
+            self.published += 1
+            for subscription in list(self._subscribers):
+                if not subscription.matches(event):
+                    continue
+                try:
+                    subscription.queue.put_nowait(published)
+                    self.delivered += 1
+                except asyncio.QueueFull:
+                    self._evict(subscription)
+
+    def mark_unpublished(self) -> None:
+        """
+        Take a sequence number for a write whose events were skipped.
+
+        Resume tokens from before it are answered with a reset, as replaying
+        the buffer would silently miss the write. Subscribers that joined
+        while it ran are disconnected, as if evicted, to reconnect into one.
+        """
+        self._seq += 1
+        self._unpublished_seq = self._seq
+        for subscription in list(self._subscribers):
+            subscription.evicted = True
+            self._end(subscription)
+
+    def _end(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        # Drop the backlog so the end-of-stream marker fits; the client resumes from what it received.
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def _evict(self, subscription: Subscription) -> None:
+        subscription.evicted = True
+        self.evicted += 1
+        self._end(subscription)
+        logger.info("Evicted slow event subscriber (queue of %d full)", self._queue_size)
+
+    def subscribe(
+        self,
+        location: Optional[str] = None,
+        state: Optional[PanelState] = None,
+        resume_token: Optional[str] = None
+    ) -> Subscription:
+        """
+        Register a subscriber, replaying the buffered events after `resume_token`.
+
+        Raises:
+            ValueError: If the resume token is malformed.
+            TooManySubscribersError: If the subscriber limit is reached.
+        """
+        after_seq = self.parse_resume_token(resume_token) if resume_token is not None else None
+        if len(self._subscribers) >= self._max_subscribers:
+            raise TooManySubscribersError(f"At most {self._max_subscribers} event subscribers are allowed")
+        subscription = Subscription(self, location, state, self._queue_size)
+        subscription.start_seq = self._seq
+        if resume_token is not None:
+            oldest = self._buffer[0].seq if self._buffer else self._seq + 1
+            if (
+                after_seq is None
+                or after_seq > self._seq
+                or after_seq < oldest - 1
+                or after_seq < self._unpublished_seq
+            ):
+                subscription.reset = True
+            else:
+                subscription.start_seq = after_seq
+                subscription.replay = [
+                    published for published in self._buffer
+                    if published.seq > after_seq and subscription.matches(published.event)
+                ]
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    async def close(self) -> None:
+        """
+        End every subscription, so open streams finish on shutdown.
+        """
+        for subscription in list(self._subscribers):
+            self._end(subscription)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "subscribers": len(self._subscribers),
+            "buffered": len(self._buffer),
+            "published": self.published,
+            "delivered": self.delivered,
+            "evicted": self.evicted
+        }
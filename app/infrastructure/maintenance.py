@@ -0,0 +1,102 @@
+"""
+Database maintenance commands.
+
+Usage:
+    python -m app.infrastructure.maintenance migrate
+    python -m app.infrastructure.maintenance rebuild-search
+    python -m app.infrastructure.maintenance rebuild-stats
+    python -m app.infrastructure.maintenance compact-changes
+
+With REMS_PANEL_REPOSITORY=sharded every command also runs on each shard
+database, and compact-changes compacts the merged change log.
+"""
+import argparse
+import asyncio
+from datetime import timedelta
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.infrastructure.db import async_engine, create_engine, dispose_engines, get_async_session_factory, init_db, init_engine
+from app.infrastructure.migrations import compact_change_log, rebuild_search_index, rebuild_state_summary
+from app.infrastructure.settings import Settings, get_settings
+
+
+def _compact_changes(connection) -> None:
+    settings = get_settings()
+    pruned, compacted_through = compact_change_log(
+        connection,
+        timedelta(hours=settings.changes_tombstone_retention_hours),
+        timedelta(days=settings.changes_client_ttl_days)
+    )
+    print(f"Pruned {pruned} change log entries; compacted through {compacted_through}")
+
+
+COMMANDS = {
+    "rebuild-search": rebuild_search_index,
+    "rebuild-stats": rebuild_state_summary,
+    "compact-changes": _compact_changes,
+}
+
+
+def _shard_engines(settings: Settings) -> List[AsyncEngine]:
+    if settings.panel_repository != "sharded":
+        return []
+    from app.infrastructure.repositories.electronic_panel_sharded_repository import shard_settings
+
+    return [
+        create_engine(shard_settings(settings, index), label=f"shard{index}-writer")
+        for index in range(settings.shard_count)
+    ]
+
+
+async def _compact_sharded_changes(settings: Settings, shards: List[AsyncEngine]) -> None:
+    # The shards' own logs may hold entries not yet merged: merge them, compact the merged log, then discard.
+    from app.infrastructure.repositories.electronic_panel_sharded_repository import (
+        ShardedElectronicPanelRepository,
+        main_metadata
+    )
+    from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import ElectronicPanelSQLModelRepository
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(main_metadata.create_all)
+    repository = ShardedElectronicPanelRepository(
+        [ElectronicPanelSQLModelRepository(async_sessionmaker(bind=engine, expire_on_commit=False)) for engine in shards],
+        get_async_session_factory()
+    )
+    await repository.init_change_cursors()
+    pruned, compacted_through = await repository.compact_changes(
+        timedelta(hours=settings.changes_tombstone_retention_hours),
+        timedelta(days=settings.changes_client_ttl_days)
+    )
+    print(f"Pruned {pruned} change log entries; compacted through {compacted_through}")
+
+
+async def run(command: str) -> None:
+    settings = get_settings()
+    shards = _shard_engines(settings)
+    try:
+        await init_db()
+        for engine in shards:
+            await init_engine(engine)
+        if command == "compact-changes" and shards:
+            await _compact_sharded_changes(settings, shards)
+        elif command in COMMANDS:
+            for engine in [async_engine, *shards]:
+                async with engine.begin() as conn:
+                    await conn.run_sync(COMMANDS[command])
+    finally:
+        for engine in shards:
+            await engine.dispose()
+        await dispose_engines()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Panels database maintenance")
+    parser.add_argument("command", choices=["migrate", *COMMANDS])
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.command))
+
+
+if __name__ == "__main__":
+    main()
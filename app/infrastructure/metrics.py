@@ -0,0 +1,310 @@
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; suits both sub-millisecond SQLite statements and slow HTTP requests.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+Labels = Tuple[str, ...]
+
+
+class MetricFamily(NamedTuple):
+    """
+    A metric and its samples as produced by a collector at scrape time.
+    """
+    name: str
+    type: str
+    help: str
+    samples: List[Tuple[Dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _labels(self, values: Labels) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def render(self) -> List[str]:
+        raise NotImplementedError()
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing value per label set.
+    """
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self._labels(labels))} {_format_value(value)}"
+                for labels, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """
+    Value per label set that can go up and down.
+    """
+    type = "gauge"
+
+    def dec(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values over fixed buckets, per label set.
+
+    Observing costs a bisect and three additions; bucket counts are made
+    cumulative only when rendering.
+    """
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: one count per bucket plus +Inf, then the sum.
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, series in self._series.items():
+            base = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels({**base, 'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(base)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(base)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    In-process metrics registry rendered in the Prometheus text exposition format.
+
+    Metrics are updated inline on the event loop thread and need no locking.
+    Collectors are called at scrape time for values that already live
+    elsewhere, such as pool usage or cache statistics.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def add_stats_collector(
+        self,
+        prefix: str,
+        stats: Callable[[], Dict[str, float]],
+        counters: Iterable[str] = ()
+    ) -> Callable[[], Iterable[MetricFamily]]:
+        """
+        Export a component's stats() dict, one metric per key.
+
+        Keys listed in `counters` are exported as counters with a `_total`
+        suffix, every other key as a gauge. Returns the collector, for
+        remove_collector when the component goes away.
+        """
+        counters = frozenset(counters)
+
+        def collect() -> Iterable[MetricFamily]:
+            for key, value in stats().items():
+                if key in counters:
+                    yield MetricFamily(f"{prefix}_{key}_total", "counter", f"{prefix} {key}", [({}, value)])
+                else:
+                    yield MetricFamily(f"{prefix}_{key}", "gauge", f"{prefix} {key}", [({}, value)])
+
+        self.add_collector(collect)
+        return collect
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for family in collector():
+                lines.append(f"# HELP {family.name} {family.help}")
+                lines.append(f"# TYPE {family.name} {family.type}")
+                lines.extend(f"{family.name}{_format_labels(labels)} {_format_value(value)}"
+                             for labels, value in family.samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time to handle an HTTP request, until the last body byte is sent.",
+    ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    ("method",)
+)
+DB_STATEMENT_DURATION = REGISTRY.histogram(
+    "db_statement_duration_seconds",
+    "Time to execute a SQL statement, by engine and statement type.",
+    ("engine", "operation")
+)
+DB_STATEMENT_ERRORS = REGISTRY.counter(
+    "db_statement_errors_total",
+    "SQL statements that raised, by engine and statement type.",
+    ("engine", "operation")
+)
+DB_POOL_CHECKOUT_WAIT = REGISTRY.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    ("engine",)
+)
+
+
+# (label, sync engine) of every engine passed to instrument_engine, for the pool gauges.
+_instrumented_engines: List[Tuple[str, object]] = []
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip()[:6].upper()
+    return keyword if keyword in _SQL_OPERATIONS else "OTHER"
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each checkout waited for a connection.
+    """
+    metrics_label = "default"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, (self.metrics_label,))
+
+    def recreate(self) -> "InstrumentedAsyncAdaptedQueuePool":
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+        return pool
+
+
+def instrument_engine(engine: AsyncEngine, label: str) -> None:
+    """
+    Record statement durations and errors of an engine, and export its pool usage.
+    """
+    sync_engine = engine.sync_engine
+    labels: Dict[str, Labels] = {
+        operation: (label, operation) for operation in _SQL_OPERATIONS | {"OTHER"}
+    }
+    if isinstance(sync_engine.pool, InstrumentedAsyncAdaptedQueuePool):
+        sync_engine.pool.metrics_label = label
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        start = conn.info["metrics_query_start"].pop()
+        DB_STATEMENT_DURATION.observe(time.perf_counter() - start, labels[_operation(statement)])
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context) -> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("metrics_query_start"):
+            connection.info["metrics_query_start"].pop()
+        statement = exception_context.statement or ""
+        DB_STATEMENT_ERRORS.inc(1.0, labels[_operation(statement)])
+
+    _instrumented_engines.append((label, sync_engine))
+
+
+def _collect_pools() -> Iterable[MetricFamily]:
+    families = {
+        "db_pool_size": ("Connections the pool keeps open.", QueuePool.size),
+        "db_pool_checked_out": ("Connections currently checked out of the pool.", QueuePool.checkedout),
+        "db_pool_overflow": ("Connections open beyond the pool size.", lambda pool: max(pool.overflow(), 0)),
+    }
+    pools = [(label, engine.pool) for label, engine in _instrumented_engines if isinstance(engine.pool, QueuePool)]
+    for name, (help, read) in families.items():
+        yield MetricFamily(name, "gauge", help, [({"engine": label}, read(pool)) for label, pool in pools])
+
+
+REGISTRY.add_collector(_collect_pools)
@@ -0,0 +1,333 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_state import PanelState
+from app.infrastructure.tables import MILLIAMPS_PER_AMP, PanelStateSummary
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    One schema change applied to databases created by an earlier version.
+
+    `apply` runs inside the migration transaction and must be idempotent:
+    it is also run against databases whose tables create_all already built
+    in their current shape.
+    """
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _column_names(connection: Connection, table: str) -> List[str]:
+    return [column["name"] for column in inspect(connection).get_columns(table)]
+
+
+def _add_panel_versioning(connection: Connection) -> None:
+    columns = _column_names(connection, ElectronicPanel.__tablename__)
+    if "version" not in columns:
+        connection.execute(text("ALTER TABLE electronic_panels ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+    if "updated_at" not in columns:
+        # SQLite cannot add a column with a non-constant default, so backfill it.
+        connection.execute(text("ALTER TABLE electronic_panels ADD COLUMN updated_at DATETIME"))
+        connection.execute(
+            text("UPDATE electronic_panels SET updated_at = :now"),
+            {"now": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")}
+        )
+
+
+def _create_panel_indexes(connection: Connection) -> None:
+    for index in ElectronicPanel.__table__.indexes:
+        index.create(connection, checkfirst=True)
+
+
+# A panel's amperage as the integer milliamps the summary adds up.
+_MILLIAMPS = "CAST(ROUND({row}.amperage_capacity * %d) AS INTEGER)" % MILLIAMPS_PER_AMP
+
+_SUMMARY_TRIGGER_NAMES = (
+    "electronic_panels_summary_insert",
+    "electronic_panels_summary_delete",
+    "electronic_panels_summary_update",
+)
+
+_SUMMARY_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS electronic_panels_summary_insert
+    AFTER INSERT ON electronic_panels
+    BEGIN
+        UPDATE electronic_panels_state_summary
+        SET panel_count = panel_count + 1,
+            amperage_total_milliamps = amperage_total_milliamps + {_MILLIAMPS.format(row="new")}
+        WHERE state = new.state;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS electronic_panels_summary_delete
+    AFTER DELETE ON electronic_panels
+    BEGIN
+        UPDATE electronic_panels_state_summary
+        SET panel_count = panel_count - 1,
+            amperage_total_milliamps = amperage_total_milliamps - {_MILLIAMPS.format(row="old")}
+        WHERE state = old.state;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS electronic_panels_summary_update
+    AFTER UPDATE OF state, amperage_capacity ON electronic_panels
+    BEGIN
+        UPDATE electronic_panels_state_summary
+        SET panel_count = panel_count - 1,
+            amperage_total_milliamps = amperage_total_milliamps - {_MILLIAMPS.format(row="old")}
+        WHERE state = old.state;
+        UPDATE electronic_panels_state_summary
+        SET panel_count = panel_count + 1,
+            amperage_total_milliamps = amperage_total_milliamps + {_MILLIAMPS.format(row="new")}
+        WHERE state = new.state;
+    END
+    """,
+]
+
+
+def rebuild_state_summary(connection: Connection) -> None:
+    """
+    Recompute electronic_panels_state_summary from the panels table.
+    """
+    connection.execute(text("DELETE FROM electronic_panels_state_summary"))
+    for state in PanelState:
+        # SQLModel stores enum members by name.
+        connection.execute(
+            text(
+                "INSERT INTO electronic_panels_state_summary (state, panel_count, amperage_total_milliamps) "
+                f"SELECT :state, COUNT(*), COALESCE(SUM({_MILLIAMPS.format(row='electronic_panels')}), 0) "
+                "FROM electronic_panels WHERE state = :state"
+            ),
+            {"state": state.name}
+        )
+
+
+def _create_state_summary(connection: Connection) -> None:
+    rebuild_state_summary(connection)
+    for trigger in _SUMMARY_TRIGGERS:
+        connection.execute(text(trigger))
+
+
+def _store_summary_milliamps(connection: Connection) -> None:
+    """
+    Replace the floating-point amperage total of the summary by integer milliamps.
+
+    The summary only holds derived values, so its table is rebuilt in the new shape.
+    """
+    for name in _SUMMARY_TRIGGER_NAMES:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    PanelStateSummary.__table__.drop(connection, checkfirst=True)
+    PanelStateSummary.__table__.create(connection)
+    _create_state_summary(connection)
+
+
+_SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS electronic_panels_fts USING fts5(
+        name,
+        location,
+        brand,
+        content='electronic_panels',
+        content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS electronic_panels_fts_insert
+    AFTER INSERT ON electronic_panels
+    BEGIN
+        INSERT INTO electronic_panels_fts (rowid, name, location, brand)
+        VALUES (new.rowid, new.name, new.location, new.brand);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS electronic_panels_fts_delete
+    AFTER DELETE ON electronic_panels
+    BEGIN
+        INSERT INTO electronic_panels_fts (electronic_panels_fts, rowid, name, location, brand)
+        VALUES ('delete', old.rowid, old.name, old.location, old.brand);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS electronic_panels_fts_update
+    AFTER UPDATE OF name, location, brand ON electronic_panels
+    BEGIN
+        INSERT INTO electronic_panels_fts (electronic_panels_fts, rowid, name, location, brand)
+        VALUES ('delete', old.rowid, old.name, old.location, old.brand);
+        INSERT INTO electronic_panels_fts (rowid, name, location, brand)
+        VALUES (new.rowid, new.name, new.location, new.brand);
+    END
+    """,
+]
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """
+    Rebuild the full-text index from the panels table.
+
+    Needed after a VACUUM, which may renumber the rowids the index points to.
+    """
+    connection.execute(text("INSERT INTO electronic_panels_fts (electronic_panels_fts) VALUES ('rebuild')"))
+
+
+def _create_search_index(connection: Connection) -> None:
+    for statement in _SEARCH_INDEX_DDL:
+        connection.execute(text(statement))
+    rebuild_search_index(connection)
+
+
+# Enum members are stored by name; SQLite's own clock gives the time in UTC.
+_CHANGE_LOG_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS electronic_panels_changes_insert
+    AFTER INSERT ON electronic_panels
+    BEGIN
+        INSERT INTO electronic_panels_changes (panel_id, operation, changed_at)
+        VALUES (new.id, 'UPSERT', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS electronic_panels_changes_update
+    AFTER UPDATE ON electronic_panels
+    BEGIN
+        INSERT INTO electronic_panels_changes (panel_id, operation, changed_at)
+        VALUES (new.id, 'UPSERT', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS electronic_panels_changes_delete
+    AFTER DELETE ON electronic_panels
+    BEGIN
+        INSERT INTO electronic_panels_changes (panel_id, operation, changed_at)
+        VALUES (old.id, 'DELETE', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+    END
+    """,
+]
+
+
+def _create_change_log(connection: Connection) -> None:
+    connection.execute(text("INSERT OR IGNORE INTO electronic_panels_changes_state (id, compacted_through) VALUES (1, 0)"))
+    # Existing panels enter the log as upserts, so a sync from 0 returns them.
+    if connection.execute(text("SELECT COUNT(*) FROM electronic_panels_changes")).scalar() == 0:
+        connection.execute(text(
+            "INSERT INTO electronic_panels_changes (panel_id, operation, changed_at) "
+            "SELECT id, 'UPSERT', strftime('%Y-%m-%d %H:%M:%f', 'now') FROM electronic_panels ORDER BY id"
+        ))
+    for trigger in _CHANGE_LOG_TRIGGERS:
+        connection.execute(text(trigger))
+
+
+def compact_change_log(
+    connection: Connection,
+    tombstone_retention: timedelta = timedelta(hours=24),
+    client_ttl: timedelta = timedelta(days=30)
+) -> Tuple[int, int]:
+    """
+    Shrink the change log without changing what a sync from any current position returns.
+
+    Entries superseded by a later change of the same panel are always
+    dropped: a sync that would have seen them sees the later one. Tombstones
+    are pruned once they are older than `tombstone_retention` and every
+    client seen within `client_ttl` has synced past them; syncs starting
+    before the pruned range then fail and must restart from 0.
+
+    Returns the number of pruned entries and the new compacted_through.
+    """
+    now = datetime.now(timezone.utc)
+    pruned = connection.execute(text(
+        "DELETE FROM electronic_panels_changes WHERE seq NOT IN "
+        "(SELECT MAX(seq) FROM electronic_panels_changes GROUP BY panel_id)"
+    )).rowcount
+
+    horizon = connection.execute(
+        text(
+            "SELECT COALESCE("
+            "(SELECT MIN(since) FROM electronic_panels_sync_clients WHERE seen_at >= :active_since), "
+            "(SELECT MAX(seq) FROM electronic_panels_changes), 0)"
+        ),
+        {"active_since": (now - client_ttl).strftime("%Y-%m-%d %H:%M:%S.%f")}
+    ).scalar()
+    last_pruned = connection.execute(
+        text(
+            "SELECT MAX(seq) FROM electronic_panels_changes "
+            "WHERE operation = 'DELETE' AND seq <= :horizon AND changed_at < :retained_since"
+        ),
+        {"horizon": horizon, "retained_since": (now - tombstone_retention).strftime("%Y-%m-%d %H:%M:%S.%f")}
+    ).scalar()
+    if last_pruned is not None:
+        pruned += connection.execute(
+            text("DELETE FROM electronic_panels_changes WHERE operation = 'DELETE' AND seq <= :last_pruned"),
+            {"last_pruned": last_pruned}
+        ).rowcount
+    connection.execute(
+        text(
+            "UPDATE electronic_panels_changes_state "
+            "SET compacted_through = MAX(compacted_through, :last_pruned), compacted_at = :now WHERE id = 1"
+        ),
+        {"last_pruned": last_pruned or 0, "now": now.strftime("%Y-%m-%d %H:%M:%S.%f")}
+    )
+    compacted_through = connection.execute(
+        text("SELECT compacted_through FROM electronic_panels_changes_state WHERE id = 1")
+    ).scalar()
+    return pruned, compacted_through
+
+
+def _add_import_lease_owner(connection: Connection) -> None:
+    if "lease_owner" not in _column_names(connection, "electronic_panels_import_jobs"):
+        connection.execute(text("ALTER TABLE electronic_panels_import_jobs ADD COLUMN lease_owner VARCHAR(32)"))
+
+
+MIGRATIONS = [
+    Migration(1, "Add version and updated_at to electronic_panels", _add_panel_versioning),
+    Migration(2, "Create secondary indexes on electronic_panels", _create_panel_indexes),
+    Migration(3, "Create the per-state summary table and its triggers", _create_state_summary),
+    Migration(4, "Create the FTS5 search index over name, location and brand", _create_search_index),
+    Migration(5, "Create the change log, its triggers and its state", _create_change_log),
+    Migration(6, "Add the lease owner to import jobs", _add_import_lease_owner),
+    Migration(7, "Keep the per-state amperage total in integer milliamps", _store_summary_milliamps),
+]
+
+
+def run_migrations(connection: Connection) -> List[int]:
+    """
+    Apply every migration not yet recorded in schema_migrations.
+
+    Returns the versions that were applied.
+    """
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR NOT NULL, "
+        "applied_at DATETIME NOT NULL)"
+    ))
+    applied = set(connection.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}")).scalars())
+    newly_applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in applied:
+            continue
+        logger.info("Applying migration %d: %s", migration.version, migration.description)
+        migration.apply(connection)
+        connection.execute(
+            text(f"INSERT INTO {MIGRATIONS_TABLE} (version, description, applied_at) VALUES (:version, :description, :applied_at)"),
+            {
+                "version": migration.version,
+                "description": migration.description,
+                "applied_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+            }
+        )
+        newly_applied.append(migration.version)
+    return newly_applied
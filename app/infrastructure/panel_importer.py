@@ -0,0 +1,487 @@
+import asyncio
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4, uuid5
+
+from pydantic import ValidationError
+from sqlmodel import func, select, update
+from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_import import PanelImportFormat, PanelImportStatus
+from app.domain.services.electronic_panel_service import ElectronicPanelService
+from app.infrastructure.background import cancel_and_wait
+from app.infrastructure.tables import PanelImportJob
+
+logger = logging.getLogger(__name__)
+
+# Columns read from an import row; anything else (including id and version) is ignored.
+IMPORT_FIELDS = (
+    "name",
+    "location",
+    "brand",
+    "amperage_capacity",
+    "state",
+    "year_manufactured",
+    "year_installed"
+)
+
+# A job's lease is renewed on a timer while it runs; a process that stops renewing it
+# (crashed, killed or stalled) leaves the job to be resumed by whichever process claims it next.
+LEASE_SECONDS = 60.0
+LEASE_RENEW_SECONDS = LEASE_SECONDS / 3
+POLL_SECONDS = 5.0
+
+SPOOL_WRITE_SIZE = 1 << 20
+
+
+class PanelImportTooLargeError(Exception):
+    """
+    Raised when an uploaded import file exceeds the configured size limit.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        super().__init__(f"An import file may be at most {max_bytes} bytes")
+
+
+class PanelImportLeaseLostError(Exception):
+    """
+    Raised when a job's lease expired and another claim took the job over.
+    """
+
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+        super().__init__(f"Import job {job_id} was claimed by another worker")
+
+
+def describe_row_error(error: ValueError) -> str:
+    """
+    Render a row's validation error as a compact single-line message.
+    """
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+            for item in error.errors()
+        )
+    return str(error)
+
+
+def _read_header(path: str, format: PanelImportFormat) -> Tuple[Optional[List[str]], int]:
+    """
+    Return the CSV column names and the offset of the first data row (NDJSON has no header).
+    """
+    if format != PanelImportFormat.CSV:
+        return None, 0
+    with open(path, "rb") as file:
+        line = file.readline()
+        columns = next(csv.reader([line.decode("utf-8-sig")]), [])
+        return [column.strip() for column in columns], file.tell()
+
+
+def _read_records(path: str, format: PanelImportFormat, offset: int, max_records: int) -> Tuple[List[bytes], int]:
+    """
+    Read up to `max_records` raw records from `offset`; return them and the offset after the last one.
+
+    A CSV record continues over line breaks while it has an unclosed quote.
+    Blank lines are skipped.
+    """
+    records: List[bytes] = []
+    with open(path, "rb") as file:
+        file.seek(offset)
+        while len(records) < max_records:
+            record = file.readline()
+            if not record:
+                break
+            if format == PanelImportFormat.CSV:
+                while record.count(b'"') % 2:
+                    continuation = file.readline()
+                    if not continuation:
+                        break
+                    record += continuation
+            if record.strip():
+                records.append(record)
+        return records, file.tell()
+
+
+def _parse_record(format: PanelImportFormat, columns: Optional[List[str]], record: bytes) -> Dict[str, Any]:
+    if format == PanelImportFormat.NDJSON:
+        item = json.loads(record)
+        if not isinstance(item, dict):
+            raise ValueError("Each line must be a JSON object")
+    else:
+        values = next(csv.reader([record.decode("utf-8")]))
+        if len(values) != len(columns):
+            raise ValueError(f"Expected {len(columns)} fields, found {len(values)}")
+        # Empty cells are missing values, so optional fields take their defaults.
+        item = {column: value for column, value in zip(columns, values) if value != ""}
+    return {field: item[field] for field in IMPORT_FIELDS if field in item}
+
+
+def validate_records(
+    format: PanelImportFormat,
+    columns: Optional[List[str]],
+    namespace: UUID,
+    first_row: int,
+    records: List[bytes]
+) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+    """
+    Parse and validate a chunk of records against the panel rules.
+
+    Runs in a worker process, so it only takes and returns picklable values:
+    the field values of the valid panels, and (row, reason) for the others.
+    Row n of a job always gets the id uuid5(namespace, n), which makes
+    re-importing a chunk after an interruption detectable.
+    """
+    valid: List[Dict[str, Any]] = []
+    errors: List[Tuple[int, str]] = []
+    for row, record in enumerate(records, first_row):
+        try:
+            values = _parse_record(format, columns, record)
+            panel = ElectronicPanel.model_validate({**values, "id": uuid5(namespace, str(row))})
+            valid.append(panel.model_dump())
+        except ValueError as e:
+            errors.append((row, describe_row_error(e)))
+    return valid, errors
+
+
+class PanelImporter:
+    """
+    Runs bulk imports of uploaded CSV or NDJSON files in the background.
+
+    An upload is spooled to `spool_dir` and recorded as a queued job. The
+    worker task claims jobs one at a time, reads the file as a stream of
+    `chunk_rows`-row chunks, validates the chunks in a process pool (a few
+    chunks ahead of the inserts, so parsing and validation overlap with
+    the database work) and inserts each one through the panel service, in
+    batched transactions. Rejected rows go to a per-job NDJSON error report.
+
+    Progress is recorded after every inserted chunk. Claiming a job takes a
+    lease, renewed on a timer while the job runs, so a job whose process
+    stopped is resumed from its last recorded chunk by the next process to
+    claim it. Each claim gets its own `lease_owner` token and every write
+    to the job must match it, so a worker that lost its lease stops at its
+    next write instead of overwriting the new owner's progress.
+    """
+
+    def __init__(
+        self,
+        service: ElectronicPanelService,
+        session_factory: async_sessionmaker[AsyncSession],
+        read_session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+        spool_dir: str = "./imports",
+        max_bytes: int = 1 << 30,
+        chunk_rows: int = 5000,
+        insert_chunk_size: int = 500,
+        validation_workers: int = 2
+    ) -> None:
+        self._service = service
+        self._session_factory = session_factory
+        self._read_session_factory = read_session_factory or session_factory
+        self._spool_dir = Path(spool_dir)
+        self._max_bytes = max_bytes
+        self._chunk_rows = chunk_rows
+        self._insert_chunk_size = insert_chunk_size
+        self._validation_workers = validation_workers
+        self._executor: Optional[Executor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._current_job: Optional[str] = None
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.rows_imported = 0
+        self.rows_rejected = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "running": int(self._current_job is not None),
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "rows_imported": self.rows_imported,
+            "rows_rejected": self.rows_rejected
+        }
+
+    def upload_path(self, job_id: str) -> Path:
+        return self._spool_dir / f"{job_id}.upload"
+
+    def error_report_path(self, job_id: str) -> Path:
+        return self._spool_dir / f"{job_id}.errors.ndjson"
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._spool_dir.mkdir(parents=True, exist_ok=True)
+        if self._validation_workers:
+            # Spawned rather than forked: the server process runs threads (database drivers).
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._validation_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="panel-import")
+        self._task = asyncio.create_task(self._run(), name="panel-importer")
+
+    async def stop(self) -> None:
+        """
+        Stop the worker. The job being imported keeps its recorded progress and is released for resuming.
+        """
+        if self._task is not None:
+            await cancel_and_wait(self._task)
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def submit(self, format: PanelImportFormat, body: AsyncIterator[bytes]) -> PanelImportJob:
+        """
+        Spool an uploaded file to disk and queue it for import.
+
+        Raises:
+            PanelImportTooLargeError: If the file exceeds the size limit.
+            ValueError: If the file is empty.
+        """
+        job_id = uuid4().hex
+        path = self.upload_path(job_id)
+        size = 0
+        try:
+            with open(path, "wb") as file:
+                pending = bytearray()
+                async for data in body:
+                    size += len(data)
+                    if size > self._max_bytes:
+                        raise PanelImportTooLargeError(self._max_bytes)
+                    pending += data
+                    if len(pending) >= SPOOL_WRITE_SIZE:
+                        await asyncio.to_thread(file.write, bytes(pending))
+                        pending.clear()
+                await asyncio.to_thread(file.write, bytes(pending))
+            if not size:
+                raise ValueError("The uploaded file is empty")
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+
+        job = PanelImportJob(id=job_id, format=format, bytes_total=size)
+        async with self._session_factory() as session:
+            async with session.begin():
+                session.add(job)
+        self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[PanelImportJob]:
+        async with self._read_session_factory() as session:
+            return await session.get(PanelImportJob, job_id)
+
+    async def _claim(self) -> Optional[PanelImportJob]:
+        """
+        Take the oldest unfinished job whose lease is free or expired, if any.
+        """
+        now = datetime.now(timezone.utc)
+        candidate = (
+            select(PanelImportJob.id)
+            .where(PanelImportJob.status.in_([PanelImportStatus.QUEUED, PanelImportStatus.RUNNING]))
+            .where((PanelImportJob.lease_expires_at == None) | (PanelImportJob.lease_expires_at < now))  # noqa: E711
+            .order_by(PanelImportJob.created_at)
+            .limit(1)
+            .scalar_subquery()
+        )
+        statement = (
+            update(PanelImportJob)
+            .where(PanelImportJob.id == candidate)
+            .values(
+                status=PanelImportStatus.RUNNING,
+                lease_expires_at=now + timedelta(seconds=LEASE_SECONDS),
+                lease_owner=uuid4().hex,
+                started_at=func.coalesce(PanelImportJob.started_at, now)
+            )
+            .returning(PanelImportJob)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._session_factory() as session:
+            async with session.begin():
+                return (await session.execute(statement)).scalar_one_or_none()
+
+    async def _save(self, job: PanelImportJob, **values: Any) -> None:
+        """
+        Update the job, as long as this claim still holds its lease.
+
+        Raises:
+            PanelImportLeaseLostError: If another claim took the job over.
+        """
+        statement = (
+            update(PanelImportJob)
+            .where(PanelImportJob.id == job.id)
+            .where(PanelImportJob.lease_owner == job.lease_owner)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._session_factory() as session:
+            async with session.begin():
+                if not (await session.execute(statement)).rowcount:
+                    raise PanelImportLeaseLostError(job.id)
+
+    async def _release(self, job: PanelImportJob, **values: Any) -> None:
+        try:
+            await self._save(job, lease_owner=None, lease_expires_at=None, **values)
+        except PanelImportLeaseLostError:
+            logger.warning("Import job %s was claimed by another worker before it could be released", job.id)
+
+    async def _renew_lease(self, job: PanelImportJob) -> None:
+        """
+        Extend the lease until cancelled, however long a chunk takes. Ends when the lease is lost.
+        """
+        while True:
+            await asyncio.sleep(LEASE_RENEW_SECONDS)
+            try:
+                await self._save(job, lease_expires_at=datetime.now(timezone.utc) + timedelta(seconds=LEASE_SECONDS))
+            except PanelImportLeaseLostError:
+                raise
+            except Exception:
+                logger.exception("Could not renew the lease of import job %s", job.id)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except Exception:
+                logger.exception("Could not claim an import job")
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._current_job = job.id
+            renewal = asyncio.create_task(self._renew_lease(job), name=f"panel-import-lease-{job.id}")
+            try:
+                await self._import(job, renewal)
+            except asyncio.CancelledError:
+                await asyncio.shield(self._release(job))
+                raise
+            except PanelImportLeaseLostError:
+                logger.warning("Import job %s was claimed by another worker; stopped importing it", job.id)
+            except Exception as e:
+                logger.exception("Import job %s failed", job.id)
+                self.jobs_failed += 1
+                await self._release(
+                    job,
+                    status=PanelImportStatus.FAILED,
+                    detail=str(e) or type(e).__name__,
+                    finished_at=datetime.now(timezone.utc)
+                )
+            finally:
+                renewal.cancel()
+                self._current_job = None
+
+    async def _skip_imported(self, panels: List[ElectronicPanel]) -> List[ElectronicPanel]:
+        """
+        Drop panels a previous, interrupted run inserted before it could record the chunk.
+        """
+        if not panels:
+            return panels
+        page = await self._service.list_panels(PanelFilter(ids=[panel.id for panel in panels]), len(panels))
+        imported = {view.id for view in page.items}
+        return [panel for panel in panels if panel.id not in imported]
+
+    async def _import(self, job: PanelImportJob, renewal: asyncio.Task) -> None:
+        loop = asyncio.get_running_loop()
+        upload_path = str(self.upload_path(job.id))
+        columns, data_start = await asyncio.to_thread(_read_header, upload_path, job.format)
+        if columns is not None and "name" not in columns:
+            raise ValueError("The CSV header must name the panel fields (name, location, ...)")
+        namespace = UUID(job.id)
+        resuming = job.bytes_done > 0
+        offset = max(job.bytes_done, data_start)
+        rows_read = job.rows_read
+        rows_imported = job.rows_imported
+        rows_rejected = job.rows_rejected
+        running_seconds = job.running_seconds
+        if resuming:
+            logger.info("Resuming import job %s at row %d", job.id, rows_read + 1)
+
+        # Chunks read and sent for validation, with the offset and row count they end at.
+        in_flight: Deque[Tuple[asyncio.Future, int, int]] = deque()
+        read_ahead = max(1, self._validation_workers)
+        end_of_file = False
+        with open(self.error_report_path(job.id), "ab") as error_report:
+            # Rows of chunks that were not recorded as committed are reported again.
+            error_report.truncate(job.error_report_bytes)
+            error_report.seek(0, os.SEEK_END)
+            while True:
+                started = time.perf_counter()
+                while not end_of_file and len(in_flight) < read_ahead:
+                    records, next_offset = await asyncio.to_thread(
+                        _read_records, upload_path, job.format, offset, self._chunk_rows
+                    )
+                    if not records:
+                        end_of_file = True
+                        offset = next_offset
+                        break
+                    future = loop.run_in_executor(
+                        self._executor, validate_records, job.format, columns, namespace, rows_read + 1, records
+                    )
+                    rows_read += len(records)
+                    offset = next_offset
+                    in_flight.append((future, offset, rows_read))
+                if not in_flight:
+                    break
+
+                future, chunk_offset, chunk_rows_read = in_flight.popleft()
+                valid, errors = await future
+                # Validated in the worker already; construct without validating again.
+                panels = [ElectronicPanel.model_construct(**values) for values in valid]
+                if renewal.done():
+                    # Re-raises PanelImportLeaseLostError: another worker owns the job now.
+                    renewal.result()
+                # Panels an interrupted run inserted count as imported, but are not inserted again.
+                rows_imported += len(panels)
+                if resuming:
+                    panels = await self._skip_imported(panels)
+                    resuming = False
+                await self._service.create_panels(panels, self._insert_chunk_size)
+                if errors:
+                    report = "".join(json.dumps({"row": row, "detail": detail}) + "\n" for row, detail in errors)
+                    error_report.write(report.encode("utf-8"))
+                    error_report.flush()
+
+                rows_rejected += len(errors)
+                self.rows_imported += len(panels)
+                self.rows_rejected += len(errors)
+                running_seconds += time.perf_counter() - started
+                await self._save(
+                    job,
+                    bytes_done=chunk_offset,
+                    rows_read=chunk_rows_read,
+                    rows_imported=rows_imported,
+                    rows_rejected=rows_rejected,
+                    error_report_bytes=error_report.tell(),
+                    running_seconds=running_seconds
+                )
+
+        await self._save(
+            job,
+            status=PanelImportStatus.COMPLETED,
+            bytes_done=job.bytes_total,
+            finished_at=datetime.now(timezone.utc),
+            lease_owner=None,
+            lease_expires_at=None
+        )
+        self.jobs_completed += 1
+        os.remove(upload_path)
+        logger.info(
+            "Import job %s completed: %d panels imported, %d rows rejected",
+            job.id, rows_imported, rows_rejected
+        )
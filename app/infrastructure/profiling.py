@@ -0,0 +1,122 @@
+import cProfile
+import io
+import marshal
+import pstats
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional
+
+
+@dataclass
+class RequestProfile:
+    """
+    cProfile capture of a single request.
+
+    Attributes:
+        id (str): Identifier returned to the client in X-Profile-Id.
+        method (str): HTTP method of the request.
+        path (str): Path of the request.
+        status (int): Response status code.
+        duration_seconds (float): Wall time of the request.
+        statements (Optional[int]): SQL statements executed, when request accounting is on.
+        db_seconds (Optional[float]): Time spent in them, when request accounting is on.
+        stats (bytes): Marshalled pstats data, loadable with pstats or snakeviz.
+        created_at (datetime): When the request finished (UTC).
+    """
+    id: str
+    method: str
+    path: str
+    status: int
+    duration_seconds: float
+    statements: Optional[int]
+    db_seconds: Optional[float]
+    stats: bytes
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_text(self, limit: int = 60) -> str:
+        """
+        Render the profile as a pstats report sorted by cumulative time.
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(_StatsSource(marshal.loads(self.stats)), stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return stream.getvalue()
+
+
+class _StatsSource:
+    """
+    Minimal object pstats.Stats accepts in place of a profiler.
+    """
+
+    def __init__(self, stats: dict) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class ProfileStore:
+    """
+    Keeps the most recent request profiles in memory and hands out the profiler.
+
+    cProfile hooks the whole thread, so only one request is profiled at a
+    time, and the profile also contains whatever other requests ran on the
+    event loop meanwhile.
+    """
+
+    def __init__(self, max_profiles: int = 20) -> None:
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._profiling = False
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """
+        Start profiling, or return None when another request is being profiled.
+        """
+        if self._profiling:
+            return None
+        self._profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def finish(
+        self,
+        profiler: cProfile.Profile,
+        method: str,
+        path: str,
+        status: int,
+        duration_seconds: float,
+        statements: Optional[int] = None,
+        db_seconds: Optional[float] = None,
+        profile_id: Optional[str] = None
+    ) -> RequestProfile:
+        profiler.disable()
+        self._profiling = False
+        profiler.create_stats()
+        profile = RequestProfile(
+            id=profile_id or new_profile_id(),
+            method=method,
+            path=path,
+            status=status,
+            duration_seconds=duration_seconds,
+            statements=statements,
+            db_seconds=db_seconds,
+            stats=marshal.dumps(profiler.stats)
+        )
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        return profile
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> List[RequestProfile]:
+        return list(reversed(self._profiles.values()))
+
+
+def new_profile_id() -> str:
+    return uuid.uuid4().hex
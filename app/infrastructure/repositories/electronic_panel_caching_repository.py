@@ -0,0 +1,197 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.domain.repositories.electronic_panel_repository import ElectronicPanelRepository
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_change import PanelChange
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_revision import PanelRevision
+from app.domain.model.value_objects.panel_stats import PanelStatsDimension, PanelStatsGroup
+from app.domain.model.value_objects.panel_view import PanelView
+from app.infrastructure.cache import LRUTTLCache, MISSING
+
+
+class CachingElectronicPanelRepository(ElectronicPanelRepository):
+    """
+    Read-through cache for get_by_id/exists in front of another ElectronicPanelRepository.
+
+    Entries hold column values rather than entities, so every hit returns a
+    new detached ElectronicPanel that callers can modify freely. Unknown ids
+    are cached too (negative caching) for a shorter time. Writes made through
+    this repository refresh or invalidate the affected entries; writes made
+    by other processes become visible once entries expire.
+    """
+    def __init__(
+        self,
+        repository: ElectronicPanelRepository,
+        max_entries: int = 10000,
+        ttl_seconds: float = 30.0,
+        negative_ttl_seconds: float = 5.0
+    ) -> None:
+        self._repository = repository
+        self._cache = LRUTTLCache(max_entries, ttl_seconds)
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._write_count = 0
+        self.negative_hits = 0
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {**self._cache.stats(), "negative_hits": self.negative_hits}
+
+    def _store(self, panel: ElectronicPanel) -> None:
+        self._cache.set(panel.id, panel.model_dump())
+
+    def _forget(self, panel_id: UUID) -> None:
+        self._write_count += 1
+        self._cache.delete(panel_id)
+
+    @staticmethod
+    def _hydrate(data: Dict[str, Any]) -> ElectronicPanel:
+        panel = ElectronicPanel.model_validate(data)
+        make_transient_to_detached(panel)
+        return panel
+
+    async def create(self, panel: ElectronicPanel) -> ElectronicPanel:
+        self._forget(panel.id)
+        try:
+            created = await self._repository.create(panel)
+        finally:
+            self._write_count += 1
+        self._store(created)
+        return created
+
+    async def create_many(self, panels: List[ElectronicPanel], chunk_size: int) -> List[ElectronicPanel]:
+        for panel in panels:
+            self._forget(panel.id)
+        try:
+            return await self._repository.create_many(panels, chunk_size)
+        finally:
+            for panel in panels:
+                self._forget(panel.id)
+
+    async def get_by_id(self, panel_id: UUID) -> Optional[ElectronicPanel]:
+        data = self._cache.get(panel_id)
+        if data is None:
+            self.negative_hits += 1
+            return None
+        if data is not MISSING:
+            return self._hydrate(data)
+
+        write_count = self._write_count
+        panel = await self._repository.get_by_id(panel_id)
+        # A write that completed while we were reading may have made this result stale.
+        if write_count == self._write_count:
+            if panel is None:
+                self._cache.set(panel_id, None, self._negative_ttl_seconds)
+            else:
+                self._store(panel)
+        return panel
+
+    async def list_all(self) -> List[ElectronicPanel]:
+        return await self._repository.list_all()
+
+    async def list_page(
+        self,
+        filters: PanelFilter,
+        limit: int,
+        after_id: Optional[UUID] = None
+    ) -> List[PanelView]:
+        return await self._repository.list_page(filters, limit, after_id)
+
+    async def count(self, filters: PanelFilter) -> int:
+        return await self._repository.count(filters)
+
+    def stream(self, filters: PanelFilter) -> AsyncIterator[PanelView]:
+        return self._repository.stream(filters)
+
+    async def update(self, panel: ElectronicPanel, expected_version: Optional[int] = None) -> PanelRevision:
+        self._forget(panel.id)
+        try:
+            revision = await self._repository.update(panel, expected_version)
+        finally:
+            self._write_count += 1
+        self._store(revision.panel)
+        return revision
+
+    async def patch(
+        self,
+        panel_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> PanelRevision:
+        self._forget(panel_id)
+        try:
+            revision = await self._repository.patch(panel_id, changes, expected_version)
+        finally:
+            self._write_count += 1
+        self._store(revision.panel)
+        return revision
+
+    async def update_where(
+        self,
+        filters: PanelFilter,
+        changes: Dict[str, Any],
+        returning: bool = False
+    ) -> Tuple[int, List[PanelRevision]]:
+        self._write_count += 1
+        try:
+            updated_count, revisions = await self._repository.update_where(filters, changes, returning)
+        finally:
+            self._write_count += 1
+            if filters.ids is not None:
+                for panel_id in filters.ids:
+                    self._cache.delete(panel_id)
+            else:
+                self._cache.clear()
+        for revision in revisions:
+            self._store(revision.panel)
+        return updated_count, revisions
+
+    async def delete(self, panel_id: UUID) -> bool:
+        self._forget(panel_id)
+        try:
+            return await self._repository.delete(panel_id)
+        finally:
+            self._forget(panel_id)
+
+    async def exists(self, panel_id: UUID) -> bool:
+        data = self._cache.get(panel_id)
+        if data is None:
+            self.negative_hits += 1
+            return False
+        if data is not MISSING:
+            return True
+        return await self._repository.exists(panel_id)
+
+    async def get_version(self, panel_id: UUID) -> Optional[Tuple[int, datetime]]:
+        data = self._cache.get(panel_id)
+        if data is None:
+            self.negative_hits += 1
+            return None
+        if data is not MISSING:
+            return data["version"], data["updated_at"]
+        return await self._repository.get_version(panel_id)
+
+    async def get_generation(self) -> Tuple[int, datetime]:
+        return await self._repository.get_generation()
+
+    async def stats(
+        self,
+        filters: PanelFilter,
+        group_by: List[PanelStatsDimension]
+    ) -> List[PanelStatsGroup]:
+        return await self._repository.stats(filters, group_by)
+
+    async def search(self, query: str, filters: PanelFilter, limit: int) -> List[PanelView]:
+        return await self._repository.search(query, filters, limit)
+
+    async def list_changes(self, since: int, limit: int) -> Tuple[int, List[PanelChange]]:
+        return await self._repository.list_changes(since, limit)
+
+    async def record_sync_client(self, client_id: str, since: int) -> None:
+        await self._repository.record_sync_client(client_id, since)
+
+    async def compact_changes(self, tombstone_retention: timedelta, client_ttl: timedelta) -> Tuple[int, int]:
+        return await self._repository.compact_changes(tombstone_retention, client_ttl)
@@ -0,0 +1,208 @@
+import asyncio
+from datetime import datetime, timedelta
+from uuid import UUID
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.domain.repositories.electronic_panel_repository import ElectronicPanelRepository
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_change import PanelChange
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_revision import PanelRevision
+from app.domain.model.value_objects.panel_stats import PanelStatsDimension, PanelStatsGroup
+from app.domain.model.value_objects.panel_view import PanelView
+
+T = TypeVar("T")
+
+
+def _same(result: T) -> T:
+    return result
+
+
+def _copy_list(result: List[T]) -> List[T]:
+    return list(result)
+
+
+def _copy_panel(panel: Optional[ElectronicPanel]) -> Optional[ElectronicPanel]:
+    if panel is None:
+        return None
+    copy = ElectronicPanel.model_validate(panel.model_dump())
+    make_transient_to_detached(copy)
+    return copy
+
+
+class _Flight:
+    """
+    A read in progress, shared by every caller that asks for the same thing meanwhile.
+    """
+    __slots__ = ("epoch", "task")
+
+    def __init__(self, epoch: int, task: "asyncio.Task") -> None:
+        self.epoch = epoch
+        self.task = task
+
+
+class CoalescingElectronicPanelRepository(ElectronicPanelRepository):
+    """
+    Single-flight layer in front of another ElectronicPanelRepository.
+
+    Concurrent identical reads (same operation, same arguments) share one
+    call to the wrapped repository and its result. A caller only joins a
+    read that started after the last write made through this repository
+    completed, so it never gets data from before a write that finished
+    before it asked. Writes from other processes are not seen, so there a
+    joined read can predate such a write by at most one query's duration.
+
+    The shared call runs as its own task: a caller that is cancelled (e.g.
+    the client went away) does not cancel it for the others. Every joined
+    caller gets its own copy of mutable results (entities and lists).
+    """
+    def __init__(self, repository: ElectronicPanelRepository) -> None:
+        self._repository = repository
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._write_epoch = 0
+        self.calls = 0
+        self.coalesced = 0
+
+    def coalescing_stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._flights),
+            "calls": self.calls,
+            "coalesced": self.coalesced
+        }
+
+    async def _single_flight(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[T]],
+        copy: Callable[[T], T] = _same
+    ) -> T:
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is not None and flight.epoch == self._write_epoch:
+            self.coalesced += 1
+            return copy(await asyncio.shield(flight.task))
+
+        flight = _Flight(self._write_epoch, asyncio.ensure_future(call()))
+        self._flights[key] = flight
+
+        def land(task: "asyncio.Task") -> None:
+            # A newer flight may have replaced this one after a write.
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if not task.cancelled():
+                task.exception()  # retrieved, in case every caller was cancelled
+
+        flight.task.add_done_callback(land)
+        return await asyncio.shield(flight.task)
+
+    async def _write(self, call: Awaitable[T]) -> T:
+        try:
+            return await call
+        finally:
+            self._write_epoch += 1
+
+    async def create(self, panel: ElectronicPanel) -> ElectronicPanel:
+        return await self._write(self._repository.create(panel))
+
+    async def create_many(self, panels: List[ElectronicPanel], chunk_size: int) -> List[ElectronicPanel]:
+        return await self._write(self._repository.create_many(panels, chunk_size))
+
+    async def get_by_id(self, panel_id: UUID) -> Optional[ElectronicPanel]:
+        return await self._single_flight(
+            ("get_by_id", panel_id),
+            lambda: self._repository.get_by_id(panel_id),
+            _copy_panel
+        )
+
+    async def list_all(self) -> List[ElectronicPanel]:
+        return await self._repository.list_all()
+
+    async def list_page(
+        self,
+        filters: PanelFilter,
+        limit: int,
+        after_id: Optional[UUID] = None
+    ) -> List[PanelView]:
+        return await self._single_flight(
+            ("list_page", filters.key(), limit, after_id),
+            lambda: self._repository.list_page(filters, limit, after_id),
+            _copy_list
+        )
+
+    async def count(self, filters: PanelFilter) -> int:
+        return await self._single_flight(
+            ("count", filters.key()),
+            lambda: self._repository.count(filters)
+        )
+
+    def stream(self, filters: PanelFilter) -> AsyncIterator[PanelView]:
+        return self._repository.stream(filters)
+
+    async def update(self, panel: ElectronicPanel, expected_version: Optional[int] = None) -> PanelRevision:
+        return await self._write(self._repository.update(panel, expected_version))
+
+    async def patch(
+        self,
+        panel_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> PanelRevision:
+        return await self._write(self._repository.patch(panel_id, changes, expected_version))
+
+    async def update_where(
+        self,
+        filters: PanelFilter,
+        changes: Dict[str, Any],
+        returning: bool = False
+    ) -> Tuple[int, List[PanelRevision]]:
+        return await self._write(self._repository.update_where(filters, changes, returning))
+
+    async def delete(self, panel_id: UUID) -> bool:
+        return await self._write(self._repository.delete(panel_id))
+
+    async def exists(self, panel_id: UUID) -> bool:
+        return await self._single_flight(
+            ("exists", panel_id),
+            lambda: self._repository.exists(panel_id)
+        )
+
+    async def get_version(self, panel_id: UUID) -> Optional[Tuple[int, datetime]]:
+        return await self._single_flight(
+            ("get_version", panel_id),
+            lambda: self._repository.get_version(panel_id)
+        )
+
+    async def get_generation(self) -> Tuple[int, datetime]:
+        return await self._single_flight(
+            ("get_generation",),
+            self._repository.get_generation
+        )
+
+    async def stats(
+        self,
+        filters: PanelFilter,
+        group_by: List[PanelStatsDimension]
+    ) -> List[PanelStatsGroup]:
+        return await self._single_flight(
+            ("stats", filters.key(), tuple(group_by)),
+            lambda: self._repository.stats(filters, group_by),
+            _copy_list
+        )
+
+    async def search(self, query: str, filters: PanelFilter, limit: int) -> List[PanelView]:
+        return await self._single_flight(
+            ("search", query, filters.key(), limit),
+            lambda: self._repository.search(query, filters, limit),
+            _copy_list
+        )
+
+    async def list_changes(self, since: int, limit: int) -> Tuple[int, List[PanelChange]]:
+        return await self._repository.list_changes(since, limit)
+
+    async def record_sync_client(self, client_id: str, since: int) -> None:
+        await self._repository.record_sync_client(client_id, since)
+
+    async def compact_changes(self, tombstone_retention: timedelta, client_ttl: timedelta) -> Tuple[int, int]:
+        return await self._repository.compact_changes(tombstone_retention, client_ttl)
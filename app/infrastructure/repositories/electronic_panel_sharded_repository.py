@@ -0,0 +1,463 @@
+import asyncio
+import heapq
+import logging
+import zlib
+from datetime import datetime, timedelta
+from itertools import chain
+from uuid import UUID
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar
+)
+
+from sqlalchemy import Column, Integer, MetaData, Table, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_change import PanelChange, PanelChangeType
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_revision import PanelRevision
+from app.domain.model.value_objects.panel_stats import PanelStatsDimension, PanelStatsGroup
+from app.domain.model.value_objects.panel_view import PanelView
+from app.domain.repositories.electronic_panel_repository import ElectronicPanelRepository
+from app.infrastructure import db
+from app.infrastructure.settings import Settings
+from app.infrastructure.shard_change_merger import ShardChangeMerger
+from app.infrastructure.tables import PanelChangeRecord
+from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import (
+    ElectronicPanelSQLModelRepository,
+    installation_year_violations
+)
+from app.infrastructure.write_batcher import WriteBatcher
+
+if TYPE_CHECKING:
+    from app.infrastructure.container import Container
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Tables of the main database only, outside SQLModel's metadata so shard databases do not get them.
+main_metadata = MetaData()
+
+# How far each shard's change log has been copied into the merged log of the main database.
+panel_shard_change_cursors = Table(
+    "panel_shard_change_cursors",
+    main_metadata,
+    Column("shard", Integer, primary_key=True),
+    Column("imported_through", Integer, nullable=False)
+)
+
+# Shard log entries copied into the merged log per shard and transaction.
+CHANGE_IMPORT_BATCH_SIZE = 1000
+
+
+def _group_sort_key(group: PanelStatsGroup) -> Tuple[Tuple[bool, Any], ...]:
+    # Same order as SQLite's ORDER BY on the grouping columns: NULLs first.
+    return tuple((value is not None, value) for value in group.dimensions.values())
+
+
+async def _merge_streams(streams: Sequence[AsyncIterator[PanelView]]) -> AsyncIterator[PanelView]:
+    """
+    K-way merge of id-ordered streams, reading one row ahead from each.
+    """
+    heap: List[Tuple[UUID, int, PanelView]] = []
+    for index, stream in enumerate(streams):
+        view = await anext(stream, None)
+        if view is not None:
+            heap.append((view.id, index, view))
+    heapq.heapify(heap)
+    try:
+        while heap:
+            _, index, view = heap[0]
+            yield view
+            following = await anext(streams[index], None)
+            if following is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (following.id, index, following))
+    finally:
+        for stream in streams:
+            await stream.aclose()
+
+
+class ShardedElectronicPanelRepository(ElectronicPanelRepository):
+    """
+    Spreads panels over several databases, each with its own SQLite writer lock.
+
+    A panel lives on the shard its id hashes to, so reads and writes by id
+    go to that shard only, and creating a panel writes nothing but its
+    shard. Ids are random, which spreads the panels of every site, and the
+    write load, evenly over the shards.
+
+    Everything else fans out to all shards concurrently and merges the
+    results: pages and streams by id, which keeps the id keyset cursor
+    valid across shards, counts and statistics by summing, search by rank.
+    Writes spanning several shards commit per shard, not atomically, except
+    that a batch create deletes the panels it created on the other shards
+    again when one shard fails.
+
+    Every shard logs its own changes. Delta sync reads a merged log in the
+    main database instead, `change_log`, into which the new entries of the
+    shards are copied by `merge_changes` (run in the background by
+    ShardChangeMerger) and before each compaction, in one transaction per
+    batch, advancing a cursor per shard. Each shard's
+    entries keep their order and panels never change shard, so the merged
+    sequence orders the changes of every panel as they were committed.
+    Copied entries are deleted from the shards when the merged log is
+    compacted.
+    """
+
+    def __init__(
+        self,
+        shards: Sequence[ElectronicPanelSQLModelRepository],
+        main_session_factory: async_sessionmaker[AsyncSession],
+        main_read_session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+        main_write_batcher: Optional[WriteBatcher] = None,
+        change_log: Optional[ElectronicPanelSQLModelRepository] = None
+    ) -> None:
+        if not shards:
+            raise ValueError("At least one shard is required")
+        self._shards = list(shards)
+        self._change_log = change_log or ElectronicPanelSQLModelRepository(
+            main_session_factory,
+            main_read_session_factory,
+            main_write_batcher
+        )
+        self._main_session_factory = main_session_factory
+        self._main_read_session_factory = main_read_session_factory or main_session_factory
+        self._main_write_batcher = main_write_batcher
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    def shard_of(self, panel_id: UUID) -> int:
+        """
+        Shard the panel with this id lives on.
+        """
+        return zlib.crc32(panel_id.bytes) % len(self._shards)
+
+    def _shard(self, panel_id: UUID) -> ElectronicPanelSQLModelRepository:
+        return self._shards[self.shard_of(panel_id)]
+
+    async def _fan_out(self, operation: Callable[[ElectronicPanelSQLModelRepository], Awaitable[T]]) -> List[T]:
+        return await asyncio.gather(*(operation(shard) for shard in self._shards))
+
+    async def _write_main(self, operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        if self._main_write_batcher is not None:
+            return await self._main_write_batcher.submit(operation)
+        async with self._main_session_factory() as session:
+            async with session.begin():
+                return await operation(session)
+
+    async def create(self, panel: ElectronicPanel) -> ElectronicPanel:
+        return await self._shard(panel.id).create(panel)
+
+    async def create_many(self, panels: List[ElectronicPanel], chunk_size: int) -> List[ElectronicPanel]:
+        by_shard: Dict[int, List[ElectronicPanel]] = {}
+        for panel in panels:
+            by_shard.setdefault(self.shard_of(panel.id), []).append(panel)
+        results = await asyncio.gather(
+            *(self._shards[shard].create_many(shard_panels, chunk_size) for shard, shard_panels in by_shard.items()),
+            return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            # Each shard commits on its own: take back what the others inserted, so the batch stays all or nothing.
+            committed = [
+                (shard, shard_panels)
+                for (shard, shard_panels), result in zip(by_shard.items(), results)
+                if not isinstance(result, BaseException)
+            ]
+            compensations = await asyncio.gather(
+                *(self._shards[shard].delete_many([panel.id for panel in shard_panels]) for shard, shard_panels in committed),
+                return_exceptions=True
+            )
+            for (shard, shard_panels), compensation in zip(committed, compensations):
+                if isinstance(compensation, BaseException):
+                    logger.error(
+                        "Could not roll back %d panels created on shard %d", len(shard_panels), shard, exc_info=compensation
+                    )
+            raise errors[0]
+        return panels
+
+    async def get_by_id(self, panel_id: UUID) -> Optional[ElectronicPanel]:
+        return await self._shard(panel_id).get_by_id(panel_id)
+
+    async def list_all(self) -> List[ElectronicPanel]:
+        return list(chain.from_iterable(await self._fan_out(lambda shard: shard.list_all())))
+
+    async def list_page(
+        self,
+        filters: PanelFilter,
+        limit: int,
+        after_id: Optional[UUID] = None
+    ) -> List[PanelView]:
+        # Each shard returns its first `limit` rows after the cursor; the first `limit` of
+        # their id-ordered merge are the page, and its last id is the next cursor for every shard.
+        pages = await self._fan_out(lambda shard: shard.list_page(filters, limit, after_id))
+        merged = heapq.merge(*pages, key=lambda view: view.id)
+        return [view for _, view in zip(range(limit), merged)]
+
+    async def count(self, filters: PanelFilter) -> int:
+        return sum(await self._fan_out(lambda shard: shard.count(filters)))
+
+    async def stream(self, filters: PanelFilter) -> AsyncIterator[PanelView]:
+        async for view in _merge_streams([shard.stream(filters) for shard in self._shards]):
+            yield view
+
+    async def update(self, panel: ElectronicPanel, expected_version: Optional[int] = None) -> PanelRevision:
+        return await self._shard(panel.id).update(panel, expected_version)
+
+    async def patch(
+        self,
+        panel_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> PanelRevision:
+        return await self._shard(panel_id).patch(panel_id, changes, expected_version)
+
+    async def update_where(
+        self,
+        filters: PanelFilter,
+        changes: Dict[str, Any],
+        returning: bool = False
+    ) -> Tuple[int, List[PanelRevision]]:
+        violations = installation_year_violations(filters, changes)
+        if violations is not None:
+            # Each shard guards its own UPDATE; checking every shard first keeps a
+            # violation in one of them from leaving the others updated.
+            violating, rule = violations
+            conflicts = sum(await self._fan_out(lambda shard: shard.count(violating)))
+            if conflicts:
+                raise ValueError(f"{rule}, violated by {conflicts} matching panel(s)")
+        results = await self._fan_out(lambda shard: shard.update_where(filters, changes, returning))
+        return (
+            sum(updated_count for updated_count, _ in results),
+            list(chain.from_iterable(revisions for _, revisions in results))
+        )
+
+    async def delete(self, panel_id: UUID) -> bool:
+        return await self._shard(panel_id).delete(panel_id)
+
+    async def exists(self, panel_id: UUID) -> bool:
+        return await self._shard(panel_id).exists(panel_id)
+
+    async def get_version(self, panel_id: UUID) -> Optional[Tuple[int, datetime]]:
+        return await self._shard(panel_id).get_version(panel_id)
+
+    async def get_generation(self) -> Tuple[int, datetime]:
+        # Every write bumps one shard's generation, so the sum changes whenever any shard does.
+        generations = await self._fan_out(lambda shard: shard.get_generation())
+        return (
+            sum(generation for generation, _ in generations),
+            max(updated_at for _, updated_at in generations)
+        )
+
+    async def stats(
+        self,
+        filters: PanelFilter,
+        group_by: List[PanelStatsDimension]
+    ) -> List[PanelStatsGroup]:
+        merged: Dict[Tuple[Any, ...], PanelStatsGroup] = {}
+        for groups in await self._fan_out(lambda shard: shard.stats(filters, group_by)):
+            for group in groups:
+                key = tuple(group.dimensions.values())
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = group
+                else:
+                    merged[key] = PanelStatsGroup(
+                        dimensions=total.dimensions,
+                        panel_count=total.panel_count + group.panel_count,
+                        amperage_total=total.amperage_total + group.amperage_total
+                    )
+        return sorted(merged.values(), key=_group_sort_key)
+
+    async def search(self, query: str, filters: PanelFilter, limit: int) -> List[PanelView]:
+        # bm25 scores use per-shard document statistics, so the cross-shard order is approximate.
+        ranked = await self._fan_out(lambda shard: shard.search_ranked(query, filters, limit))
+        merged = heapq.merge(*ranked, key=lambda match: match[0])
+        return [view for _, (_, view) in zip(range(limit), merged)]
+
+    async def init_change_cursors(self) -> None:
+        """
+        Start the cursor of every shard that has none at the beginning of its log.
+        """
+        statement = sqlite_insert(panel_shard_change_cursors).on_conflict_do_nothing()
+
+        async def operation(session: AsyncSession) -> None:
+            await session.execute(statement, [{"shard": shard, "imported_through": 0} for shard in range(len(self._shards))])
+
+        await self._write_main(operation)
+
+    async def _change_cursors(self) -> Dict[int, int]:
+        statement = select(panel_shard_change_cursors.c.shard, panel_shard_change_cursors.c.imported_through)
+        async with self._main_read_session_factory() as session:
+            return dict((await session.execute(statement)).all())
+
+    async def merge_changes(self) -> int:
+        """
+        Copy the entries the shards logged since the last merge into the merged log.
+
+        Returns the number of entries copied.
+        """
+        _, merged = await self._import_changes()
+        return merged
+
+    async def _import_changes(self) -> Tuple[Dict[int, int], int]:
+        """
+        Copy new shard log entries into the merged log until it has caught up.
+
+        A batch is only copied if its shard's cursor is still where it was
+        read, so concurrent imports never copy an entry twice. Returns the
+        cursors afterwards and the number of entries this call copied.
+        """
+        imported = 0
+        while True:
+            cursors = await self._change_cursors()
+            batches = await asyncio.gather(*(
+                self._shards[shard].list_changes(imported_through, CHANGE_IMPORT_BATCH_SIZE)
+                for shard, imported_through in cursors.items()
+            ))
+            pending = {shard: changes for shard, (_, changes) in zip(cursors, batches) if changes}
+            if not pending:
+                return cursors, imported
+
+            async def operation(session: AsyncSession) -> int:
+                copied = 0
+                for shard, changes in pending.items():
+                    claimed = await session.execute(
+                        update(panel_shard_change_cursors)
+                        .where(panel_shard_change_cursors.c.shard == shard)
+                        .where(panel_shard_change_cursors.c.imported_through == cursors[shard])
+                        .values(imported_through=changes[-1].seq)
+                    )
+                    if not claimed.rowcount:
+                        continue
+                    await session.execute(
+                        insert(PanelChangeRecord),
+                        [
+                            {"panel_id": change.panel_id, "operation": change.type, "changed_at": change.changed_at}
+                            for change in changes
+                        ]
+                    )
+                    copied += len(changes)
+                return copied
+
+            imported += await self._write_main(operation)
+
+    async def list_changes(self, since: int, limit: int) -> Tuple[int, List[PanelChange]]:
+        compacted_through, changes = await self._change_log.list_changes(since, limit)
+        # The merged log holds no panels; read the current ones from the shards.
+        upserted = list({change.panel_id for change in changes if change.type == PanelChangeType.UPSERT})
+        panels: Dict[UUID, PanelView] = {}
+        if upserted:
+            pages = await self._fan_out(lambda shard: shard.list_page(PanelFilter(ids=upserted), len(upserted)))
+            panels = {view.id: view for view in chain.from_iterable(pages)}
+        return compacted_through, [
+            change._replace(panel=panels.get(change.panel_id)) if change.type == PanelChangeType.UPSERT else change
+            for change in changes
+        ]
+
+    async def record_sync_client(self, client_id: str, since: int) -> None:
+        await self._change_log.record_sync_client(client_id, since)
+
+    async def compact_changes(self, tombstone_retention: timedelta, client_ttl: timedelta) -> Tuple[int, int]:
+        cursors, _ = await self._import_changes()
+        result = await self._change_log.compact_changes(tombstone_retention, client_ttl)
+        await asyncio.gather(*(
+            self._shards[shard].discard_changes(imported_through)
+            for shard, imported_through in cursors.items()
+        ))
+        return result
+
+
+def shard_settings(settings: Settings, index: int) -> Settings:
+    """
+    The settings of shard `index`: `settings` pointed at its database.
+    """
+    return settings.model_copy(update={"database_url": settings.shard_database_url_template.format(shard=index)})
+
+
+def create_sharded_repository(container: "Container") -> ShardedElectronicPanelRepository:
+    """
+    Repository factory for REMS_PANEL_REPOSITORY=sharded.
+
+    Opens a writer and a reader engine per shard database (from
+    REMS_SHARD_DATABASE_URL_TEMPLATE) and, when write batching is on, a
+    write batcher per shard, and registers their hooks on the container,
+    along with the ShardChangeMerger feeding the merged change log.
+    """
+    settings = container.settings
+    writers: List[AsyncEngine] = []
+    readers: List[AsyncEngine] = []
+    shards: List[ElectronicPanelSQLModelRepository] = []
+    batchers: List[WriteBatcher] = []
+    for index in range(settings.shard_count):
+        settings_of_shard = shard_settings(settings, index)
+        writer = db.create_engine(settings_of_shard, label=f"shard{index}-writer")
+        writers.append(writer)
+        reader = writer
+        if settings.database_separate_reader and not db._is_memory_database(settings_of_shard.database_url):
+            reader = db.create_engine(settings_of_shard, read_only=True, label=f"shard{index}-reader")
+            readers.append(reader)
+        session_factory = async_sessionmaker(bind=writer, expire_on_commit=False)
+        write_batcher = None
+        if settings.write_batching_enabled:
+            write_batcher = WriteBatcher(
+                session_factory,
+                max_batch_size=settings.write_batch_max_size,
+                max_wait_ms=settings.write_batch_max_wait_ms
+            )
+            batchers.append(write_batcher)
+        shards.append(ElectronicPanelSQLModelRepository(
+            session_factory,
+            async_sessionmaker(bind=reader, expire_on_commit=False),
+            write_batcher
+        ))
+
+    async def init_shards() -> None:
+        async with db.async_engine.begin() as conn:
+            await conn.run_sync(main_metadata.create_all)
+        await asyncio.gather(*(db.init_engine(writer) for writer in writers))
+        await repository.init_change_cursors()
+        for write_batcher in batchers:
+            await write_batcher.start()
+
+    async def dispose_shards() -> None:
+        await asyncio.gather(*(engine.dispose() for engine in writers + readers))
+
+    async def stop_batchers() -> None:
+        for write_batcher in batchers:
+            await write_batcher.stop()
+
+    repository = ShardedElectronicPanelRepository(
+        shards,
+        db.get_async_session_factory(),
+        db.get_async_read_session_factory(),
+        container.write_batcher
+    )
+    merger = ShardChangeMerger(repository, settings.shard_change_merge_interval_seconds)
+    container.database_engines.extend(writers + readers)
+
+    container.on_startup("shards", init_shards)
+    container.on_startup("shard change merger", merger.start)
+    container.on_shutdown("shards", dispose_shards)
+    # Registered after the dispose hook, so pending writes are drained before the engines close.
+    container.on_shutdown("shard write batchers", stop_batchers)
+    container.on_shutdown("shard change merger", merger.stop)
+    container.export_stats("shard_change_merger", merger.stats, ("runs", "merged_entries"))
+    return repository
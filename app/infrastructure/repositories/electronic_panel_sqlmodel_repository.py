@@ -1,59 +1,617 @@
+import re
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
-from sqlmodel import select
+from sqlmodel import select, func, insert, update, delete
+from sqlalchemy import column, exists, literal_column, table
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.sql import Select
 from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
 from app.domain.repositories.electronic_panel_repository import ElectronicPanelRepository
 
 from app.domain.model.entities.electronic_panel import ElectronicPanel
-    
+from app.domain.model.value_objects.panel_change import PanelChange, PanelChangeType
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_revision import PanelPlacement, PanelRevision
+from app.domain.model.value_objects.panel_stats import PanelStatsDimension, PanelStatsGroup
+from app.domain.model.value_objects.panel_view import PanelView
+from app.domain.exceptions.electronic_panel_exceptions import PanelNotFoundError, PanelVersionConflictError
+from app.infrastructure.migrations import compact_change_log
+from app.infrastructure.tables import (
+    MILLIAMPS_PER_AMP,
+    PanelChangeLogState,
+    PanelChangeRecord,
+    PanelStateSummary,
+    PanelSyncClient,
+    PanelTableState
+)
+from app.infrastructure.write_batcher import WriteBatcher
+
+T = TypeVar("T")
+
+_SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Weights of name, location and brand in the bm25 ranking.
+SEARCH_WEIGHTS = (10.0, 5.0, 2.0)
+
+# Columns returned by UPDATE ... RETURNING to build a fresh panel, see _returned_panel.
+PANEL_COLUMNS = tuple(ElectronicPanel.__table__.columns)
+
+# Columns whose values before an update are read for the change events, see PanelRevision.
+PLACEMENT_COLUMNS = (ElectronicPanel.location, ElectronicPanel.state)
+
+# Columns selected to hydrate a PanelView, in field order.
+PANEL_VIEW_COLUMNS = tuple(getattr(ElectronicPanel, field) for field in PanelView._fields)
+
+electronic_panels_fts = table(
+    "electronic_panels_fts",
+    column("rowid"),
+    column("name"),
+    column("location"),
+    column("brand")
+)
+
+
+def apply_panel_filter(statement: Select, filters: PanelFilter) -> Select:
+    """
+    Push the criteria of a PanelFilter down into a SELECT, UPDATE or DELETE statement.
+    """
+    if filters.ids is not None:
+        statement = statement.where(ElectronicPanel.id.in_(filters.ids))
+    if filters.state is not None:
+        statement = statement.where(ElectronicPanel.state == filters.state)
+    if filters.location is not None:
+        statement = statement.where(ElectronicPanel.location == filters.location)
+    if filters.brand is not None:
+        statement = statement.where(ElectronicPanel.brand == filters.brand)
+    if filters.year_manufactured_from is not None:
+        statement = statement.where(ElectronicPanel.year_manufactured >= filters.year_manufactured_from)
+    if filters.year_manufactured_to is not None:
+        statement = statement.where(ElectronicPanel.year_manufactured <= filters.year_manufactured_to)
+    if filters.year_installed_from is not None:
+        statement = statement.where(ElectronicPanel.year_installed >= filters.year_installed_from)
+    if filters.year_installed_to is not None:
+        statement = statement.where(ElectronicPanel.year_installed <= filters.year_installed_to)
+    if filters.amperage_min is not None:
+        statement = statement.where(ElectronicPanel.amperage_capacity >= filters.amperage_min)
+    if filters.amperage_max is not None:
+        statement = statement.where(ElectronicPanel.amperage_capacity <= filters.amperage_max)
+    return statement
+
+
+def _returned_panel(row: Row) -> ElectronicPanel:
+    """
+    Build a detached panel from a RETURNING row.
+
+    Batched writes share one session, whose identity map would hand every
+    operation on a panel the same instance, holding the first operation's
+    values; building the panel from the returned columns gives each
+    operation the row exactly as its own statement left it.
+    """
+    panel = ElectronicPanel.model_validate(dict(row._mapping))
+    make_transient_to_detached(panel)
+    return panel
+
+
+def _moves_panels(changes: Dict[str, Any]) -> bool:
+    """
+    Whether an update may change the placement of the panels, so it has to be read beforehand.
+    """
+    return any(column.key in changes for column in PLACEMENT_COLUMNS)
+
+
+def _revision(panel: ElectronicPanel, previous: Optional[PanelPlacement] = None) -> PanelRevision:
+    """
+    Pair an updated panel with its placement before; by default the update left it in place.
+    """
+    return PanelRevision(panel, previous or PanelPlacement(panel.location, panel.state))
+
+
+def page_statement(filters: PanelFilter, limit: int, after_id: Optional[UUID] = None) -> Select:
+    """
+    The keyset-paginated SELECT behind list_page: panels matching `filters` after `after_id`, by id.
+    """
+    statement = apply_panel_filter(select(*PANEL_VIEW_COLUMNS), filters)
+    if after_id is not None:
+        statement = statement.where(ElectronicPanel.id > after_id)
+    return statement.order_by(ElectronicPanel.id).limit(limit)
+
+
+def installation_year_violations(filters: PanelFilter, changes: Dict[str, Any]) -> Optional[Tuple[PanelFilter, str]]:
+    """
+    For a patch that sets only one of the years, the filter matching the panels it would
+    leave installed before they were manufactured, and the rule they would break.
+    """
+    if "year_installed" in changes and "year_manufactured" not in changes:
+        year = changes["year_installed"]
+        lower = filters.year_manufactured_from
+        violating = filters.model_copy(update={
+            "year_manufactured_from": max(lower, year + 1) if lower is not None else year + 1
+        })
+        return violating, f"year_installed ({year}) must be >= year_manufactured"
+    if "year_manufactured" in changes and "year_installed" not in changes:
+        year = changes["year_manufactured"]
+        upper = filters.year_installed_to
+        violating = filters.model_copy(update={
+            "year_installed_to": min(upper, year - 1) if upper is not None else year - 1
+        })
+        return violating, f"year_installed must be >= year_manufactured ({year})"
+    return None
+
+
+def to_fts_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query that matches every word as a prefix.
+
+    "MDP basement B" becomes '"MDP"* "basement"* "B"*'.
+    """
+    tokens = _SEARCH_TOKEN.findall(query)
+    if not tokens:
+        raise ValueError("Search query must contain at least one letter or digit")
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
 class ElectronicPanelSQLModelRepository(ElectronicPanelRepository):
     """
     SQLModel-based implementation of the ElectronicPanelRepository.
 
     This repository uses an AsyncSession to interact with a database asynchronously.
+    Reads go through `read_session_factory` when one is given (e.g. a read-only
+    engine with its own pool) and writes through `session_factory`, or through
+    `write_batcher` when one is given so that concurrent writes share a commit.
     """
-    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+    STREAM_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        read_session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+        write_batcher: Optional[WriteBatcher] = None
+    ) -> None:
         self._session_factory = session_factory
+        self._read_session_factory = read_session_factory or session_factory
+        self._write_batcher = write_batcher
 
-    async def create(self, panel: ElectronicPanel) -> ElectronicPanel:
+    async def _write(self, operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """
+        Run a write operation in a transaction, shared with other writes when batching.
+        """
+        if self._write_batcher is not None:
+            return await self._write_batcher.submit(operation)
         async with self._session_factory() as session:
             async with session.begin():
-                session.add(panel)
-            await session.refresh(panel)
+                return await operation(session)
+
+    @staticmethod
+    async def _bump_generation(session: AsyncSession) -> None:
+        """
+        Record in the current transaction that the panels table changed.
+        """
+        statement = (
+            update(PanelTableState)
+            .where(PanelTableState.id == 1)
+            .values(generation=PanelTableState.generation + 1, updated_at=datetime.now(timezone.utc))
+        )
+        await session.execute(statement)
+
+    async def create(self, panel: ElectronicPanel) -> ElectronicPanel:
+        async def operation(session: AsyncSession) -> ElectronicPanel:
+            session.add(panel)
+            await session.flush()
+            await self._bump_generation(session)
             return panel
+
+        return await self._write(operation)
+
+    async def create_many(self, panels: List[ElectronicPanel], chunk_size: int) -> List[ElectronicPanel]:
+        statement = insert(ElectronicPanel)
+
+        async def operation(session: AsyncSession) -> List[ElectronicPanel]:
+            for start in range(0, len(panels), chunk_size):
+                chunk = panels[start:start + chunk_size]
+                await session.execute(statement, [panel.model_dump() for panel in chunk])
+            await self._bump_generation(session)
+            return panels
+
+        return await self._write(operation)
     
     async def get_by_id(self, panel_id: UUID) -> Optional[ElectronicPanel]:
-        async with self._session_factory() as session:
+        async with self._read_session_factory() as session:
             panel = await session.get(ElectronicPanel, panel_id)
             return panel
     
     async def list_all(self) -> List[ElectronicPanel]:
         statement = select(ElectronicPanel)
-        async with self._session_factory() as session:
+        async with self._read_session_factory() as session:
             results = await session.execute(statement)
             panels = results.scalars().all()
             return panels
+
+    async def list_page(
+        self,
+        filters: PanelFilter,
+        limit: int,
+        after_id: Optional[UUID] = None
+    ) -> List[PanelView]:
+        statement = page_statement(filters, limit, after_id)
+        async with self._read_session_factory() as session:
+            results = await session.execute(statement)
+            return list(map(PanelView._make, results))
+
+    async def count(self, filters: PanelFilter) -> int:
+        statement = apply_panel_filter(select(func.count()).select_from(ElectronicPanel), filters)
+        async with self._read_session_factory() as session:
+            results = await session.execute(statement)
+            return results.scalar_one()
+
+    async def stream(self, filters: PanelFilter) -> AsyncIterator[PanelView]:
+        statement = (
+            apply_panel_filter(select(*PANEL_VIEW_COLUMNS), filters)
+            .order_by(ElectronicPanel.id)
+            .execution_options(yield_per=self.STREAM_BATCH_SIZE)
+        )
+        async with self._read_session_factory() as session:
+            results = await session.stream(statement)
+            async for row in results:
+                yield PanelView._make(row)
     
-    async def update(self, panel: ElectronicPanel) -> ElectronicPanel:
-        async with self._session_factory() as session:
-            async with session.begin():
-                session.add(panel)
-            await session.refresh(panel)
-            return panel
-    
+    async def update(self, panel: ElectronicPanel, expected_version: Optional[int] = None) -> PanelRevision:
+        updated_at = datetime.now(timezone.utc)
+        statement = update(ElectronicPanel).where(ElectronicPanel.id == panel.id)
+        if expected_version is not None:
+            statement = statement.where(ElectronicPanel.version == expected_version)
+        statement = (
+            statement
+            .values(
+                **panel.model_dump(exclude={"id", "version", "updated_at"}),
+                version=ElectronicPanel.version + 1,
+                updated_at=updated_at
+            )
+            .returning(ElectronicPanel.version)
+            .execution_options(synchronize_session=False)
+        )
+        # Most updates leave the panel where it was: guarded on the stored placement,
+        # those need no prior read. Only when the guard fails is the placement read.
+        in_place = statement.where(ElectronicPanel.location == panel.location, ElectronicPanel.state == panel.state)
+        placement = select(*PLACEMENT_COLUMNS).where(ElectronicPanel.id == panel.id)
+        async def operation(session: AsyncSession) -> Tuple[int, Optional[PanelPlacement]]:
+            version = (await session.execute(in_place)).scalar_one_or_none()
+            if version is not None:
+                await self._bump_generation(session)
+                return version, None
+            previous = (await session.execute(placement)).one_or_none()
+            if previous is not None:
+                version = (await session.execute(statement)).scalar_one_or_none()
+            if version is None:
+                current = await session.scalar(
+                    select(ElectronicPanel.version).where(ElectronicPanel.id == panel.id)
+                )
+                if current is not None and expected_version is not None:
+                    raise PanelVersionConflictError(panel.id, expected_version, current)
+                raise PanelNotFoundError(panel.id)
+            await self._bump_generation(session)
+            return version, PanelPlacement._make(previous)
+
+        version, previous = await self._write(operation)
+        panel.version = version
+        panel.updated_at = updated_at
+        return _revision(panel, previous)
+
+    async def patch(
+        self,
+        panel_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> PanelRevision:
+        statement = update(ElectronicPanel).where(ElectronicPanel.id == panel_id)
+        if expected_version is not None:
+            statement = statement.where(ElectronicPanel.version == expected_version)
+        # When only one year changes, the installation-year rule depends on the stored
+        # other year, so it is checked by the UPDATE itself instead of a prior read.
+        if "year_installed" in changes and "year_manufactured" not in changes:
+            statement = statement.where(ElectronicPanel.year_manufactured <= changes["year_installed"])
+        elif "year_manufactured" in changes and "year_installed" not in changes:
+            statement = statement.where(ElectronicPanel.year_installed >= changes["year_manufactured"])
+        statement = (
+            statement
+            .values(**changes, version=ElectronicPanel.version + 1, updated_at=datetime.now(timezone.utc))
+            .returning(*PANEL_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        placement = None
+        if _moves_panels(changes):
+            placement = select(*PLACEMENT_COLUMNS).where(ElectronicPanel.id == panel_id)
+        async def operation(session: AsyncSession) -> PanelRevision:
+            previous = None
+            if placement is not None:
+                previous = (await session.execute(placement)).one_or_none()
+            results = await session.execute(statement)
+            row = results.one_or_none()
+            if row is None:
+                await self._explain_missed_patch(session, panel_id, changes, expected_version)
+            await self._bump_generation(session)
+            return _revision(_returned_panel(row), PanelPlacement._make(previous) if previous else None)
+
+        return await self._write(operation)
+
+    @staticmethod
+    async def _explain_missed_patch(
+        session: AsyncSession,
+        panel_id: UUID,
+        changes: Dict[str, Any],
+        expected_version: Optional[int]
+    ) -> None:
+        """
+        Raise the reason a single-row patch matched no row. Only runs on the failure path.
+        """
+        statement = select(
+            ElectronicPanel.version,
+            ElectronicPanel.year_manufactured,
+            ElectronicPanel.year_installed
+        ).where(ElectronicPanel.id == panel_id)
+        current = (await session.execute(statement)).one_or_none()
+        if current is None:
+            raise PanelNotFoundError(panel_id)
+        if expected_version is not None and current.version != expected_version:
+            raise PanelVersionConflictError(panel_id, expected_version, current.version)
+        year_manufactured = changes.get("year_manufactured", current.year_manufactured)
+        year_installed = changes.get("year_installed", current.year_installed)
+        raise ValueError(
+            f"year_installed ({year_installed}) must be >= "
+            f"year_manufactured ({year_manufactured})"
+        )
+
+    @staticmethod
+    async def _explain_missed_update(session: AsyncSession, violating: PanelFilter, rule: str) -> None:
+        """
+        Raise when a guarded bulk update matched no row because of the installation-year rule.
+        """
+        statement = apply_panel_filter(select(func.count()).select_from(ElectronicPanel), violating)
+        conflicts = (await session.execute(statement)).scalar_one()
+        if conflicts:
+            raise ValueError(f"{rule}, violated by {conflicts} matching panel(s)")
+
+    async def update_where(
+        self,
+        filters: PanelFilter,
+        changes: Dict[str, Any],
+        returning: bool = False
+    ) -> Tuple[int, List[PanelRevision]]:
+        statement = apply_panel_filter(update(ElectronicPanel), filters)
+        violations = installation_year_violations(filters, changes)
+        if violations is not None:
+            # All or nothing: the UPDATE only applies when no matched panel would break the rule,
+            # which is checked in the same statement rather than by a prior read.
+            violating = apply_panel_filter(select(ElectronicPanel.id), violations[0]).correlate(None)
+            statement = statement.where(~exists(violating))
+        statement = (
+            statement
+            .values(**changes, version=ElectronicPanel.version + 1, updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        placements = None
+        if returning:
+            statement = statement.returning(*PANEL_COLUMNS)
+            if _moves_panels(changes):
+                placements = apply_panel_filter(select(ElectronicPanel.id, *PLACEMENT_COLUMNS), filters)
+        async def operation(session: AsyncSession) -> Tuple[int, List[PanelRevision]]:
+            previous: Dict[UUID, PanelPlacement] = {}
+            if placements is not None:
+                rows = await session.execute(placements)
+                previous = {row.id: PanelPlacement(row.location, row.state) for row in rows}
+            results = await session.execute(statement)
+            if returning:
+                revisions = [_revision(panel, previous.get(panel.id)) for panel in map(_returned_panel, results)]
+                updated_count = len(revisions)
+            else:
+                revisions = []
+                updated_count = results.rowcount
+            if updated_count:
+                await self._bump_generation(session)
+            elif violations is not None:
+                await self._explain_missed_update(session, *violations)
+            return updated_count, revisions
+
+        return await self._write(operation)
 
     async def delete(self, panel_id: UUID) -> bool:
-        async with self._session_factory() as session:
-            async with session.begin():
-                panel = await session.get(ElectronicPanel, panel_id)
-                if panel is not None:
-                    await session.delete(panel)
-                    return True
-            return False
+        statement = (
+            delete(ElectronicPanel)
+            .where(ElectronicPanel.id == panel_id)
+            .execution_options(synchronize_session=False)
+        )
+        async def operation(session: AsyncSession) -> bool:
+            results = await session.execute(statement)
+            if not results.rowcount:
+                return False
+            await self._bump_generation(session)
+            return True
+
+        return await self._write(operation)
+
+    async def delete_many(self, panel_ids: List[UUID]) -> int:
+        """
+        Delete the panels with these ids, returning how many existed.
+        """
+        statement = (
+            delete(ElectronicPanel)
+            .where(ElectronicPanel.id.in_(panel_ids))
+            .execution_options(synchronize_session=False)
+        )
+        async def operation(session: AsyncSession) -> int:
+            results = await session.execute(statement)
+            if results.rowcount:
+                await self._bump_generation(session)
+            return results.rowcount
+
+        return await self._write(operation)
 
     async def exists(self, panel_id: UUID) -> bool:
         statement = select(ElectronicPanel.id).where(ElectronicPanel.id == panel_id)
-        async with self._session_factory() as session:
+        async with self._read_session_factory() as session:
             results = await session.execute(statement)
             return results.scalar_one_or_none() is not None
+
+    async def get_version(self, panel_id: UUID) -> Optional[Tuple[int, datetime]]:
+        statement = select(ElectronicPanel.version, ElectronicPanel.updated_at).where(ElectronicPanel.id == panel_id)
+        async with self._read_session_factory() as session:
+            results = await session.execute(statement)
+            row = results.one_or_none()
+            return tuple(row) if row is not None else None
+
+    async def get_generation(self) -> Tuple[int, datetime]:
+        statement = select(PanelTableState.generation, PanelTableState.updated_at).where(PanelTableState.id == 1)
+        async with self._read_session_factory() as session:
+            results = await session.execute(statement)
+            return tuple(results.one())
+
+    async def stats(
+        self,
+        filters: PanelFilter,
+        group_by: List[PanelStatsDimension]
+    ) -> List[PanelStatsGroup]:
+        if filters == PanelFilter() and set(group_by) <= {PanelStatsDimension.STATE}:
+            return await self._summary_stats(group_by)
+
+        columns = [getattr(ElectronicPanel, dimension.value) for dimension in group_by]
+        statement = apply_panel_filter(
+            select(
+                *columns,
+                func.count().label("panel_count"),
+                func.coalesce(func.sum(ElectronicPanel.amperage_capacity), 0.0).label("amperage_total")
+            ).select_from(ElectronicPanel),
+            filters
+        )
+        if columns:
+            statement = statement.group_by(*columns).order_by(*columns)
+        async with self._read_session_factory() as session:
+            results = await session.execute(statement)
+            return [
+                PanelStatsGroup(
+                    dimensions={dimension.value: row[index] for index, dimension in enumerate(group_by)},
+                    panel_count=row.panel_count,
+                    amperage_total=row.amperage_total
+                )
+                for row in results
+            ]
+
+    async def _summary_stats(self, group_by: List[PanelStatsDimension]) -> List[PanelStatsGroup]:
+        """
+        Answer unfiltered global or per-state statistics from the trigger-maintained summary table.
+        """
+        statement = select(PanelStateSummary).order_by(PanelStateSummary.state)
+        async with self._read_session_factory() as session:
+            results = await session.execute(statement)
+            rows = results.scalars().all()
+        if group_by:
+            return [
+                PanelStatsGroup(
+                    dimensions={PanelStatsDimension.STATE.value: row.state},
+                    panel_count=row.panel_count,
+                    amperage_total=row.amperage_total_milliamps / MILLIAMPS_PER_AMP
+                )
+                for row in rows
+                if row.panel_count
+            ]
+        return [
+            PanelStatsGroup(
+                dimensions={},
+                panel_count=sum(row.panel_count for row in rows),
+                amperage_total=sum(row.amperage_total_milliamps for row in rows) / MILLIAMPS_PER_AMP
+            )
+        ]
+
+    async def search(self, query: str, filters: PanelFilter, limit: int) -> List[PanelView]:
+        return [view for _, view in await self.search_ranked(query, filters, limit)]
+
+    async def search_ranked(self, query: str, filters: PanelFilter, limit: int) -> List[Tuple[float, PanelView]]:
+        """
+        Search like `search`, returning each match with its bm25 rank (lower is better).
+        """
+        fts_table = literal_column("electronic_panels_fts")
+        matches = (
+            select(
+                electronic_panels_fts.c.rowid.label("rowid"),
+                func.bm25(fts_table, *SEARCH_WEIGHTS).label("rank")
+            )
+            .select_from(electronic_panels_fts)
+            .where(fts_table.op("MATCH")(to_fts_query(query)))
+            .subquery("matches")
+        )
+        statement = (
+            select(matches.c.rank, *PANEL_VIEW_COLUMNS)
+            .join(matches, literal_column("electronic_panels.rowid") == matches.c.rowid)
+        )
+        statement = apply_panel_filter(statement, filters).order_by(matches.c.rank).limit(limit)
+        async with self._read_session_factory() as session:
+            results = await session.execute(statement)
+            return [(row[0], PanelView._make(row[1:])) for row in results]
+
+    async def list_changes(self, since: int, limit: int) -> Tuple[int, List[PanelChange]]:
+        state_statement = select(PanelChangeLogState.compacted_through).where(PanelChangeLogState.id == 1)
+        # The current row of each upserted panel; NULL columns when it was deleted since.
+        statement = (
+            select(
+                PanelChangeRecord.seq,
+                PanelChangeRecord.operation,
+                PanelChangeRecord.panel_id,
+                PanelChangeRecord.changed_at,
+                *PANEL_VIEW_COLUMNS
+            )
+            .select_from(PanelChangeRecord)
+            .outerjoin(ElectronicPanel, ElectronicPanel.id == PanelChangeRecord.panel_id)
+            .where(PanelChangeRecord.seq > since)
+            .order_by(PanelChangeRecord.seq)
+            .limit(limit)
+        )
+        async with self._read_session_factory() as session:
+            compacted_through = (await session.execute(state_statement)).scalar_one()
+            results = await session.execute(statement)
+            changes = [
+                PanelChange(
+                    seq=row[0],
+                    type=row[1],
+                    panel_id=row[2],
+                    panel=PanelView._make(row[4:]) if row[1] == PanelChangeType.UPSERT and row[4] is not None else None,
+                    changed_at=row[3]
+                )
+                for row in results
+            ]
+        return compacted_through, changes
+
+    async def record_sync_client(self, client_id: str, since: int) -> None:
+        now = datetime.now(timezone.utc)
+        statement = (
+            sqlite_insert(PanelSyncClient)
+            .values(client_id=client_id, since=since, seen_at=now)
+            .on_conflict_do_update(index_elements=[PanelSyncClient.client_id], set_={"since": since, "seen_at": now})
+        )
+        async def operation(session: AsyncSession) -> None:
+            await session.execute(statement)
+
+        await self._write(operation)
+
+    async def compact_changes(self, tombstone_retention: timedelta, client_ttl: timedelta) -> Tuple[int, int]:
+        async def operation(session: AsyncSession) -> Tuple[int, int]:
+            connection = await session.connection()
+            return await connection.run_sync(compact_change_log, tombstone_retention, client_ttl)
+
+        return await self._write(operation)
+
+    async def discard_changes(self, through: int) -> int:
+        """
+        Delete the change log entries up to `through`, once another log holds them.
+        """
+        statement = (
+            delete(PanelChangeRecord)
+            .where(PanelChangeRecord.seq <= through)
+            .execution_options(synchronize_session=False)
+        )
+        async def operation(session: AsyncSession) -> int:
+            results = await session.execute(statement)
+            return results.rowcount
+
+        return await self._write(operation)
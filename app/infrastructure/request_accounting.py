@@ -0,0 +1,105 @@
+import json
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+# Longest statement text written to the slow-query log.
+MAX_LOGGED_STATEMENT_LENGTH = 2000
+
+
+@dataclass
+class RequestStats:
+    """
+    SQL work done on behalf of one request.
+
+    Attributes:
+        method (str): HTTP method of the request.
+        path (str): Path of the request.
+        statements (int): SQL statements executed so far.
+        db_seconds (float): Time spent executing them.
+    """
+    method: str
+    path: str
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def begin_request(method: str, path: str) -> RequestStats:
+    """
+    Start accounting SQL statements to a new request in the current context.
+
+    SQLAlchemy runs engine events inside the awaiting task's context, so
+    statements executed while handling the request are attributed to it.
+    Writes applied by the write batcher run in the batcher's own task and
+    are not attributed to the request that submitted them.
+    """
+    stats = RequestStats(method=method, path=path)
+    _current_request.set(stats)
+    return stats
+
+
+def current_request() -> Optional[RequestStats]:
+    return _current_request.get()
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """
+    Describe bound parameters by type only, so logs never contain values.
+
+    (1, "a") becomes ["int", "str"]; executemany batches become
+    {"rows": n, "row": <shape of the first row>}.
+    """
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def instrument_request_accounting(engine: AsyncEngine, label: str, slow_query_threshold_ms: float) -> None:
+    """
+    Count statements and DB time per request, and log statements slower than the threshold.
+
+    A threshold of 0 disables the slow-query log.
+    """
+    slow_query_seconds = slow_query_threshold_ms / 1000
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("accounting_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        duration = time.perf_counter() - conn.info["accounting_query_start"].pop()
+        stats = _current_request.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += duration
+        if slow_query_seconds and duration >= slow_query_seconds:
+            slow_query_logger.warning(json.dumps({
+                "event": "slow_query",
+                "engine": label,
+                "duration_ms": round(duration * 1000, 3),
+                "statement": statement[:MAX_LOGGED_STATEMENT_LENGTH],
+                "parameters": parameter_shape(parameters),
+                "executemany": executemany,
+                "request": f"{stats.method} {stats.path}" if stats is not None else None
+            }))
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context) -> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("accounting_query_start"):
+            connection.info["accounting_query_start"].pop()
@@ -0,0 +1,106 @@
+import gzip
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional
+
+# Bodies smaller than this are not worth compressing.
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """
+    A response body encoded once and kept in every content coding it is served in.
+
+    Attributes:
+        body (bytes): The identity-encoded body.
+        gzip_body (Optional[bytes]): The gzip-compressed body, or None when compressing would not pay off.
+    """
+    body: bytes
+    gzip_body: Optional[bytes]
+
+    @classmethod
+    def encode(cls, body: bytes) -> "EncodedResponse":
+        gzip_body = None
+        if len(body) >= GZIP_MIN_BYTES:
+            # mtime=0 keeps the compressed bytes identical across processes and restarts.
+            gzip_body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+            if len(gzip_body) >= len(body):
+                gzip_body = None
+        return cls(body, gzip_body)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + (len(self.gzip_body) if self.gzip_body is not None else 0)
+
+
+class ResponseCache:
+    """
+    Final response bytes per query shape, valid for one panels-table generation.
+
+    Every write bumps the generation, so an entry is only served while the
+    table is exactly as it was when the entry was encoded, and no
+    invalidation is needed: storing an entry of a newer generation drops
+    the older ones, which can never be requested again. The generation
+    lives in the database, so this holds across worker processes.
+
+    Entries are evicted least recently used first once their total size
+    exceeds `max_bytes`; entries larger than a quarter of the budget are
+    not stored. Not thread-safe; meant to be used from a single event loop.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._entries: "OrderedDict[Hashable, EncodedResponse]" = OrderedDict()
+        self._max_bytes = max_bytes
+        self._generation = -1
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, generation: int) -> Optional[EncodedResponse]:
+        if generation != self._generation:
+            self.misses += 1
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, generation: int, body: bytes) -> EncodedResponse:
+        """
+        Encode `body` and keep it for `generation`, unless an older generation is asked for.
+        """
+        entry = EncodedResponse.encode(body)
+        if generation < self._generation or entry.size > self._max_bytes // 4:
+            return entry
+        if generation > self._generation:
+            self._entries.clear()
+            self._size = 0
+            self._generation = generation
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= previous.size
+        self._entries[key] = entry
+        self._size += entry.size
+        self.stores += 1
+        while self._size > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+            self.evictions += 1
+        return entry
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions
+        }
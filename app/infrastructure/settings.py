@@ -0,0 +1,108 @@
+import os
+from functools import lru_cache
+from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+
+ENV_PREFIX = "REMS_"
+
+
+class Settings(BaseModel):
+    """
+    Application settings.
+
+    Every field can be overridden through an environment variable named
+    after the field, upper-cased and prefixed with REMS_
+    (e.g. REMS_BULK_INSERT_CHUNK_SIZE=1000).
+    """
+
+    database_url: str = Field(default="sqlite+aiosqlite:///./panels.db", description="SQLAlchemy URL of the panels database")
+    database_echo: bool = Field(default=False, description="Log every SQL statement")
+    database_separate_reader: bool = Field(default=True, description="Send reads to a dedicated read-only engine")
+    database_writer_pool_size: int = Field(default=1, gt=0, description="Connections held by the writer engine")
+    database_reader_pool_size: int = Field(default=8, gt=0, description="Connections held by the reader engine")
+    database_reader_max_overflow: int = Field(default=8, ge=0, description="Extra reader connections allowed under load")
+    database_pool_timeout_seconds: float = Field(default=30.0, gt=0, description="How long to wait for a pooled connection")
+
+    sqlite_journal_mode: str = Field(default="WAL", description="PRAGMA journal_mode")
+    sqlite_synchronous: str = Field(default="NORMAL", description="PRAGMA synchronous")
+    sqlite_busy_timeout_ms: int = Field(default=5000, ge=0, description="PRAGMA busy_timeout")
+    sqlite_mmap_size: int = Field(default=268435456, ge=0, description="PRAGMA mmap_size, in bytes")
+    sqlite_cache_size: int = Field(default=-65536, description="PRAGMA cache_size; negative values are KiB")
+    sqlite_temp_store: str = Field(default="MEMORY", description="PRAGMA temp_store")
+
+    write_batching_enabled: bool = Field(default=False, description="Coalesce concurrent writes into shared transactions")
+    write_batch_max_size: int = Field(default=64, gt=0, description="Maximum number of writes per transaction")
+    write_batch_max_wait_ms: float = Field(default=2.0, ge=0, description="How long a batch waits for more writes")
+
+    panel_repository: str = Field(default="sqlmodel", description="Repository implementation: a registered name or 'package.module:factory'")
+    shard_count: int = Field(default=4, gt=0, description="Number of shard databases used by the sharded repository")
+    shard_database_url_template: str = Field(default="sqlite+aiosqlite:///./panels.shard{shard}.db", description="SQLAlchemy URL of each shard database; {shard} is replaced by its number")
+    shard_change_merge_interval_seconds: float = Field(default=1.0, gt=0, description="How often the shards' change logs are copied into the merged log read by delta sync")
+
+    read_coalescing_enabled: bool = Field(default=True, description="Let concurrent identical reads share one database call")
+
+    response_cache_enabled: bool = Field(default=True, description="Keep encoded GET /panels responses until the table changes")
+    response_cache_max_bytes: int = Field(default=67108864, gt=0, description="Memory budget of the response cache, in bytes")
+
+    admission_control_enabled: bool = Field(default=True, description="Limit concurrent /panels requests and shed the excess with 503")
+    admission_read_concurrency: int = Field(default=32, gt=0, description="Read requests served at once")
+    admission_read_queue_size: int = Field(default=128, ge=0, description="Read requests allowed to wait for a slot")
+    admission_write_concurrency: int = Field(default=8, gt=0, description="Write requests served at once")
+    admission_write_queue_size: int = Field(default=64, ge=0, description="Write requests allowed to wait for a slot")
+    admission_max_wait_seconds: float = Field(default=5.0, gt=0, description="Longest time a request waits for a slot, whatever its X-Request-Timeout")
+
+    bulk_insert_chunk_size: int = Field(default=500, gt=0, description="Rows per executemany batch on bulk inserts")
+    bulk_max_items: int = Field(default=10000, gt=0, description="Maximum number of panels accepted by one bulk request")
+    bulk_max_bytes: int = Field(default=16777216, gt=0, description="Largest accepted bulk request body, in bytes; checked before parsing")
+
+    panel_cache_enabled: bool = Field(default=False, description="Serve get_by_id/exists from an in-process cache")
+    panel_cache_max_entries: int = Field(default=10000, gt=0, description="Maximum number of cached panels")
+    panel_cache_ttl_seconds: float = Field(default=30.0, gt=0, description="How long a cached panel stays fresh")
+    panel_cache_negative_ttl_seconds: float = Field(default=5.0, ge=0, description="How long an unknown id stays cached")
+
+    events_enabled: bool = Field(default=True, description="Serve the live change feed on /panels/events")
+    events_buffer_size: int = Field(default=1024, gt=0, description="Recent events kept for resuming clients")
+    events_queue_size: int = Field(default=256, gt=0, description="Events a subscriber may fall behind before it is evicted")
+    events_max_subscribers: int = Field(default=1000, gt=0, description="Maximum number of concurrent event subscribers")
+    events_heartbeat_seconds: float = Field(default=15.0, gt=0, description="Idle time after which the event stream sends a keep-alive")
+
+    changes_tombstone_retention_hours: float = Field(default=24.0, ge=0, description="Deletions stay in the change log at least this long")
+    changes_client_ttl_days: float = Field(default=30.0, gt=0, description="Sync clients not seen for this long no longer hold back compaction")
+    changes_compaction_interval_seconds: float = Field(default=3600.0, ge=0, description="How often the change log is compacted; 0 disables it")
+
+    imports_enabled: bool = Field(default=True, description="Accept bulk import files on /panels/imports")
+    imports_spool_dir: Optional[str] = Field(default=None, description="Directory holding uploaded import files and their error reports; by default next to the database file")
+    imports_max_bytes: int = Field(default=1073741824, gt=0, description="Largest accepted import file, in bytes")
+    imports_chunk_rows: int = Field(default=5000, gt=0, description="Rows validated and committed together; progress is recorded per chunk")
+    imports_validation_workers: int = Field(default=2, ge=0, description="Processes validating import rows; 0 validates on a thread instead")
+
+    metrics_enabled: bool = Field(default=True, description="Collect request, SQL and pool metrics and serve them on /metrics")
+    health_check_timeout_seconds: float = Field(default=2.0, gt=0, description="How long /health waits for the database")
+
+    request_accounting_enabled: bool = Field(default=True, description="Count SQL statements and DB time per request and report them in Server-Timing")
+    slow_query_threshold_ms: float = Field(default=200.0, ge=0, description="Log statements slower than this; 0 disables the slow-query log")
+    admin_token: Optional[str] = Field(default=None, description="Token expected in X-Admin-Token; admin endpoints are disabled without it")
+    profiling_sample_rate: float = Field(default=0.0, ge=0, le=1, description="Fraction of requests to profile with cProfile; requires admin_token")
+    profiling_max_profiles: int = Field(default=20, gt=0, description="How many request profiles are kept for download")
+
+    @model_validator(mode="after")
+    def _validate_profiling(self) -> "Settings":
+        """
+        Refuse sampled profiling without an admin token: nobody could download the profiles.
+        """
+        if self.profiling_sample_rate and self.admin_token is None:
+            raise ValueError("REMS_PROFILING_SAMPLE_RATE requires REMS_ADMIN_TOKEN")
+        return self
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Load the settings once from the environment.
+    """
+    values = {}
+    for name in Settings.model_fields:
+        env_name = f"{ENV_PREFIX}{name.upper()}"
+        if env_name in os.environ:
+            values[name] = os.environ[env_name]
+    return Settings.model_validate(values)
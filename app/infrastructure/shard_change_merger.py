@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Dict, Optional
+
+from app.infrastructure.background import cancel_and_wait
+
+if TYPE_CHECKING:
+    from app.infrastructure.repositories.electronic_panel_sharded_repository import ShardedElectronicPanelRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ShardChangeMerger:
+    """
+    Background task that copies the shards' change log entries into the merged log.
+
+    Delta sync reads only the merged log, so it trails the shards by up to
+    one interval. Merging is safe to run from several worker processes
+    against the same databases. A failed run is logged and retried at the
+    next interval.
+    """
+
+    def __init__(self, repository: "ShardedElectronicPanelRepository", interval_seconds: float) -> None:
+        self._repository = repository
+        self._interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.merged_entries = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {"runs": self.runs, "merged_entries": self.merged_entries}
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="shard-change-merger")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        await cancel_and_wait(self._task)
+        self._task = None
+
+    async def merge(self) -> None:
+        self.merged_entries += await self._repository.merge_changes()
+        self.runs += 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_seconds)
+            try:
+                await self.merge()
+            except Exception:
+                logger.exception("Merging the shard change logs failed")
@@ -0,0 +1,160 @@
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+from sqlmodel import SQLModel, Field
+
+from app.domain.model.value_objects.panel_change import PanelChangeType
+from app.domain.model.value_objects.panel_import import PanelImportFormat, PanelImportStatus
+from app.domain.model.value_objects.panel_state import PanelState
+
+
+class PanelTableState(SQLModel, table=True):
+    """
+    Single-row bookkeeping table for the electronic_panels table.
+
+    Attributes:
+        id (int): Always 1.
+        generation (int): Incremented by every transaction that writes panels.
+        updated_at (datetime): When generation last changed (UTC).
+    """
+
+    __tablename__ = "electronic_panels_state"
+
+    id: int = Field(default=1, primary_key=True)
+    generation: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# Scale of the fixed-point amperage totals kept by PanelStateSummary.
+MILLIAMPS_PER_AMP = 1000
+
+
+class PanelStateSummary(SQLModel, table=True):
+    """
+    Per-state rollup of the electronic_panels table.
+
+    Kept up to date by triggers on electronic_panels (see migrations), so
+    global fleet statistics never need to scan the panels table. The
+    amperage total is a running sum, so it is kept in integer milliamps:
+    each panel adds and later removes exactly the same rounded amount,
+    where a floating-point sum would drift with every update.
+
+    Attributes:
+        state (PanelState): Panel state the row aggregates.
+        panel_count (int): Number of panels in that state.
+        amperage_total_milliamps (int): Sum of amperage_capacity of those panels,
+            each rounded to the milliamp.
+    """
+
+    __tablename__ = "electronic_panels_state_summary"
+
+    state: PanelState = Field(primary_key=True)
+    panel_count: int = Field(default=0)
+    amperage_total_milliamps: int = Field(default=0)
+
+
+class PanelChangeRecord(SQLModel, table=True):
+    """
+    Append-only log of changes to the electronic_panels table.
+
+    Filled by triggers on electronic_panels (see migrations), so every write
+    path is logged in the same transaction. `seq` comes from AUTOINCREMENT
+    and is never reused, and SQLite commits one writer at a time, so
+    sequence order is commit order.
+
+    Attributes:
+        seq (int): Position of the change in the log.
+        panel_id (UUID): Identifier of the changed panel.
+        operation (PanelChangeType): UPSERT for inserts and updates, DELETE for tombstones.
+        changed_at (datetime): When the change was written (UTC).
+    """
+
+    __tablename__ = "electronic_panels_changes"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    panel_id: UUID = Field(index=True)
+    operation: PanelChangeType
+    changed_at: datetime
+
+
+class PanelChangeLogState(SQLModel, table=True):
+    """
+    Single-row bookkeeping table for the change log.
+
+    Attributes:
+        id (int): Always 1.
+        compacted_through (int): Highest sequence number whose tombstones may have been pruned.
+        compacted_at (Optional[datetime]): When the log was last compacted (UTC).
+    """
+
+    __tablename__ = "electronic_panels_changes_state"
+
+    id: int = Field(default=1, primary_key=True)
+    compacted_through: int = Field(default=0)
+    compacted_at: Optional[datetime] = None
+
+
+class PanelSyncClient(SQLModel, table=True):
+    """
+    Last sequence number each delta-sync client confirmed it has applied.
+
+    Compaction keeps tombstones until every client seen recently has read past them.
+
+    Attributes:
+        client_id (str): Identifier chosen by the client.
+        since (int): The `since` of the client's latest request.
+        seen_at (datetime): When the client last synced (UTC).
+    """
+
+    __tablename__ = "electronic_panels_sync_clients"
+
+    client_id: str = Field(primary_key=True, max_length=100)
+    since: int
+    seen_at: datetime
+
+
+class PanelImportJob(SQLModel, table=True):
+    """
+    A bulk import of an uploaded file, and how far it got.
+
+    The counters and offsets are written in the same step as each chunk is
+    recorded as committed, so an interrupted job resumes from `bytes_done`.
+
+    Attributes:
+        id (str): Job identifier; also names the spooled file and the error report.
+        format (PanelImportFormat): Format of the uploaded file.
+        status (PanelImportStatus): Where the job is in its lifecycle.
+        bytes_total (int): Size of the spooled file.
+        bytes_done (int): Offset just after the last committed chunk.
+        rows_read (int): Rows read up to `bytes_done`.
+        rows_imported (int): Panels inserted.
+        rows_rejected (int): Rows written to the error report.
+        error_report_bytes (int): Size of the error report at the last committed chunk.
+        running_seconds (float): Time spent importing, excluding time queued or interrupted.
+        detail (Optional[str]): Why the job failed.
+        created_at (datetime): When the file was uploaded (UTC).
+        started_at (Optional[datetime]): When the worker first picked the job up (UTC).
+        finished_at (Optional[datetime]): When the job completed or failed (UTC).
+        lease_expires_at (Optional[datetime]): Until when the process importing the job holds it (UTC).
+        lease_owner (Optional[str]): Token of the claim holding the lease; every progress write must match it.
+    """
+
+    __tablename__ = "electronic_panels_import_jobs"
+
+    id: str = Field(primary_key=True, max_length=32)
+    format: PanelImportFormat
+    status: PanelImportStatus = Field(default=PanelImportStatus.QUEUED, index=True)
+    bytes_total: int
+    bytes_done: int = Field(default=0)
+    rows_read: int = Field(default=0)
+    rows_imported: int = Field(default=0)
+    rows_rejected: int = Field(default=0)
+    error_report_bytes: int = Field(default=0)
+    running_seconds: float = Field(default=0.0)
+    detail: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
+    lease_owner: Optional[str] = Field(default=None, max_length=32)
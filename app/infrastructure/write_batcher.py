@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+WriteOperation = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class WriteBatcherClosedError(RuntimeError):
+    """
+    Raised for operations submitted while the write batcher is not running or is stopping.
+    """
+
+
+class WriteBatcher:
+    """
+    Group-commit pipeline for database writes.
+
+    Callers submit write operations (coroutines taking a session) and await
+    their result. A single background task drains the queue and applies up to
+    `max_batch_size` operations, or whatever arrives within `max_wait_ms` of
+    the first one, in one transaction. Each operation runs inside its own
+    SAVEPOINT, so a failing operation only fails its own caller; a failed
+    commit fails the whole batch.
+
+    Operations are only accepted between start() and stop(); once stop()
+    is called, submit() raises WriteBatcherClosedError, and stop() applies
+    what was queued before.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0
+    ) -> None:
+        self._session_factory = session_factory
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.batches = 0
+        self.operations = 0
+        self.failed_operations = 0
+        self.max_batch_size_seen = 0
+        self.queue_wait_seconds_total = 0.0
+        self.queue_wait_seconds_max = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "operations": self.operations,
+            "failed_operations": self.failed_operations,
+            "queue_depth": self.queue_depth(),
+            "avg_batch_size": self.operations / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size_seen,
+            "avg_queue_wait_seconds": self.queue_wait_seconds_total / self.operations if self.operations else 0.0,
+            "max_queue_wait_seconds": self.queue_wait_seconds_max
+        }
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._closing = False
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(), name="write-batcher")
+
+    async def stop(self) -> None:
+        """
+        Apply every operation queued so far, then stop the background task.
+        """
+        if not self.running:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def submit(self, operation: WriteOperation) -> Any:
+        """
+        Queue a write operation and wait for the result of its transaction.
+
+        Raises:
+            WriteBatcherClosedError: If the batcher was not started or is stopping.
+        """
+        if self._closing or not self.running:
+            raise WriteBatcherClosedError("The write batcher is not accepting writes")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future, time.perf_counter()))
+        return await future
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.perf_counter() + self._max_wait_seconds
+            while len(batch) < self._max_batch_size:
+                try:
+                    if self._queue.empty():
+                        remaining = deadline - time.perf_counter()
+                        if remaining <= 0:
+                            break
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._apply(batch)
+        self._fail_queued()
+
+    def _fail_queued(self) -> None:
+        """
+        Fail whatever is still queued behind the stop marker, so no caller waits forever.
+        """
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is None:
+                continue
+            _, future, _ = item
+            if not future.done():
+                self.failed_operations += 1
+                future.set_exception(WriteBatcherClosedError("The write batcher stopped before applying the write"))
+
+    async def _apply(self, batch: List[Tuple[WriteOperation, asyncio.Future, float]]) -> None:
+        started = time.perf_counter()
+        pending = [(operation, future) for operation, future, _ in batch if not future.done()]
+        for _, future, enqueued in batch:
+            wait = started - enqueued
+            self.queue_wait_seconds_total += wait
+            self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, wait)
+        self.batches += 1
+        self.operations += len(batch)
+        self.max_batch_size_seen = max(self.max_batch_size_seen, len(batch))
+
+        outcomes = []
+        try:
+            async with self._session_factory() as session:
+                async with session.begin():
+                    for operation, future in pending:
+                        try:
+                            async with session.begin_nested():
+                                outcomes.append((future, await operation(session), None))
+                        except Exception as e:
+                            outcomes.append((future, None, e))
+        except Exception as e:
+            logger.exception("Write batch of %d operations failed to commit", len(pending))
+            self.failed_operations += len(pending)
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                self.failed_operations += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.admission import AdmissionController, AdmissionRejectedError, READ_METHODS
+
+REQUEST_TIMEOUT_HEADER = "x-request-timeout"
+
+ADMITTED_PREFIX = "/panels"
+# Long-lived streams and uploads would hold a slot for their whole duration.
+EXEMPT_PREFIXES = ("/panels/events", "/panels/export", "/panels/imports")
+
+
+def request_deadline(headers: Headers) -> Optional[float]:
+    """
+    The time.monotonic() deadline set by `X-Request-Timeout: <seconds>`, or None when absent or malformed.
+    """
+    value = headers.get(REQUEST_TIMEOUT_HEADER)
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    if seconds != seconds:  # NaN
+        return None
+    return time.monotonic() + seconds
+
+
+def _is_admitted(path: str) -> bool:
+    if not path.startswith(ADMITTED_PREFIX):
+        return False
+    return not any(path == prefix or path.startswith(prefix + "/") for prefix in EXEMPT_PREFIXES)
+
+
+class AdmissionControlMiddleware:
+    """
+    Pure ASGI middleware limiting how many database-bound /panels requests run at once.
+
+    Reads (GET, HEAD, OPTIONS) and writes go through separate limiters of
+    the AdmissionController. A request that finds the queue of its class
+    full, or that would not get a slot before its deadline, is answered at
+    once with `503 Service Unavailable` and a `Retry-After` estimate.
+
+    Clients may send `X-Request-Timeout: <seconds>`, the time they are
+    willing to wait. It bounds the time spent queueing; for reads it also
+    bounds the time until the response starts, after which the request is
+    abandoned with `504 Gateway Timeout`. An admitted write always runs to
+    completion, as cancelling it would leave its outcome unknown to the
+    client. The live feed, the export stream and imports are not limited.
+
+    Without an explicit controller, the one of the application container on
+    app.state is used, which only exists once the lifespan has started.
+    """
+
+    def __init__(self, app: ASGIApp, controller: Optional[AdmissionController] = None) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _is_admitted(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        controller = self.controller if self.controller is not None else scope["app"].state.container.admission_controller
+        limiter = controller.limiter_for(scope["method"])
+        deadline = request_deadline(Headers(scope=scope))
+
+        try:
+            await limiter.acquire(deadline)
+        except AdmissionRejectedError as e:
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": str(e)},
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            if deadline is None or scope["method"] not in READ_METHODS:
+                await self.app(scope, receive, send)
+            else:
+                await self._call_until_deadline(scope, receive, send, deadline)
+        finally:
+            limiter.release(time.monotonic() - started)
+
+    async def _call_until_deadline(self, scope: Scope, receive: Receive, send: Send, deadline: float) -> None:
+        response_started = asyncio.Event()
+
+        async def send_marking_start(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_started.set()
+            await send(message)
+
+        call = asyncio.ensure_future(self.app(scope, receive, send_marking_start))
+        start_wait = asyncio.ensure_future(response_started.wait())
+        try:
+            await asyncio.wait(
+                (call, start_wait),
+                timeout=max(0.0, deadline - time.monotonic()),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+        except BaseException:
+            call.cancel()
+            raise
+        finally:
+            start_wait.cancel()
+
+        if not call.done() and not response_started.is_set():
+            call.cancel()
+            try:
+                await call
+            except asyncio.CancelledError:
+                pass
+            response = JSONResponse(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                content={"detail": "The request did not complete before its deadline"}
+            )
+            await response(scope, receive, send)
+            return
+        # The response has started (or is done): let it finish.
+        await call
@@ -0,0 +1,56 @@
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+
+_VERSION_ETAG = re.compile(r'^"v(\d+)"$')
+
+
+def panel_etag(version: int) -> str:
+    """
+    Build the entity tag of a single panel from its row version.
+    """
+    return f'"v{version}"'
+
+
+def generation_etag(generation: int) -> str:
+    """
+    Build the entity tag of a panel collection from the table generation.
+    """
+    return f'"g{generation}"'
+
+
+def http_date(value: datetime) -> str:
+    """
+    Format a timestamp for Last-Modified; naive values are taken as UTC.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def if_none_match_hits(header: Optional[str], etag: str) -> bool:
+    """
+    Tell whether an If-None-Match header matches `etag` (weak comparison).
+    """
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def parse_if_match_version(header: str) -> Optional[int]:
+    """
+    Extract the panel version required by an If-Match header.
+
+    Returns None for "*" (any current version). Raises ValueError when the
+    header holds no usable strong panel entity tag.
+    """
+    header = header.strip()
+    if header == "*":
+        return None
+    match = _VERSION_ETAG.match(header)
+    if match is None:
+        raise ValueError(f"If-Match must be a single panel ETag or '*', got {header}")
+    return int(match.group(1))
@@ -0,0 +1,47 @@
+from typing import TYPE_CHECKING, Dict, Optional
+
+from fastapi import Response
+
+if TYPE_CHECKING:
+    from app.infrastructure.response_cache import EncodedResponse
+
+
+def accepts_gzip(header: Optional[str]) -> bool:
+    """
+    Tell whether an Accept-Encoding header allows gzip (explicitly or through "*") with a non-zero quality.
+    """
+    if not header:
+        return False
+    qualities: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, parameters = item.partition(";")
+        quality = 1.0
+        name, _, value = parameters.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0))) > 0
+
+
+def encoded_response(
+    entry: "EncodedResponse",
+    accept_encoding: Optional[str],
+    media_type: str,
+    headers: Dict[str, str]
+) -> Response:
+    """
+    Send a pre-encoded body, compressed when the client accepts it.
+
+    The compressed variant gets a weak ETag, as its bytes differ from the
+    identity variant's; If-None-Match compares weakly, so both revalidate.
+    """
+    headers = {**headers, "Vary": "Accept-Encoding"}
+    if entry.gzip_body is not None and accepts_gzip(accept_encoding):
+        headers["Content-Encoding"] = "gzip"
+        if "ETag" in headers and not headers["ETag"].startswith("W/"):
+            headers["ETag"] = "W/" + headers["ETag"]
+        return Response(content=entry.gzip_body, media_type=media_type, headers=headers)
+    return Response(content=entry.body, media_type=media_type, headers=headers)
@@ -0,0 +1,94 @@
+import random
+import secrets
+import time
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.profiling import ProfileStore, new_profile_id
+from app.infrastructure.request_accounting import current_request
+
+PROFILE_HEADER = "x-profile"
+ADMIN_TOKEN_HEADER = "x-admin-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+def has_admin_token(headers: Headers, admin_token: Optional[str]) -> bool:
+    """
+    Whether the request carries the configured admin token; always False when none is configured.
+    """
+    supplied = headers.get(ADMIN_TOKEN_HEADER)
+    return admin_token is not None and supplied is not None and secrets.compare_digest(supplied, admin_token)
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware that captures a cProfile of selected requests.
+
+    A request is profiled when it sends `X-Profile: 1` together with a valid
+    `X-Admin-Token`, or when it is picked by the sampling rate. The response
+    carries `X-Profile-Id`; the profile can then be downloaded from
+    /admin/profiles/{id}. Without an admin token nothing is profiled, as the
+    profiles could not be downloaded.
+
+    Without an explicit store, the profile store of the application
+    container on app.state is used, which only exists once the lifespan
+    has started.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: Optional[ProfileStore] = None,
+        admin_token: Optional[str] = None,
+        sample_rate: float = 0.0
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+
+    def _wants_profile(self, scope: Scope) -> bool:
+        if self.admin_token is None:
+            return False
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        headers = Headers(scope=scope)
+        return headers.get(PROFILE_HEADER) == "1" and has_admin_token(headers, self.admin_token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        store = self.store if self.store is not None else scope["app"].state.container.profile_store
+        profiler = store.start()
+        if profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = new_profile_id()
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode("ascii"))]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            stats = current_request()
+            store.finish(
+                profiler,
+                method=scope["method"],
+                path=scope["path"],
+                status=status_code,
+                duration_seconds=time.perf_counter() - start,
+                statements=stats.statements if stats is not None else None,
+                db_seconds=stats.db_seconds if stats is not None else None,
+                profile_id=profile_id
+            )
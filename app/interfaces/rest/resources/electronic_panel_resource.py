@@ -1,10 +1,33 @@
+from enum import Enum
+from datetime import datetime
 from uuid import UUID
-from typing import Optional
+from typing import Dict, List, Optional, Union
 from pydantic import BaseModel, Field
 
+from app.domain.model.value_objects.panel_change import PanelChangeType
 from app.domain.model.value_objects.panel_state import PanelState
 
 
+class ElectronicPanelExportFormat(str, Enum):
+    """
+    Output formats supported by the panel export endpoint.
+    """
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ElectronicPanelBulkMode(str, Enum):
+    """
+    How a bulk create request treats invalid items.
+
+    Attributes:
+        ATOMIC (str): Nothing is inserted if any item is invalid.
+        PARTIAL (str): Valid items are inserted, invalid items are reported.
+    """
+    ATOMIC = "atomic"
+    PARTIAL = "partial"
+
+
 class ElectronicPanelCreateResource(BaseModel):
     """
     Request resource for creating a new electronic panel.
@@ -95,7 +118,8 @@ class ElectronicPanelListResource(BaseModel):
     Response resource for a list of electronic panels.
     """
     panels: list[ElectronicPanelResource] = Field(..., description="List of electronic panels")
-    total: int = Field(..., description="Total number of panels")
+    total: Optional[int] = Field(None, description="Total number of panels matching the filters, only when requested")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, null on the last page")
 
     model_config = {
         "json_schema_extra": {
@@ -113,7 +137,8 @@ class ElectronicPanelListResource(BaseModel):
                             "year_installed": 2021
                         }
                     ],
-                    "total": 1
+                    "total": 1,
+                    "next_cursor": None
                 }
             ]
         }
@@ -135,3 +160,202 @@ class ElectronicPanelDeleteResource(BaseModel):
             ]
         }
     }
+
+
+class ElectronicPanelBulkCreatedItemResource(BaseModel):
+    """
+    Response resource for one panel created by a bulk request.
+    """
+    index: int = Field(..., description="Position of the item in the request")
+    id: UUID = Field(..., description="Unique identifier assigned to the panel")
+
+
+class ElectronicPanelBulkItemErrorResource(BaseModel):
+    """
+    Response resource for one item rejected by a bulk request.
+    """
+    index: int = Field(..., description="Position of the item in the request")
+    detail: str = Field(..., description="Why the item was rejected")
+
+
+class ElectronicPanelBulkCreateResultResource(BaseModel):
+    """
+    Response resource for a bulk create request.
+    """
+    created: list[ElectronicPanelBulkCreatedItemResource] = Field(..., description="Panels that were inserted")
+    errors: list[ElectronicPanelBulkItemErrorResource] = Field(..., description="Items that were rejected")
+    created_count: int = Field(..., description="Number of panels inserted")
+    error_count: int = Field(..., description="Number of items rejected")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "created": [
+                        {
+                            "index": 0,
+                            "id": "550e8400-e29b-41d4-a716-446655440000"
+                        }
+                    ],
+                    "errors": [
+                        {
+                            "index": 1,
+                            "detail": "amperage_capacity: Input should be greater than 0"
+                        }
+                    ],
+                    "created_count": 1,
+                    "error_count": 1
+                }
+            ]
+        }
+    }
+
+
+class ElectronicPanelBulkUpdateFilterResource(BaseModel):
+    """
+    Request resource selecting the panels affected by a bulk update.
+    """
+    ids: Optional[List[UUID]] = Field(None, description="Only panels with one of these IDs")
+    location: Optional[str] = Field(None, description="Only panels at this exact location")
+    brand: Optional[str] = Field(None, description="Only panels of this exact brand")
+    state: Optional[PanelState] = Field(None, description="Only panels currently in this state")
+
+
+class ElectronicPanelBulkUpdateResource(BaseModel):
+    """
+    Request resource for applying the same partial update to every matching panel.
+    """
+    filter: ElectronicPanelBulkUpdateFilterResource = Field(..., description="Panels to update; at least one criterion is required")
+    patch: ElectronicPanelUpdateResource = Field(..., description="Fields to set on every matching panel")
+    returning: bool = Field(False, description="Return the updated panels")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "filter": {
+                        "location": "Building A - Basement"
+                    },
+                    "patch": {
+                        "state": "maintenance"
+                    },
+                    "returning": False
+                }
+            ]
+        }
+    }
+
+
+class ElectronicPanelBulkUpdateResultResource(BaseModel):
+    """
+    Response resource for a bulk update request.
+    """
+    updated_count: int = Field(..., description="Number of panels updated")
+    panels: Optional[list[ElectronicPanelResource]] = Field(None, description="Updated panels, only when requested")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "updated_count": 12,
+                    "panels": None
+                }
+            ]
+        }
+    }
+
+
+class ElectronicPanelStatsGroupResource(BaseModel):
+    """
+    Response resource for the aggregates of one group of panels.
+    """
+    dimensions: Dict[str, Union[PanelState, int, str, None]] = Field(..., description="Value of each grouped dimension; empty for the global rollup")
+    panel_count: int = Field(..., description="Number of panels in the group")
+    amperage_total: float = Field(..., description="Sum of the amperage capacity of the group, in amps")
+    amperage_average: Optional[float] = Field(None, description="Average amperage capacity of the group, in amps")
+
+
+class ElectronicPanelStatsResource(BaseModel):
+    """
+    Response resource for fleet statistics.
+    """
+    groups: list[ElectronicPanelStatsGroupResource] = Field(..., description="One entry per group, ordered by the grouped dimensions")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "groups": [
+                        {
+                            "dimensions": {"state": "operative"},
+                            "panel_count": 120,
+                            "amperage_total": 36000.0,
+                            "amperage_average": 300.0
+                        },
+                        {
+                            "dimensions": {"state": "maintenance"},
+                            "panel_count": 4,
+                            "amperage_total": 800.0,
+                            "amperage_average": 200.0
+                        }
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class ElectronicPanelChangeResource(BaseModel):
+    """
+    Response resource for one entry of the change log.
+    """
+    seq: int = Field(..., description="Position of the change in the change log")
+    type: PanelChangeType = Field(..., description="`upsert` for creations and updates, `delete` for deletions")
+    panel_id: UUID = Field(..., description="Unique identifier of the changed panel")
+    panel: Optional[ElectronicPanelResource] = Field(None, description="Current state of the panel; null for deletions")
+    changed_at: datetime = Field(..., description="When the change was written (UTC)")
+
+
+class ElectronicPanelChangeListResource(BaseModel):
+    """
+    Response resource for a page of the change log.
+    """
+    changes: list[ElectronicPanelChangeResource] = Field(..., description="Changes in sequence order, at most one per panel")
+    next_since: int = Field(..., description="Pass as `since` to fetch the following changes")
+    has_more: bool = Field(..., description="Whether more changes can be fetched right away")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "changes": [
+                        {
+                            "seq": 41,
+                            "type": "upsert",
+                            "panel_id": "550e8400-e29b-41d4-a716-446655440000",
+                            "panel": {
+                                "id": "550e8400-e29b-41d4-a716-446655440000",
+                                "name": "Main Distribution Panel",
+                                "location": "Building A - Basement",
+                                "brand": "Siemens",
+                                "amperage_capacity": 400.0,
+                                "state": "maintenance",
+                                "year_manufactured": 2020,
+                                "year_installed": 2021
+                            },
+                            "changed_at": "2024-05-02T08:15:00.123000"
+                        },
+                        {
+                            "seq": 42,
+                            "type": "delete",
+                            "panel_id": "6fa459ea-ee8a-3ca4-894e-db77e160355e",
+                            "panel": None,
+                            "changed_at": "2024-05-02T08:16:30.004000"
+                        }
+                    ],
+                    "next_since": 42,
+                    "has_more": False
+                }
+            ]
+        }
+    }
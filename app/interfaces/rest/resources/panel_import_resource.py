@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from app.domain.model.value_objects.panel_import import PanelImportFormat, PanelImportStatus
+
+
+class PanelImportJobResource(BaseModel):
+    """
+    Response resource describing a bulk import job and its progress.
+    """
+    id: str = Field(..., description="Job identifier")
+    format: PanelImportFormat = Field(..., description="Format of the uploaded file")
+    status: PanelImportStatus = Field(..., description="Where the job is in its lifecycle")
+    bytes_total: int = Field(..., description="Size of the uploaded file")
+    bytes_done: int = Field(..., description="Bytes of the file imported so far")
+    progress: float = Field(..., description="Fraction of the file imported, from 0 to 1")
+    rows_read: int = Field(..., description="Rows read so far")
+    rows_imported: int = Field(..., description="Panels created so far")
+    rows_rejected: int = Field(..., description="Rows rejected so far, listed in the error report")
+    rows_per_second: Optional[float] = Field(None, description="Rows read per second of import time")
+    error_report_url: str = Field(..., description="Where to download the per-row error report (NDJSON)")
+    detail: Optional[str] = Field(None, description="Why the job failed")
+    created_at: datetime = Field(..., description="When the file was uploaded (UTC)")
+    started_at: Optional[datetime] = Field(None, description="When the import started (UTC)")
+    finished_at: Optional[datetime] = Field(None, description="When the import completed or failed (UTC)")
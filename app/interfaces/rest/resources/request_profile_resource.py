@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class RequestProfileResource(BaseModel):
+    """
+    Response resource describing a captured request profile.
+    """
+    id: str = Field(..., description="Profile identifier, as returned in X-Profile-Id")
+    method: str = Field(..., description="HTTP method of the profiled request")
+    path: str = Field(..., description="Path of the profiled request")
+    status: int = Field(..., description="Response status code")
+    duration_ms: float = Field(..., description="Wall time of the request in milliseconds")
+    statements: Optional[int] = Field(None, description="SQL statements executed by the request")
+    db_ms: Optional[float] = Field(None, description="Time spent executing SQL, in milliseconds")
+    created_at: datetime = Field(..., description="When the request finished (UTC)")
+
+
+class RequestProfileListResource(BaseModel):
+    """
+    Response resource for the list of captured profiles, most recent first.
+    """
+    profiles: List[RequestProfileResource] = Field(..., description="Captured profiles")
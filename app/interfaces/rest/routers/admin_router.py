@@ -0,0 +1,87 @@
+from enum import Enum
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+
+from app.infrastructure.dependencies import get_profile_store
+from app.infrastructure.profiling import ProfileStore, RequestProfile
+from app.infrastructure.settings import get_settings
+from app.interfaces.rest.profiling_middleware import has_admin_token
+from app.interfaces.rest.resources.request_profile_resource import (
+    RequestProfileResource,
+    RequestProfileListResource
+)
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+class ProfileFormat(str, Enum):
+    PSTATS = "pstats"
+    TEXT = "text"
+
+
+def require_admin(request: Request) -> None:
+    """
+    Dependency that only lets requests carrying the configured X-Admin-Token through.
+    """
+    admin_token = get_settings().admin_token
+    if admin_token is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not has_admin_token(request.headers, admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or missing X-Admin-Token")
+
+
+def _to_resource(profile: RequestProfile) -> RequestProfileResource:
+    return RequestProfileResource(
+        id=profile.id,
+        method=profile.method,
+        path=profile.path,
+        status=profile.status,
+        duration_ms=profile.duration_seconds * 1000,
+        statements=profile.statements,
+        db_ms=profile.db_seconds * 1000 if profile.db_seconds is not None else None,
+        created_at=profile.created_at
+    )
+
+
+@router.get(
+    "/profiles",
+    response_model=RequestProfileListResource,
+    dependencies=[Depends(require_admin)],
+    summary="List captured request profiles",
+    description=(
+        "Profiles captured for requests sent with `X-Profile: 1` and a valid `X-Admin-Token`, "
+        "or picked by `REMS_PROFILING_SAMPLE_RATE`. Only the most recent ones are kept."
+    )
+)
+async def list_profiles(store: ProfileStore = Depends(get_profile_store)) -> RequestProfileListResource:
+    return RequestProfileListResource(profiles=[_to_resource(profile) for profile in store.list()])
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_class=Response,
+    dependencies=[Depends(require_admin)],
+    summary="Download a request profile",
+    description=(
+        "Download a profile as pstats data (open with `python -m pstats` or snakeviz) "
+        "or as a text report sorted by cumulative time."
+    ),
+    responses={200: {"content": {"application/octet-stream": {}, "text/plain": {}}}}
+)
+async def get_profile(
+    profile_id: str,
+    format: ProfileFormat = Query(ProfileFormat.PSTATS, description="Download format"),
+    store: ProfileStore = Depends(get_profile_store)
+) -> Response:
+    profile = store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+    if format == ProfileFormat.TEXT:
+        return Response(content=profile.to_text(), media_type="text/plain")
+    return Response(
+        content=profile.stats,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile.id}.prof"'}
+    )
@@ -1,20 +1,103 @@
+import json
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Optional
+from fastapi import APIRouter, HTTPException, Header, Query, Request, Response, status, Depends
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 
 from app.interfaces.rest.resources.electronic_panel_resource import (
     ElectronicPanelResource,
     ElectronicPanelCreateResource,
     ElectronicPanelUpdateResource,
     ElectronicPanelListResource,
-    ElectronicPanelDeleteResource
+    ElectronicPanelDeleteResource,
+    ElectronicPanelExportFormat,
+    ElectronicPanelBulkMode,
+    ElectronicPanelBulkCreateResultResource,
+    ElectronicPanelBulkUpdateResource,
+    ElectronicPanelBulkUpdateResultResource,
+    ElectronicPanelStatsResource,
+    ElectronicPanelChangeListResource
 )
 
 from app.interfaces.rest.transforms.electronic_panel_assembler import ElectronicPanelAssembler
+from app.interfaces.rest.transforms.electronic_panel_serializer import ElectronicPanelSerializer
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_state import PanelState
+from app.domain.model.value_objects.panel_stats import PanelStatsDimension
+from app.domain.model.value_objects.panel_view import PanelView
 from app.domain.services.electronic_panel_service import ElectronicPanelService
-from app.infrastructure.dependencies import get_electronic_panel_service
+from app.infrastructure.dependencies import get_electronic_panel_service, get_response_cache
+from app.infrastructure.settings import get_settings
+from app.domain.exceptions.electronic_panel_exceptions import (
+    PanelChangesCompactedError,
+    PanelNotFoundError,
+    PanelVersionConflictError
+)
+from app.interfaces.rest.content_coding import encoded_response
+from app.interfaces.rest.conditional import (
+    panel_etag,
+    generation_etag,
+    http_date,
+    if_none_match_hits,
+    parse_if_match_version
+)
+
+if TYPE_CHECKING:
+    from app.infrastructure.response_cache import ResponseCache
 
 router = APIRouter(prefix="/panels", tags=["Electronic Panels"])
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+EXPORT_FLUSH_ROWS = 500
+DEFAULT_CHANGES_LIMIT = 1000
+MAX_CHANGES_LIMIT = 5000
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+EXPORT_MEDIA_TYPES = {
+    ElectronicPanelExportFormat.NDJSON: NDJSON_MEDIA_TYPE,
+    ElectronicPanelExportFormat.CSV: "text/csv",
+}
+
+
+def get_panel_filter(
+    state: Optional[PanelState] = Query(None, description="Only panels in this state"),
+    location: Optional[str] = Query(None, description="Only panels at this exact location"),
+    brand: Optional[str] = Query(None, description="Only panels of this exact brand"),
+    year_manufactured_from: Optional[int] = Query(None, description="Minimum year manufactured (inclusive)"),
+    year_manufactured_to: Optional[int] = Query(None, description="Maximum year manufactured (inclusive)"),
+    year_installed_from: Optional[int] = Query(None, description="Minimum year installed (inclusive)"),
+    year_installed_to: Optional[int] = Query(None, description="Maximum year installed (inclusive)"),
+    amperage_min: Optional[float] = Query(None, description="Minimum amperage capacity (inclusive)"),
+    amperage_max: Optional[float] = Query(None, description="Maximum amperage capacity (inclusive)")
+) -> PanelFilter:
+    """
+    Build a PanelFilter from the query string.
+    """
+    try:
+        return PanelFilter(
+            state=state,
+            location=location,
+            brand=brand,
+            year_manufactured_from=year_manufactured_from,
+            year_manufactured_to=year_manufactured_to,
+            year_installed_from=year_installed_from,
+            year_installed_to=year_installed_to,
+            amperage_min=amperage_min,
+            amperage_max=amperage_max
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.post(
     "",
     response_model=ElectronicPanelResource,
@@ -37,64 +120,428 @@ async def create_panel(
         )
 
 
+def _describe_error(error: ValueError) -> str:
+    """
+    Render a validation error as a compact single-line message.
+    """
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+            for item in error.errors()
+        )
+    return str(error)
+
+
+def _bulk_too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
+async def _read_bulk_items(request: Request, max_items: int, max_bytes: int) -> List[Any]:
+    """
+    Read the items of a bulk request from a JSON array or an NDJSON body.
+
+    Oversized bodies are refused from Content-Length, or while streaming
+    when it is absent or wrong, before anything is buffered past the cap
+    or parsed.
+    """
+    too_many_bytes = f"A bulk request body may be at most {max_bytes} bytes"
+    too_many_items = f"A bulk request accepts at most {max_items} panels"
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise _bulk_too_large(too_many_bytes)
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise _bulk_too_large(too_many_bytes)
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        if content_type == NDJSON_MEDIA_TYPE:
+            lines = [line for line in body.splitlines() if line.strip()]
+            if len(lines) > max_items:
+                raise _bulk_too_large(too_many_items)
+            items = [json.loads(line) for line in lines]
+        else:
+            items = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Malformed request body: {e}"
+        )
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request body must be a JSON array of panels"
+        )
+    if len(items) > max_items:
+        raise _bulk_too_large(too_many_items)
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The request contains no panels"
+        )
+    return items
+
+
+@router.post(
+    ":bulk",
+    response_model=ElectronicPanelBulkCreateResultResource,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create electronic panels in bulk",
+    description=(
+        "Create many electronic panels from a JSON array or an NDJSON body. "
+        "Every item is validated at the domain level and errors are reported per item. "
+        "Valid items are inserted in a single transaction, in batches of `chunk_size` rows. "
+        "The response is `422` when nothing was inserted: in `atomic` mode when any item is invalid, "
+        "in `partial` mode when every item is."
+    ),
+    responses={
+        413: {"description": "The body exceeds the byte or item limit of a bulk request."},
+        422: {
+            "model": ElectronicPanelBulkCreateResultResource,
+            "description": "No item was inserted: some items are invalid in atomic mode, or all of them are."
+        }
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/ElectronicPanelCreateResource"}
+                    }
+                },
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"$ref": "#/components/schemas/ElectronicPanelCreateResource"}
+                }
+            }
+        }
+    }
+)
+async def create_panels_bulk(
+    request: Request,
+    mode: ElectronicPanelBulkMode = Query(ElectronicPanelBulkMode.PARTIAL, description="How invalid items are handled"),
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000, description="Rows per insert batch"),
+    service: ElectronicPanelService = Depends(get_electronic_panel_service)
+) -> ElectronicPanelBulkCreateResultResource:
+    settings = get_settings()
+    items = await _read_bulk_items(request, settings.bulk_max_items, settings.bulk_max_bytes)
+
+    valid = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            resource = ElectronicPanelCreateResource.model_validate(item)
+            valid.append((index, ElectronicPanelAssembler.to_entity(resource)))
+        except ValueError as e:
+            errors.append((index, _describe_error(e)))
+
+    if not valid or (errors and mode == ElectronicPanelBulkMode.ATOMIC):
+        result = ElectronicPanelAssembler.to_bulk_create_result([], errors)
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content=result.model_dump(mode="json")
+        )
+
+    await service.create_panels(
+        [entity for _, entity in valid],
+        chunk_size or settings.bulk_insert_chunk_size
+    )
+    return ElectronicPanelAssembler.to_bulk_create_result(valid, errors)
+
+
+@router.patch(
+    "",
+    response_model=ElectronicPanelBulkUpdateResultResource,
+    summary="Update electronic panels in bulk",
+    description=(
+        "Apply the same partial update to every panel matching the filter in a single `UPDATE` statement. "
+        "The patch is validated once at the domain level. "
+        "Returns the number of updated panels and, when `returning` is set, the updated panels."
+    )
+)
+async def update_panels_bulk(
+    resource: ElectronicPanelBulkUpdateResource,
+    service: ElectronicPanelService = Depends(get_electronic_panel_service)
+) -> ElectronicPanelBulkUpdateResultResource:
+    try:
+        filters = ElectronicPanelAssembler.to_filter(resource.filter)
+        if filters == PanelFilter():
+            raise ValueError("The filter must set at least one criterion")
+        changes = ElectronicPanelAssembler.to_changes(resource.patch)
+        updated_count, entities = await service.update_panels(filters, changes, resource.returning)
+        return ElectronicPanelAssembler.to_bulk_update_result(updated_count, entities, resource.returning)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_describe_error(e)
+        )
+
+
 @router.get(
     "",
     response_model=ElectronicPanelListResource,
-    summary="List all electronic panels",
-    description="Retrieve a list of all electronic panels in the system."
+    summary="List electronic panels",
+    description=(
+        "Retrieve a page of electronic panels ordered by ID, optionally filtered. "
+        "Pass the returned `next_cursor` as `cursor` to fetch the next page. "
+        "The total is only computed when `include_total` is set. "
+        "The `ETag` changes whenever any panel is written; send it back in `If-None-Match` to get `304 Not Modified`. "
+        "Responses are gzip-compressed for clients that send `Accept-Encoding: gzip`."
+    ),
+    responses={304: {"description": "No panel changed since the ETag was issued."}}
 )
 async def list_panels(
+    filters: PanelFilter = Depends(get_panel_filter),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of panels per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor returned by the previous page"),
+    include_total: bool = Query(False, description="Also count all panels matching the filters"),
+    if_none_match: Optional[str] = Header(None, description="ETag of a previous response"),
+    accept_encoding: Optional[str] = Header(None, include_in_schema=False),
+    service: ElectronicPanelService = Depends(get_electronic_panel_service),
+    response_cache: Optional["ResponseCache"] = Depends(get_response_cache)
+) -> Response:
+    # Read the generation before the page so the ETag can never be newer than the data.
+    generation, updated_at = await service.get_panels_generation()
+    headers = {"ETag": generation_etag(generation), "Last-Modified": http_date(updated_at)}
+    if if_none_match_hits(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**headers, "Vary": "Accept-Encoding"})
+
+    cache_key = ("list_panels", filters.key(), limit, cursor, include_total)
+    if response_cache is not None:
+        cached = response_cache.get(cache_key, generation)
+        if cached is not None:
+            return encoded_response(cached, accept_encoding, JSON_MEDIA_TYPE, headers)
+    try:
+        page = await service.list_panels(filters, limit, cursor, include_total)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    body = ElectronicPanelSerializer.panel_list_json(page.items, page.total, page.next_cursor)
+    if response_cache is None:
+        return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
+    # The page may be newer than `generation` but never older, so it is safe to serve for it.
+    entry = response_cache.put(cache_key, generation, body)
+    return encoded_response(entry, accept_encoding, JSON_MEDIA_TYPE, headers)
+
+
+async def _encode_export(
+    panels: AsyncIterator[PanelView],
+    export_format: ElectronicPanelExportFormat
+) -> AsyncIterator[Any]:
+    """
+    Encode streamed panels, flushing every EXPORT_FLUSH_ROWS rows so memory stays flat.
+    """
+    if export_format == ElectronicPanelExportFormat.CSV:
+        yield ElectronicPanelAssembler.to_csv_header()
+
+        def encode(rows: List[PanelView]) -> str:
+            return "".join(ElectronicPanelAssembler.to_csv_line(row) for row in rows)
+    else:
+        encode = ElectronicPanelSerializer.panel_ndjson_lines
+
+    chunk = []
+    async for panel in panels:
+        chunk.append(panel)
+        if len(chunk) >= EXPORT_FLUSH_ROWS:
+            yield encode(chunk)
+            chunk = []
+    if chunk:
+        yield encode(chunk)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export electronic panels",
+    description=(
+        "Stream every electronic panel matching the filters as NDJSON or CSV. "
+        "Rows are sent as they are read from the database, so memory use does not grow with the table."
+    ),
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+            "description": "Panels ordered by ID, one per line."
+        }
+    }
+)
+async def export_panels(
+    filters: PanelFilter = Depends(get_panel_filter),
+    format: ElectronicPanelExportFormat = Query(ElectronicPanelExportFormat.NDJSON, description="Output format"),
+    service: ElectronicPanelService = Depends(get_electronic_panel_service)
+) -> StreamingResponse:
+    return StreamingResponse(
+        _encode_export(service.export_panels(filters), format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="panels.{format.value}"'}
+    )
+
+
+@router.get(
+    "/search",
+    response_model=ElectronicPanelListResource,
+    summary="Search electronic panels",
+    description=(
+        "Full-text search over name, location and brand. Every word of `q` is matched as a prefix, "
+        "so `MDP basem` finds \"MDP Basement B\". Results are ranked by relevance (bm25, name weighted highest) "
+        "and can be restricted by the same filters as `GET /panels`."
+    )
+)
+async def search_panels(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for"),
+    filters: PanelFilter = Depends(get_panel_filter),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT, description="Maximum number of results"),
     service: ElectronicPanelService = Depends(get_electronic_panel_service)
-) -> ElectronicPanelListResource:
-    entities = await service.list_all_panels()
-    return ElectronicPanelAssembler.to_resource_list(entities)
+) -> Response:
+    try:
+        entities = await service.search_panels(q, filters, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return Response(content=ElectronicPanelSerializer.panel_list_json(entities), media_type=JSON_MEDIA_TYPE)
+
+
+@router.get(
+    "/stats",
+    response_model=ElectronicPanelStatsResource,
+    summary="Get fleet statistics",
+    description=(
+        "Count panels and aggregate their amperage capacity, optionally grouped by one or more dimensions "
+        "and restricted by the same filters as `GET /panels`. "
+        "Unfiltered global and per-state figures are read from an incrementally maintained summary table; "
+        "everything else is computed with `GROUP BY`. Group by `year_installed` for an age distribution."
+    )
+)
+async def get_panel_stats(
+    filters: PanelFilter = Depends(get_panel_filter),
+    group_by: List[PanelStatsDimension] = Query([], description="Dimensions to group by, in order"),
+    service: ElectronicPanelService = Depends(get_electronic_panel_service)
+) -> ElectronicPanelStatsResource:
+    groups = await service.get_panel_stats(filters, group_by)
+    return ElectronicPanelAssembler.to_stats_resource(groups)
+
+
+@router.get(
+    "/changes",
+    response_model=ElectronicPanelChangeListResource,
+    summary="Get panel changes for delta sync",
+    description=(
+        "Return the panels created, updated or deleted after `since`, in the order the changes were committed. "
+        "Start with `since=0`, which returns every panel; then pass the returned `next_since` as `since`, "
+        "immediately while `has_more` is true and later to pick up new changes. "
+        "Each panel appears at most once per page with its current state, and deletions appear as tombstones. "
+        "Send a stable `client_id` so tombstones are kept until the client has synced past them; "
+        "when they were pruned anyway the response is `410 Gone` and the client must resync from 0."
+    ),
+    responses={
+        410: {"description": "Changes after `since` were compacted; resynchronize from `since=0`."}
+    }
+)
+async def list_panel_changes(
+    since: int = Query(0, ge=0, description="Sequence number of the last change already applied"),
+    limit: int = Query(DEFAULT_CHANGES_LIMIT, ge=1, le=MAX_CHANGES_LIMIT, description="Maximum number of log entries to read"),
+    client_id: Optional[str] = Query(None, min_length=1, max_length=100, description="Stable identifier of the syncing client"),
+    service: ElectronicPanelService = Depends(get_electronic_panel_service)
+) -> Response:
+    try:
+        page = await service.list_changes(since, limit, client_id)
+    except PanelChangesCompactedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=str(e)
+        )
+    return Response(content=ElectronicPanelSerializer.panel_change_list_json(page), media_type=JSON_MEDIA_TYPE)
 
 
 @router.get(
     "/{panel_id}",
     response_model=ElectronicPanelResource,
     summary="Get an electronic panel by ID",
-    description="Retrieve a specific electronic panel by its unique identifier."
+    description=(
+        "Retrieve a specific electronic panel by its unique identifier. "
+        "Send the returned `ETag` in `If-None-Match` to get `304 Not Modified` while the panel is unchanged."
+    ),
+    responses={304: {"description": "The panel did not change since the ETag was issued."}}
 )
 async def get_panel(
     panel_id: UUID,
+    if_none_match: Optional[str] = Header(None, description="ETag of a previous response"),
     service: ElectronicPanelService = Depends(get_electronic_panel_service)
-) -> ElectronicPanelResource:
+) -> Response:
+    if if_none_match is not None:
+        current = await service.get_panel_version(panel_id)
+        if current is not None:
+            version, updated_at = current
+            if if_none_match_hits(if_none_match, panel_etag(version)):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": panel_etag(version), "Last-Modified": http_date(updated_at)}
+                )
     entity = await service.get_panel_by_id(panel_id)
     if entity is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Electronic panel with ID {panel_id} not found"
         )
-    return ElectronicPanelAssembler.to_resource(entity)
+    return Response(
+        content=ElectronicPanelSerializer.panel_json(entity),
+        media_type=JSON_MEDIA_TYPE,
+        headers={"ETag": panel_etag(entity.version), "Last-Modified": http_date(entity.updated_at)}
+    )
 
 
 @router.put(
     "/{panel_id}",
     response_model=ElectronicPanelResource,
     summary="Update an electronic panel",
-    description="Update an existing electronic panel. Only provided fields are updated (partial update supported)."
+    description=(
+        "Update an existing electronic panel. Only provided fields are updated (partial update supported); "
+        "a body without fields returns the panel unchanged. "
+        "Send the panel's `ETag` in `If-Match` to update only if nobody changed it in the meantime."
+    ),
+    responses={412: {"description": "The panel was modified since the ETag in If-Match was issued."}}
 )
 async def update_panel(
     panel_id: UUID,
     resource: ElectronicPanelUpdateResource,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag the update is based on"),
     service: ElectronicPanelService = Depends(get_electronic_panel_service)
 ) -> ElectronicPanelResource:
     try:
-        existing_entity = await service.get_panel_by_id(panel_id)
-        if existing_entity is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Electronic panel with ID {panel_id} not found"
-            )
-        updated_entity = ElectronicPanelAssembler.update_entity(existing_entity, resource)
-        updated_entity = await service.update_panel(panel_id, updated_entity)
-        return ElectronicPanelAssembler.to_resource(updated_entity)
+        expected_version = parse_if_match_version(if_match) if if_match is not None else None
     except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
             detail=str(e)
         )
+    changes = ElectronicPanelAssembler.to_changes(resource)
+    try:
+        updated_entity = await service.patch_panel(panel_id, changes, expected_version)
+    except PanelNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except PanelVersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_describe_error(e)
+        )
+    response.headers["ETag"] = panel_etag(updated_entity.version)
+    response.headers["Last-Modified"] = http_date(updated_entity.updated_at)
+    return ElectronicPanelAssembler.to_resource(updated_entity)
 
 
 @router.delete(
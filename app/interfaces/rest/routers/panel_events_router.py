@@ -0,0 +1,188 @@
+import asyncio
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.domain.model.value_objects.panel_state import PanelState
+from app.infrastructure.dependencies import get_event_broker
+from app.infrastructure.event_broker import PanelEventBroker, PublishedEvent, Subscription, TooManySubscribersError
+from app.infrastructure.settings import get_settings
+from app.interfaces.rest.transforms.electronic_panel_serializer import ElectronicPanelSerializer
+
+router = APIRouter(prefix="/panels", tags=["Panel Events"])
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+
+# WebSocket close codes (RFC 6455): invalid request, and overloaded.
+WS_POLICY_VIOLATION = 1008
+WS_TRY_AGAIN_LATER = 1013
+
+EVENTS_DESCRIPTION = (
+    "Each event carries `id` (a resume token), `type` (`created`, `updated` or `deleted`), `panel_id`, "
+    "`panel` (the panel as written, `null` for deletions), `previous` (the `location` and `state` "
+    "an updated panel had before, `null` for creations and deletions) and `occurred_at`. "
+    "`location` and `state` restrict creations to matching panels and updates to panels that match "
+    "before or after the change, so panels leaving the selection are reported too; "
+    "deletions are always sent. "
+    "The stream opens with a `ready` message carrying the token to resume from. "
+    "Reconnect with the last token received to replay recent events; when they are no longer buffered "
+    "the stream opens with `reset` instead, and the client should reload the panels it shows. "
+    "Subscribers that fall too far behind are disconnected and should reconnect with their last token."
+)
+
+
+def _subscribe(
+    broker: PanelEventBroker,
+    location: Optional[str],
+    state: Optional[PanelState],
+    resume_token: Optional[str]
+) -> Subscription:
+    try:
+        return broker.subscribe(location, state, resume_token)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except TooManySubscribersError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"}
+        )
+
+
+def _payload(broker: PanelEventBroker, published: PublishedEvent) -> bytes:
+    """
+    Encode an event once, however many subscribers it is sent to.
+    """
+    if published.payload is None:
+        published.payload = ElectronicPanelSerializer.panel_event_json(
+            published.event,
+            broker.resume_token(published.seq)
+        )
+    return published.payload
+
+
+def _opening(broker: PanelEventBroker, subscription: Subscription) -> bytes:
+    """
+    First message of a stream: the token to resume from, and whether the client must reload.
+    """
+    kind = "reset" if subscription.reset else "ready"
+    return f'{{"id":"{broker.resume_token(subscription.start_seq)}","type":"{kind}"}}'.encode("ascii")
+
+
+def _sse_frame(event: str, event_id: str, data: bytes) -> bytes:
+    return f"id: {event_id}\nevent: {event}\ndata: ".encode("ascii") + data + b"\n\n"
+
+
+def _sse_event(broker: PanelEventBroker, published: PublishedEvent) -> bytes:
+    return _sse_frame(published.event.type.value, broker.resume_token(published.seq), _payload(broker, published))
+
+
+async def _sse_stream(
+    broker: PanelEventBroker,
+    subscription: Subscription,
+    heartbeat_seconds: float
+) -> AsyncIterator[bytes]:
+    """
+    Write the subscription as Server-Sent Events, with a comment line as keep-alive while idle.
+    """
+    try:
+        kind = "reset" if subscription.reset else "ready"
+        yield _sse_frame(kind, broker.resume_token(subscription.start_seq), _opening(broker, subscription))
+        for published in subscription.replay:
+            yield _sse_event(broker, published)
+        while True:
+            try:
+                published = await asyncio.wait_for(subscription.next(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if published is None:
+                if subscription.evicted:
+                    yield b'event: evicted\ndata: {"type":"evicted"}\n\n'
+                return
+            yield _sse_event(broker, published)
+    finally:
+        subscription.close()
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    summary="Stream panel changes",
+    description=(
+        "Server-Sent Events stream of panel creations, updates and deletions as they are committed. "
+        + EVENTS_DESCRIPTION
+        + " Browsers' `EventSource` resumes automatically through `Last-Event-ID`."
+    ),
+    responses={
+        200: {"content": {EVENT_STREAM_MEDIA_TYPE: {}}, "description": "An endless event stream."},
+        503: {"description": "Too many subscribers; retry after `Retry-After` seconds."}
+    }
+)
+async def stream_panel_events(
+    location: Optional[str] = Query(None, description="Only panels at this exact location"),
+    state: Optional[PanelState] = Query(None, description="Only panels in this state"),
+    resume: Optional[str] = Query(None, description="Resume token of the last event received"),
+    last_event_id: Optional[str] = Header(None, description="Resume token, as sent by EventSource on reconnect"),
+    broker: PanelEventBroker = Depends(get_event_broker)
+) -> StreamingResponse:
+    subscription = _subscribe(broker, location, state, last_event_id or resume)
+    return StreamingResponse(
+        _sse_stream(broker, subscription, get_settings().events_heartbeat_seconds),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/events/ws")
+async def panel_events_socket(
+    websocket: WebSocket,
+    location: Optional[str] = Query(None),
+    state: Optional[PanelState] = Query(None),
+    resume: Optional[str] = Query(None),
+    broker: PanelEventBroker = Depends(get_event_broker)
+) -> None:
+    """
+    WebSocket equivalent of GET /panels/events: one JSON text message per event,
+    plus `ready`/`reset` on open and `evicted` before a slow subscriber is closed.
+    """
+    try:
+        subscription = broker.subscribe(location, state, resume)
+    except ValueError as e:
+        await websocket.close(code=WS_POLICY_VIOLATION, reason=str(e))
+        return
+    except TooManySubscribersError as e:
+        await websocket.close(code=WS_TRY_AGAIN_LATER, reason=str(e))
+        return
+
+    await websocket.accept()
+    receive = asyncio.ensure_future(websocket.receive())
+    try:
+        await websocket.send_text(_opening(broker, subscription).decode())
+        for published in subscription.replay:
+            await websocket.send_text(_payload(broker, published).decode())
+        while True:
+            next_event = asyncio.ensure_future(subscription.next())
+            done, _ = await asyncio.wait({next_event, receive}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event not in done:
+                next_event.cancel()
+                if receive.result()["type"] == "websocket.disconnect":
+                    return
+                # Messages from the client carry no meaning; keep listening for the disconnect.
+                receive = asyncio.ensure_future(websocket.receive())
+                continue
+            published = next_event.result()
+            if published is None:
+                if subscription.evicted:
+                    await websocket.send_text('{"type":"evicted"}')
+                await websocket.close()
+                return
+            await websocket.send_text(_payload(broker, published).decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receive.cancel()
+        subscription.close()
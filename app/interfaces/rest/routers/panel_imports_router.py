@@ -0,0 +1,146 @@
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse
+
+from app.domain.model.value_objects.panel_import import PanelImportFormat
+from app.infrastructure.dependencies import get_panel_importer
+from app.infrastructure.panel_importer import PanelImporter, PanelImportTooLargeError
+from app.infrastructure.tables import PanelImportJob
+from app.interfaces.rest.resources.panel_import_resource import PanelImportJobResource
+
+router = APIRouter(prefix="/panels", tags=["Panel Imports"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+IMPORT_MEDIA_TYPES = {
+    "text/csv": PanelImportFormat.CSV,
+    NDJSON_MEDIA_TYPE: PanelImportFormat.NDJSON,
+}
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite keeps no offset: timestamps read back are naive, but were written in UTC.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _to_resource(request: Request, job: PanelImportJob) -> PanelImportJobResource:
+    return PanelImportJobResource(
+        id=job.id,
+        format=job.format,
+        status=job.status,
+        bytes_total=job.bytes_total,
+        bytes_done=job.bytes_done,
+        progress=job.bytes_done / job.bytes_total if job.bytes_total else 1.0,
+        rows_read=job.rows_read,
+        rows_imported=job.rows_imported,
+        rows_rejected=job.rows_rejected,
+        rows_per_second=job.rows_read / job.running_seconds if job.running_seconds else None,
+        error_report_url=str(request.url_for("get_panel_import_errors", job_id=job.id).path),
+        detail=job.detail,
+        created_at=_utc(job.created_at),
+        started_at=_utc(job.started_at),
+        finished_at=_utc(job.finished_at)
+    )
+
+
+async def _get_job(importer: PanelImporter, job_id: str) -> PanelImportJob:
+    job = await importer.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job {job_id} not found"
+        )
+    return job
+
+
+@router.post(
+    "/imports",
+    response_model=PanelImportJobResource,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Import electronic panels from a file",
+    description=(
+        "Upload a CSV file (header row naming the panel fields) or an NDJSON file as the request body. "
+        "The file is stored and imported in the background; poll the returned job, "
+        "whose URL is also in the `Location` header, for progress. "
+        "Rows are validated like single creations; invalid rows are skipped and listed in the job's error report."
+    ),
+    responses={
+        413: {"description": "The file exceeds `REMS_IMPORTS_MAX_BYTES`."},
+        415: {"description": "The format could not be told from `format` or `Content-Type`."}
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}
+            }
+        }
+    }
+)
+async def create_panel_import(
+    request: Request,
+    response: Response,
+    format: Optional[PanelImportFormat] = Query(None, description="File format; defaults to the one named by Content-Type"),
+    importer: PanelImporter = Depends(get_panel_importer)
+) -> PanelImportJobResource:
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        format = IMPORT_MEDIA_TYPES.get(content_type)
+        if format is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Send text/csv or application/x-ndjson, or set the format parameter"
+            )
+    try:
+        job = await importer.submit(format, request.stream())
+    except PanelImportTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    response.headers["Location"] = str(request.url_for("get_panel_import", job_id=job.id).path)
+    return _to_resource(request, job)
+
+
+@router.get(
+    "/imports/{job_id}",
+    response_model=PanelImportJobResource,
+    summary="Get an import job",
+    description="Report the status, progress and throughput of a bulk import job."
+)
+async def get_panel_import(
+    job_id: str,
+    request: Request,
+    importer: PanelImporter = Depends(get_panel_importer)
+) -> PanelImportJobResource:
+    return _to_resource(request, await _get_job(importer, job_id))
+
+
+@router.get(
+    "/imports/{job_id}/errors",
+    response_class=FileResponse,
+    summary="Download the error report of an import job",
+    description=(
+        "NDJSON with one `{\"row\": n, \"detail\": \"...\"}` line per rejected row, "
+        "numbering data rows from 1. Grows while the job runs."
+    ),
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}}
+)
+async def get_panel_import_errors(
+    job_id: str,
+    importer: PanelImporter = Depends(get_panel_importer)
+) -> Response:
+    job = await _get_job(importer, job_id)
+    path = importer.error_report_path(job.id)
+    if not path.exists():
+        return Response(content=b"", media_type=NDJSON_MEDIA_TYPE)
+    return FileResponse(path, media_type=NDJSON_MEDIA_TYPE, filename=f"import-{job.id}-errors.ndjson")
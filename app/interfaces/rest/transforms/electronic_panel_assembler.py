@@ -1,13 +1,26 @@
-from typing import List
+import csv
+import io
+from typing import Any, Dict, List, Tuple, Union
 from uuid import UUID
 
 from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_page import PanelPage
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_stats import PanelStatsGroup
+from app.domain.model.value_objects.panel_view import PanelView
 from app.interfaces.rest.resources.electronic_panel_resource import (
     ElectronicPanelResource,
     ElectronicPanelCreateResource,
     ElectronicPanelUpdateResource,
     ElectronicPanelListResource,
-    ElectronicPanelDeleteResource
+    ElectronicPanelDeleteResource,
+    ElectronicPanelBulkCreatedItemResource,
+    ElectronicPanelBulkItemErrorResource,
+    ElectronicPanelBulkCreateResultResource,
+    ElectronicPanelBulkUpdateFilterResource,
+    ElectronicPanelBulkUpdateResultResource,
+    ElectronicPanelStatsGroupResource,
+    ElectronicPanelStatsResource
 )
 
 
@@ -16,8 +29,19 @@ class ElectronicPanelAssembler:
     Assembler class to convert between domain entities and REST resources.
     """
 
+    CSV_COLUMNS = [
+        "id",
+        "name",
+        "location",
+        "brand",
+        "amperage_capacity",
+        "state",
+        "year_manufactured",
+        "year_installed"
+    ]
+
     @staticmethod
-    def to_resource(entity: ElectronicPanel) -> ElectronicPanelResource:
+    def to_resource(entity: Union[ElectronicPanel, PanelView]) -> ElectronicPanelResource:
         """
         Convert an ElectronicPanel domain entity to a response resource.
         """
@@ -43,6 +67,44 @@ class ElectronicPanelAssembler:
             total=len(panels)
         )
 
+    @staticmethod
+    def to_resource_page(page: PanelPage) -> ElectronicPanelListResource:
+        """
+        Convert a page of ElectronicPanel entities to a list response resource.
+        """
+        return ElectronicPanelListResource(
+            panels=[ElectronicPanelAssembler.to_resource(entity) for entity in page.items],
+            total=page.total,
+            next_cursor=page.next_cursor
+        )
+
+    @staticmethod
+    def to_csv_header() -> str:
+        """
+        Build the CSV header line matching to_csv_line().
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(ElectronicPanelAssembler.CSV_COLUMNS)
+        return buffer.getvalue()
+
+    @staticmethod
+    def to_csv_line(entity: Union[ElectronicPanel, PanelView]) -> str:
+        """
+        Convert an ElectronicPanel entity to a single CSV line.
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow([
+            entity.id,
+            entity.name,
+            entity.location,
+            entity.brand if entity.brand is not None else "",
+            entity.amperage_capacity,
+            entity.state.value,
+            entity.year_manufactured,
+            entity.year_installed
+        ])
+        return buffer.getvalue()
+
     @staticmethod
     def to_entity(resource: ElectronicPanelCreateResource, panel_id: UUID = None) -> ElectronicPanel:
         """
@@ -107,4 +169,69 @@ class ElectronicPanelAssembler:
         return ElectronicPanelDeleteResource(
             message=f"Electronic panel with ID {panel_id} successfully deleted."
         )
-    
+
+    @staticmethod
+    def to_bulk_create_result(
+        created: List[Tuple[int, ElectronicPanel]],
+        errors: List[Tuple[int, str]]
+    ) -> ElectronicPanelBulkCreateResultResource:
+        """
+        Create a bulk create response resource from (index, entity) and (index, detail) pairs.
+        """
+        return ElectronicPanelBulkCreateResultResource(
+            created=[
+                ElectronicPanelBulkCreatedItemResource(index=index, id=entity.id)
+                for index, entity in created
+            ],
+            errors=[
+                ElectronicPanelBulkItemErrorResource(index=index, detail=detail)
+                for index, detail in errors
+            ],
+            created_count=len(created),
+            error_count=len(errors)
+        )
+
+    @staticmethod
+    def to_filter(resource: ElectronicPanelBulkUpdateFilterResource) -> PanelFilter:
+        """
+        Convert a bulk update filter resource to a domain filter.
+        """
+        return PanelFilter(**resource.model_dump(exclude_none=True))
+
+    @staticmethod
+    def to_changes(resource: ElectronicPanelUpdateResource) -> Dict[str, Any]:
+        """
+        Extract the fields set on an update resource.
+        """
+        return resource.model_dump(exclude_unset=True, exclude_none=True)
+
+    @staticmethod
+    def to_bulk_update_result(
+        updated_count: int,
+        entities: List[ElectronicPanel],
+        returning: bool
+    ) -> ElectronicPanelBulkUpdateResultResource:
+        """
+        Create a bulk update response resource.
+        """
+        return ElectronicPanelBulkUpdateResultResource(
+            updated_count=updated_count,
+            panels=[ElectronicPanelAssembler.to_resource(entity) for entity in entities] if returning else None
+        )
+
+    @staticmethod
+    def to_stats_resource(groups: List[PanelStatsGroup]) -> ElectronicPanelStatsResource:
+        """
+        Convert fleet statistics groups to a stats response resource.
+        """
+        return ElectronicPanelStatsResource(
+            groups=[
+                ElectronicPanelStatsGroupResource(
+                    dimensions=group.dimensions,
+                    panel_count=group.panel_count,
+                    amperage_total=group.amperage_total,
+                    amperage_average=group.amperage_average
+                )
+                for group in groups
+            ]
+        )
@@ -0,0 +1,155 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Union
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_change import PanelChangePage, PanelChangeType
+from app.domain.model.value_objects.panel_event import PanelEvent, PanelEventType
+from app.domain.model.value_objects.panel_state import PanelState
+from app.domain.model.value_objects.panel_view import PanelView
+
+PanelLike = Union[ElectronicPanel, PanelView]
+
+
+class _PanelDocument(TypedDict):
+    id: UUID
+    name: str
+    location: str
+    brand: Optional[str]
+    amperage_capacity: float
+    state: PanelState
+    year_manufactured: int
+    year_installed: int
+
+
+class _PanelListDocument(TypedDict):
+    panels: List[_PanelDocument]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+
+class _PanelPlacementDocument(TypedDict):
+    location: str
+    state: PanelState
+
+
+class _PanelEventDocument(TypedDict):
+    id: str
+    type: PanelEventType
+    panel_id: UUID
+    panel: Optional[_PanelDocument]
+    previous: Optional[_PanelPlacementDocument]
+    occurred_at: datetime
+
+
+class _PanelChangeDocument(TypedDict):
+    seq: int
+    type: PanelChangeType
+    panel_id: UUID
+    panel: Optional[_PanelDocument]
+    changed_at: datetime
+
+
+class _PanelChangeListDocument(TypedDict):
+    changes: List[_PanelChangeDocument]
+    next_since: int
+    has_more: bool
+
+
+class ElectronicPanelSerializer:
+    """
+    Read-path serializer that turns panels straight into JSON bytes.
+
+    Produces the same documents as ElectronicPanelResource and
+    ElectronicPanelListResource, but serializes plain dicts through
+    precompiled TypedDict schemas instead of building validated resource
+    models that FastAPI then validates and serializes a second time.
+    Routes keep their response_model so the OpenAPI schema is unchanged.
+    """
+
+    _panel_adapter = TypeAdapter(_PanelDocument)
+    _panel_list_adapter = TypeAdapter(_PanelListDocument)
+    _panel_event_adapter = TypeAdapter(_PanelEventDocument)
+    _panel_change_list_adapter = TypeAdapter(_PanelChangeListDocument)
+
+    @staticmethod
+    def _to_document(panel: PanelLike) -> _PanelDocument:
+        return {
+            "id": panel.id,
+            "name": panel.name,
+            "location": panel.location,
+            "brand": panel.brand,
+            "amperage_capacity": panel.amperage_capacity,
+            "state": panel.state,
+            "year_manufactured": panel.year_manufactured,
+            "year_installed": panel.year_installed
+        }
+
+    @classmethod
+    def panel_json(cls, panel: PanelLike) -> bytes:
+        """
+        Serialize one panel like ElectronicPanelResource.
+        """
+        return cls._panel_adapter.dump_json(cls._to_document(panel))
+
+    @classmethod
+    def panel_list_json(
+        cls,
+        panels: Iterable[PanelLike],
+        total: Optional[int] = None,
+        next_cursor: Optional[str] = None
+    ) -> bytes:
+        """
+        Serialize panels like ElectronicPanelListResource.
+        """
+        return cls._panel_list_adapter.dump_json({
+            "panels": [cls._to_document(panel) for panel in panels],
+            "total": total,
+            "next_cursor": next_cursor
+        })
+
+    @classmethod
+    def panel_ndjson_lines(cls, panels: Iterable[PanelLike]) -> bytes:
+        """
+        Serialize panels as NDJSON, one ElectronicPanelResource document per line.
+        """
+        dump_json = cls._panel_adapter.dump_json
+        return b"".join(dump_json(cls._to_document(panel)) + b"\n" for panel in panels)
+
+    @classmethod
+    def panel_event_json(cls, event: PanelEvent, resume_token: str) -> bytes:
+        """
+        Serialize a panel change event; `panel` is null for deletions, `previous` for anything but updates.
+        """
+        previous = event.previous
+        return cls._panel_event_adapter.dump_json({
+            "id": resume_token,
+            "type": event.type,
+            "panel_id": event.panel_id,
+            "panel": cls._to_document(event.panel) if event.panel is not None else None,
+            "previous": {"location": previous.location, "state": previous.state} if previous is not None else None,
+            "occurred_at": event.occurred_at
+        })
+
+    @classmethod
+    def panel_change_list_json(cls, page: PanelChangePage) -> bytes:
+        """
+        Serialize a page of the change log like ElectronicPanelChangeListResource.
+        """
+        return cls._panel_change_list_adapter.dump_json({
+            "changes": [
+                {
+                    "seq": change.seq,
+                    "type": change.type,
+                    "panel_id": change.panel_id,
+                    "panel": cls._to_document(change.panel) if change.panel is not None else None,
+                    "changed_at": change.changed_at
+                }
+                for change in page.changes
+            ],
+            "next_since": page.next_since,
+            "has_more": page.has_more
+        })
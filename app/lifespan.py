@@ -1,12 +1,21 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.infrastructure.db import init_db
+from app.infrastructure.container import Container
+from app.infrastructure.settings import get_settings
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Application lifespan context manager.
-    Initializes the database before the application starts.
+    Builds the application container, runs its startup hooks (database
+    initialization, write batcher) and keeps it on app.state; runs its
+    shutdown hooks (drain pending writes, close pooled connections) when
+    the application stops.
     """
-    await init_db()
-    yield
\ No newline at end of file
+    container = Container(get_settings())
+    await container.startup()
+    app.state.container = container
+    try:
+        yield
+    finally:
+        await container.shutdown()
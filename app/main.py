@@ -1,8 +1,17 @@
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.lifespan import lifespan
+from app.infrastructure.db import ping_database
+from app.infrastructure.metrics import CONTENT_TYPE, REGISTRY
+from app.infrastructure.settings import get_settings
 from app.interfaces.rest.routers.electronic_panel_router import router as panels_router
 
+settings = get_settings()
+
 app = FastAPI(
     title="REMS Electric Panels API",
     version="1.0.0",
@@ -10,11 +19,65 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Optional routers and middleware are imported only when enabled, keeping their
+# dependencies (multiprocessing, cProfile, ...) out of the cold start otherwise.
+# Before the panels router, whose /panels/{panel_id} would otherwise capture /panels/events.
+if settings.events_enabled:
+    from app.interfaces.rest.routers.panel_events_router import router as panel_events_router
+    app.include_router(panel_events_router)
+if settings.imports_enabled:
+    from app.interfaces.rest.routers.panel_imports_router import router as panel_imports_router
+    app.include_router(panel_imports_router)
 app.include_router(panels_router)
+# The admin endpoints answer 404 without a token anyway.
+if settings.admin_token is not None:
+    from app.interfaces.rest.routers.admin_router import router as admin_router
+    app.include_router(admin_router)
+
+# The last middleware added runs first: metrics wrap admission control, which wraps accounting, which wraps profiling.
+# Sampling requires the token too (see Settings), so profiles are only taken when they can be downloaded.
+if settings.admin_token is not None:
+    from app.interfaces.rest.profiling_middleware import ProfilingMiddleware
+    app.add_middleware(
+        ProfilingMiddleware,
+        admin_token=settings.admin_token,
+        sample_rate=settings.profiling_sample_rate
+    )
+if settings.request_accounting_enabled:
+    from app.interfaces.rest.request_accounting_middleware import RequestAccountingMiddleware
+    app.add_middleware(RequestAccountingMiddleware)
+if settings.admission_control_enabled:
+    from app.interfaces.rest.admission_middleware import AdmissionControlMiddleware
+    app.add_middleware(AdmissionControlMiddleware)
+if settings.metrics_enabled:
+    from app.interfaces.rest.metrics_middleware import MetricsMiddleware
+    app.add_middleware(MetricsMiddleware)
 
-@app.get("/health", tags=["Health"])
-async def health():
+@app.get(
+    "/health",
+    tags=["Health"],
+    responses={503: {"description": "The database did not answer."}}
+)
+async def health(request: Request):
     """
-    Health check endpoint.
+    Readiness check: succeeds only when the database answers a trivial query.
     """
-    return {"status": "ok"}
\ No newline at end of file
+    try:
+        await asyncio.wait_for(
+            ping_database(request.app.state.container.database_engines),
+            settings.health_check_timeout_seconds
+        )
+    except (SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "database": type(e).__name__}
+        )
+    return {"status": "ok", "database": "ok"}
+
+if settings.metrics_enabled:
+    @app.get("/metrics", tags=["Health"], response_class=Response)
+    async def metrics():
+        """
+        Metrics in the Prometheus text exposition format.
+        """
+        return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
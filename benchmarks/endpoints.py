@@ -0,0 +1,327 @@
+"""
+Load and latency benchmark for every /panels endpoint.
+
+Seeds a SQLite database with synthetic panels through the repository, then
+drives each route of electronic_panel_router at a fixed concurrency, either
+in-process through an ASGI transport or against a running server, and
+reports throughput and p50/p95/p99 latency per endpoint as JSON.
+
+With a baseline file the results are compared against it and the run fails
+(exit code 1) when an endpoint is slower than the baseline by more than the
+threshold. Save a baseline on the machine that will run the comparison.
+
+Run with:
+    python -m benchmarks.endpoints --panels 10000 --concurrency 16
+    python -m benchmarks.endpoints --save-baseline benchmarks/baseline.json
+    python -m benchmarks.endpoints --baseline benchmarks/baseline.json --threshold 0.25
+
+Against a local server, seed the database it uses and point the suite at it:
+    REMS_DATABASE_URL=sqlite+aiosqlite:///./bench.db python -m benchmarks.endpoints \\
+        --seed-only --panels 100000
+    REMS_DATABASE_URL=sqlite+aiosqlite:///./bench.db uvicorn app.main:app &
+    python -m benchmarks.endpoints --url http://127.0.0.1:8000
+
+With --url nothing is seeded: the suite measures the panels the server already has.
+
+httpx is required to drive the requests (pip install httpx).
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import sys
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.support import seed_panels, use_temporary_database
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Latency percentiles and throughput compared against the baseline.
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One endpoint call; `build` turns the request number into keyword arguments for
+    httpx and `record`, when given, sees every successful response.
+    """
+    name: str
+    method: str
+    build: Callable[[int], Dict[str, Any]]
+    expected_status: int = 200
+    record: Optional[Callable[[Any], None]] = None
+
+
+class Fixture:
+    """
+    Ids the scenarios work on: seeded panels for reads and updates,
+    panels created by the create scenarios for deletes.
+    """
+
+    def __init__(self, panel_ids: List[str]) -> None:
+        self.panel_ids = panel_ids
+        self.created_ids: List[str] = []
+
+    def panel_id(self, n: int) -> str:
+        return self.panel_ids[n % len(self.panel_ids)]
+
+    def record_created(self, response: Any) -> None:
+        self.created_ids.append(response.json()["id"])
+
+
+def _new_panel(n: int) -> Dict[str, Any]:
+    return {
+        "name": f"Bench panel {n}",
+        "location": f"Building {n % 7} - Floor {n % 5}",
+        "brand": "Schneider",
+        "amperage_capacity": 200,
+        "year_manufactured": 2015,
+        "year_installed": 2018
+    }
+
+
+def create_scenario(fixture: Fixture) -> Scenario:
+    return Scenario("create", "POST", lambda n: {"url": "/panels", "json": _new_panel(n)}, 201, fixture.record_created)
+
+
+def build_scenarios(fixture: Fixture, bulk_size: int) -> List[Scenario]:
+    """
+    One scenario per route of electronic_panel_router, in an order where
+    creates come before the deletes that consume their ids.
+    """
+    return [
+        create_scenario(fixture),
+        Scenario("bulk_create", "POST", lambda n: {
+            "url": "/panels:bulk",
+            "json": [_new_panel(n * bulk_size + i) for i in range(bulk_size)]
+        }, 201),
+        Scenario("list", "GET", lambda n: {"url": "/panels", "params": {"limit": 100}}),
+        Scenario("list_filtered", "GET", lambda n: {
+            "url": "/panels",
+            "params": {"location": f"Building {n % 7} - Floor {n % 5}", "limit": 100, "include_total": True}
+        }),
+        Scenario("export", "GET", lambda n: {
+            "url": "/panels/export",
+            "params": {"location": f"Building {n % 7} - Floor {n % 5}", "state": "maintenance"}
+        }),
+        Scenario("search", "GET", lambda n: {"url": "/panels/search", "params": {"q": f"Panel {n % 1000}"}}),
+        Scenario("stats", "GET", lambda n: {"url": "/panels/stats"}),
+        Scenario("stats_grouped", "GET", lambda n: {
+            "url": "/panels/stats",
+            "params": {"group_by": ["location", "state"]}
+        }),
+        Scenario("changes", "GET", lambda n: {
+            "url": "/panels/changes",
+            # Devices catching up from spread-out points of the change log.
+            "params": {"since": n * 97 % len(fixture.panel_ids), "limit": 1000, "client_id": f"bench-{n % 16}"}
+        }),
+        Scenario("get", "GET", lambda n: {"url": f"/panels/{fixture.panel_id(n)}"}),
+        Scenario("update", "PUT", lambda n: {
+            "url": f"/panels/{fixture.panel_id(n)}",
+            "json": {"amperage_capacity": 100 + n % 300}
+        }),
+        Scenario("bulk_update", "PATCH", lambda n: {
+            "url": "/panels",
+            "json": {
+                "filter": {"ids": [fixture.panel_id(n * 10 + i) for i in range(10)]},
+                "patch": {"brand": "Siemens" if n % 2 else "ABB"}
+            }
+        }),
+        Scenario("delete", "DELETE", lambda n: {"url": f"/panels/{fixture.created_ids.pop()}"}),
+    ]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """
+    Throughput and latency percentiles (milliseconds) of one scenario.
+    """
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3)
+    }
+
+
+async def run_scenario(
+    client: "httpx.AsyncClient",
+    scenario: Scenario,
+    requests: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """
+    Send `requests` calls of a scenario from `concurrency` concurrent workers.
+    """
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for n in counter:
+            if n >= requests:
+                return
+            kwargs = scenario.build(n)
+            start = time.perf_counter()
+            response = await client.request(scenario.method, **kwargs)
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != scenario.expected_status:
+                errors += 1
+            elif scenario.record is not None:
+                scenario.record(response)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def collect_ids(client: "httpx.AsyncClient", limit: int) -> List[str]:
+    """
+    Read up to `limit` panel ids through the API, following the pagination cursor.
+    """
+    ids: List[str] = []
+    cursor = None
+    while len(ids) < limit:
+        params = {"limit": min(1000, limit - len(ids))}
+        if cursor is not None:
+            params["cursor"] = cursor
+        page = (await client.get("/panels", params=params)).json()
+        ids.extend(panel["id"] for panel in page["panels"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    return ids
+
+
+def should_seed(args: argparse.Namespace) -> bool:
+    """
+    Seed only a database the suite is about to measure: the temporary one of an in-process
+    run, or REMS_DATABASE_URL when asked to with --seed-only. A server at --url has its own.
+    """
+    if args.seed_only:
+        return True
+    return args.url is None and not args.no_seed
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    if should_seed(args):
+        await seed_panels(args.panels)
+    if args.seed_only:
+        return {}
+
+    async with AsyncExitStack() as stack:
+        if args.url is None:
+            from app.main import app
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://benchmark"
+        else:
+            transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency))
+            base_url = args.url
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout)
+        )
+
+        fixture = Fixture(await collect_ids(client, args.id_pool))
+        if not fixture.panel_ids:
+            raise SystemExit("No panels found; seed the database first")
+
+        results = {}
+        for scenario in build_scenarios(fixture, args.bulk_size):
+            if args.only and scenario.name not in args.only:
+                continue
+            missing = args.requests - len(fixture.created_ids)
+            if scenario.name == "delete" and missing > 0:
+                # Deletes consume panels created by the suite; make sure there are enough.
+                await run_scenario(client, create_scenario(fixture), missing, args.concurrency)
+            results[scenario.name] = await run_scenario(client, scenario, args.requests, args.concurrency)
+        return {
+            "panels": args.panels if should_seed(args) else None,
+            "concurrency": args.concurrency,
+            "requests_per_endpoint": args.requests,
+            "target": args.url or "in-process",
+            "endpoints": results
+        }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    List every endpoint metric that regressed by more than `threshold` against the baseline.
+    """
+    regressions = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(f"{name}.{metric}: {current[metric]} > {previous[metric]} (+{threshold:.0%})")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}.throughput_rps: {current['throughput_rps']} < {previous['throughput_rps']} (-{threshold:.0%})"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}.errors: {current['errors']} > {previous['errors']}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--panels", type=int, default=10_000, help="Number of panels to seed (1k to 1M)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per endpoint")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--bulk-size", type=int, default=50, help="Panels per bulk create request")
+    parser.add_argument("--id-pool", type=int, default=5000, help="Seeded panel ids to spread reads and updates over")
+    parser.add_argument("--only", nargs="*", help="Run only these scenarios")
+    parser.add_argument("--url", help="Base URL of a running server instead of the in-process app; implies --no-seed")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--no-seed", action="store_true", help="Use the panels already in REMS_DATABASE_URL")
+    parser.add_argument("--seed-only", action="store_true", help="Seed REMS_DATABASE_URL and exit")
+    parser.add_argument("--output", help="Also write the results to this file")
+    parser.add_argument("--baseline", help="Compare against this results file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression")
+    parser.add_argument("--save-baseline", help="Write the results as the new baseline to this file")
+    args = parser.parse_args()
+
+    if httpx is None and not args.seed_only:
+        raise SystemExit("httpx is required to run the endpoint benchmarks (pip install httpx)")
+    if args.url is None and should_seed(args) and not args.seed_only:
+        use_temporary_database()
+
+    results = asyncio.run(run(args))
+    if args.seed_only:
+        return
+
+    report = json.dumps(results, indent=2)
+    print(report)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as file:
+            file.write(report + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        for setting in ("panels", "concurrency", "requests_per_endpoint", "target"):
+            if baseline.get(setting) != results[setting]:
+                print(f"WARNING baseline {setting} is {baseline.get(setting)}, this run used {results[setting]}", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark for read-path hydration: ElectronicPanel entities vs PanelView rows.
+
+Seeds a temporary SQLite database, then loads the same pages once as ORM
+entities (select(ElectronicPanel)) and once as PanelView tuples through the
+repository, reporting the time and the memory held per row.
+
+Run with:
+    python -m benchmarks.hydration [--panels 10000]
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List
+
+from benchmarks.support import seed_panels, use_temporary_database
+
+SIZES = (100, 1_000, 10_000)
+
+
+async def measure(load: Callable[[int], Awaitable[List[Any]]], size: int, rounds: int) -> Dict[str, float]:
+    """
+    Return the best load time over `rounds` and the bytes allocated per row by one load.
+    """
+    await load(size)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await load(size)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    rows = await load(size)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(rows) == size
+    return {"ms": round(best * 1000, 2), "bytes_per_row": round(held / size)}
+
+
+async def run(panels: int, rounds: int) -> List[Dict[str, Any]]:
+    await seed_panels(panels)
+
+    from sqlmodel import select
+    from app.domain.model.entities.electronic_panel import ElectronicPanel
+    from app.domain.model.value_objects.panel_filter import PanelFilter
+    from app.infrastructure.db import async_read_session_factory, dispose_engines
+    from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import ElectronicPanelSQLModelRepository
+
+    repository = ElectronicPanelSQLModelRepository(async_read_session_factory)
+
+    async def load_entities(size: int) -> List[ElectronicPanel]:
+        statement = select(ElectronicPanel).order_by(ElectronicPanel.id).limit(size)
+        async with async_read_session_factory() as session:
+            results = await session.execute(statement)
+            return list(results.scalars().all())
+
+    async def load_views(size: int) -> List[Any]:
+        return await repository.list_page(PanelFilter(), size)
+
+    results = []
+    try:
+        for size in SIZES:
+            if size > panels:
+                break
+            entities = await measure(load_entities, size, rounds)
+            views = await measure(load_views, size, rounds)
+            results.append({
+                "rows": size,
+                "entity_ms": entities["ms"],
+                "view_ms": views["ms"],
+                "speedup": round(entities["ms"] / views["ms"], 2),
+                "entity_bytes_per_row": entities["bytes_per_row"],
+                "view_bytes_per_row": views["bytes_per_row"]
+            })
+    finally:
+        await dispose_engines()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--panels", type=int, default=max(SIZES), help="Number of panels to seed")
+    parser.add_argument("--rounds", type=int, default=10, help="Timed loads per case")
+    args = parser.parse_args()
+
+    use_temporary_database()
+    print(json.dumps(asyncio.run(run(args.panels, args.rounds)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
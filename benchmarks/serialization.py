@@ -0,0 +1,106 @@
+"""
+Microbenchmark for the panel read-path serializer.
+
+Compares the assembler path (build validated resource models, then let FastAPI
+validate and serialize them again against response_model) with
+ElectronicPanelSerializer (plain dicts dumped through precompiled TypedDict
+schemas) for single panels and for lists of 100 and 10,000 panels.
+
+Run with:
+    python -m benchmarks.serialization
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.utils import create_model_field
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_page import PanelPage
+from app.interfaces.rest.resources.electronic_panel_resource import (
+    ElectronicPanelResource,
+    ElectronicPanelListResource
+)
+from app.interfaces.rest.transforms.electronic_panel_assembler import ElectronicPanelAssembler
+from app.interfaces.rest.transforms.electronic_panel_serializer import ElectronicPanelSerializer
+from benchmarks.support import make_panels
+
+SIZES = (1, 100, 10_000)
+
+_panel_field = create_model_field(name="Response", type_=ElectronicPanelResource, mode="serialization")
+_panel_list_field = create_model_field(name="Response", type_=ElectronicPanelListResource, mode="serialization")
+
+
+def _serialize_response(field: Any, content: Any) -> Any:
+    # What fastapi.routing.serialize_response does for a response_model under pydantic v2.
+    value, errors = field.validate(content, {}, loc=("response",))
+    assert not errors
+    return field.serialize(value, by_alias=True)
+
+
+def _render(content: Any) -> bytes:
+    # Same encoding as fastapi.responses.JSONResponse.render.
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def assembler_panel(panels: List[ElectronicPanel]) -> bytes:
+    resource = ElectronicPanelAssembler.to_resource(panels[0])
+    return _render(_serialize_response(_panel_field, resource))
+
+
+def assembler_list(panels: List[ElectronicPanel]) -> bytes:
+    resource = ElectronicPanelAssembler.to_resource_page(PanelPage(items=panels))
+    return _render(_serialize_response(_panel_list_field, resource))
+
+
+def serializer_panel(panels: List[ElectronicPanel]) -> bytes:
+    return ElectronicPanelSerializer.panel_json(panels[0])
+
+
+def serializer_list(panels: List[ElectronicPanel]) -> bytes:
+    return ElectronicPanelSerializer.panel_list_json(panels)
+
+
+def measure(func: Callable[[List[ElectronicPanel]], bytes], panels: List[ElectronicPanel], min_seconds: float) -> float:
+    """
+    Return the best per-call time in microseconds over repeated timing rounds.
+    """
+    func(panels)
+    best = float("inf")
+    deadline = time.perf_counter() + min_seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        func(panels)
+        best = min(best, time.perf_counter() - start)
+    return best * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="Timing budget per case")
+    args = parser.parse_args()
+
+    results = []
+    for size in SIZES:
+        panels = make_panels(size)
+        if size == 1:
+            baseline, fast = assembler_panel, serializer_panel
+        else:
+            baseline, fast = assembler_list, serializer_list
+        assert jsonable_encoder(json.loads(baseline(panels))) == json.loads(fast(panels))
+        baseline_us = measure(baseline, panels, args.seconds)
+        fast_us = measure(fast, panels, args.seconds)
+        results.append({
+            "panels": size,
+            "assembler_us": round(baseline_us, 1),
+            "serializer_us": round(fast_us, 1),
+            "speedup": round(baseline_us / fast_us, 2)
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark for write scaling of the sharded repository.
+
+Creates panels, one create per call, from several worker processes at once,
+as uvicorn workers would, through ShardedElectronicPanelRepository with 1,
+2, 4 and 8 shard databases in a temporary directory. Reports the creates
+per second for each shard count and the speed-up over a single shard.
+
+Within one process the Python work of a create dominates, so the shards
+only pay off once several processes contend for the SQLite writer locks:
+run it with at least as many processes as there are cores.
+
+Run with:
+    python -m benchmarks.sharding [--writes 4000] [--processes 4] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.support import make_panels, use_temporary_database
+
+SHARD_COUNTS = (1, 2, 4, 8)
+
+
+def _shard_urls(directory: str, shard_count: int) -> List[str]:
+    return [f"sqlite+aiosqlite:///{os.path.join(directory, f'shard{index}.db')}" for index in range(shard_count)]
+
+
+async def _create_shards(urls: List[str]) -> None:
+    from app.infrastructure import db
+
+    for url in urls:
+        engine = db.create_engine(db.get_settings().model_copy(update={"database_url": url}))
+        await db.init_engine(engine)
+        await engine.dispose()
+
+
+async def _write(urls: List[str], writes: int, concurrency: int) -> Tuple[float, float]:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.infrastructure import db
+    from app.infrastructure.repositories.electronic_panel_sharded_repository import ShardedElectronicPanelRepository
+    from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import ElectronicPanelSQLModelRepository
+
+    engines = [db.create_engine(db.get_settings().model_copy(update={"database_url": url})) for url in urls]
+    repository = ShardedElectronicPanelRepository(
+        [ElectronicPanelSQLModelRepository(async_sessionmaker(bind=engine, expire_on_commit=False)) for engine in engines],
+        db.get_async_session_factory()
+    )
+    panels = iter(make_panels(writes))
+
+    async def worker() -> None:
+        for panel in panels:
+            await repository.create(panel)
+
+    try:
+        started = time.time()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return started, time.time()
+    finally:
+        await asyncio.gather(*(engine.dispose() for engine in engines))
+        await db.dispose_engines()
+
+
+def _worker_process(urls: List[str], writes: int, concurrency: int) -> Tuple[float, float]:
+    return asyncio.run(_write(urls, writes, concurrency))
+
+
+def measure(shard_count: int, writes: int, processes: int, concurrency: int) -> float:
+    """
+    Return the creates per second with `shard_count` shards, over all processes.
+    """
+    urls = _shard_urls(tempfile.mkdtemp(prefix=f"rems-shards{shard_count}-"), shard_count)
+    asyncio.run(_create_shards(urls))
+    per_process = writes // processes
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        spans = pool.starmap(_worker_process, [(urls, per_process, concurrency)] * processes)
+    elapsed = max(finished for _, finished in spans) - min(started for started, _ in spans)
+    return per_process * processes / elapsed
+
+
+def run(writes: int, processes: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for shard_count in SHARD_COUNTS:
+        per_second = measure(shard_count, writes, processes, concurrency)
+        results[f"{shard_count}_shards"] = {
+            "creates_per_second": round(per_second, 1),
+            "speedup": round(per_second / results["1_shards"]["creates_per_second"], 2) if results else 1.0
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sharded repository write scaling benchmark")
+    parser.add_argument("--writes", type=int, default=4000, help="Panels created per shard count, over all processes")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Worker processes writing at once")
+    parser.add_argument("--concurrency", type=int, default=8, help="Creates in flight per process")
+    arguments = parser.parse_args()
+    # Inherited by the spawned workers, whose main database then exists but stays unused.
+    use_temporary_database()
+    results = run(arguments.writes, arguments.processes, arguments.concurrency)
+    print(json.dumps({"processes": arguments.processes, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
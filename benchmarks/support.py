@@ -0,0 +1,57 @@
+"""
+Shared helpers for the benchmarks: synthetic panels and a throwaway database.
+"""
+import os
+import tempfile
+from typing import List
+from uuid import uuid4
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_state import PanelState
+
+SEED_CHUNK_SIZE = 5000
+
+
+def make_panels(count: int) -> List[ElectronicPanel]:
+    """
+    Build `count` valid panels with a spread of locations, brands, states and years.
+    """
+    states = list(PanelState)
+    return [
+        ElectronicPanel(
+            id=uuid4(),
+            name=f"Panel {i}",
+            location=f"Building {i % 7} - Floor {i % 5}",
+            brand="Schneider" if i % 2 else None,
+            amperage_capacity=100.0 + i % 300,
+            state=states[i % len(states)],
+            year_manufactured=1990 + i % 30,
+            year_installed=2020
+        )
+        for i in range(count)
+    ]
+
+
+def use_temporary_database() -> str:
+    """
+    Point the application at a fresh SQLite file in a temporary directory.
+
+    Must run before app.infrastructure.db is first imported, since the engines
+    are created from the settings at import time. Returns the database path.
+    """
+    path = os.path.join(tempfile.mkdtemp(prefix="rems-bench-"), "panels.db")
+    os.environ["REMS_DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    return path
+
+
+async def seed_panels(count: int) -> None:
+    """
+    Create the schema and insert `count` synthetic panels through the repository.
+    """
+    from app.infrastructure.db import init_db, async_session_factory
+    from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import ElectronicPanelSQLModelRepository
+
+    await init_db()
+    repository = ElectronicPanelSQLModelRepository(async_session_factory)
+    for start in range(0, count, SEED_CHUNK_SIZE):
+        await repository.create_many(make_panels(min(SEED_CHUNK_SIZE, count - start)), SEED_CHUNK_SIZE)
@@ -0,0 +1,37 @@
+import asyncio
+import os
+import tempfile
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+# Settings are read once, when app.infrastructure.db is first imported, so the
+# test database has to be configured before any test module imports the app.
+_database_dir = tempfile.mkdtemp(prefix="rems-tests-")
+os.environ.setdefault("REMS_DATABASE_URL", f"sqlite+aiosqlite:///{_database_dir}/panels.db")
+os.environ.setdefault("REMS_METRICS_ENABLED", "false")
+os.environ.setdefault("REMS_SLOW_QUERY_THRESHOLD_MS", "0")
+
+
+@pytest.fixture
+def run_api() -> Callable[[Callable[[Any, Any], Awaitable[None]]], None]:
+    """
+    Run `test(client, container)` against the application, inside its lifespan, on a fresh event loop.
+
+    Every test shares the configured database: tests only assert on the panels they create.
+    """
+    import httpx
+
+    from app.lifespan import lifespan
+    from app.main import app
+
+    def run(test: Callable[[Any, Any], Awaitable[None]]) -> None:
+        async def main() -> None:
+            async with lifespan(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    await test(client, app.state.container)
+
+        asyncio.run(main())
+
+    return run
@@ -0,0 +1,124 @@
+import asyncio
+from typing import Tuple
+
+import httpx
+from fastapi import FastAPI
+
+from app.infrastructure.admission import AdmissionController, AdmissionLimiter
+from app.interfaces.rest.admission_middleware import AdmissionControlMiddleware
+
+
+def _app() -> Tuple[FastAPI, AdmissionController, asyncio.Event]:
+    """
+    An app with slow /panels routes behind a controller of one slot per class and no queue.
+    """
+    controller = AdmissionController(
+        read=AdmissionLimiter("read", max_concurrency=1, max_queue=0, max_wait_seconds=5.0),
+        write=AdmissionLimiter("write", max_concurrency=1, max_queue=0, max_wait_seconds=5.0)
+    )
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/panels/slow")
+    async def slow_read():
+        await release.wait()
+        return {"done": True}
+
+    @app.post("/panels/slow")
+    async def slow_write():
+        await release.wait()
+        return {"done": True}
+
+    @app.get("/panels/events")
+    async def events():
+        await release.wait()
+        return {"done": True}
+
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+    return app, controller, release
+
+
+def run(test) -> None:
+    async def main() -> None:
+        app, controller, release = _app()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            try:
+                await test(client, controller, release)
+            finally:
+                release.set()
+
+    asyncio.run(main())
+
+
+async def _until_admitted(limiter: AdmissionLimiter) -> None:
+    for _ in range(100):
+        if limiter.in_flight:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("The request was never admitted")
+
+
+def test_request_beyond_the_queue_is_shed_with_retry_after() -> None:
+    async def test(client: httpx.AsyncClient, controller: AdmissionController, release: asyncio.Event) -> None:
+        holding = asyncio.ensure_future(client.get("/panels/slow"))
+        await _until_admitted(controller.read)
+        shed = await client.get("/panels/slow")
+        assert shed.status_code == 503
+        assert int(shed.headers["Retry-After"]) >= 1
+        assert controller.read.shed_queue_full == 1
+        # Writes have their own limiter and are still admitted.
+        release.set()
+        assert (await client.post("/panels/slow")).status_code == 200
+        assert (await holding).status_code == 200
+
+    run(test)
+
+
+def test_read_past_its_deadline_gets_504() -> None:
+    async def test(client: httpx.AsyncClient, controller: AdmissionController, release: asyncio.Event) -> None:
+        response = await client.get("/panels/slow", headers={"X-Request-Timeout": "0.05"})
+        assert response.status_code == 504
+        # The abandoned read gave its slot back.
+        assert controller.read.in_flight == 0
+
+    run(test)
+
+
+def test_write_runs_to_completion_past_its_deadline() -> None:
+    async def test(client: httpx.AsyncClient, controller: AdmissionController, release: asyncio.Event) -> None:
+        write = asyncio.ensure_future(client.post("/panels/slow", headers={"X-Request-Timeout": "0.05"}))
+        await asyncio.sleep(0.2)
+        assert not write.done()
+        release.set()
+        assert (await write).status_code == 200
+
+    run(test)
+
+
+def test_request_timeout_header_bounds_the_queue_wait() -> None:
+    async def test(client: httpx.AsyncClient, controller: AdmissionController, release: asyncio.Event) -> None:
+        # An expired deadline is shed before it queues.
+        response = await client.get("/panels/slow", headers={"X-Request-Timeout": "0"})
+        assert response.status_code == 503
+        assert controller.read.shed_deadline == 1
+        # A malformed header is ignored.
+        release.set()
+        response = await client.get("/panels/slow", headers={"X-Request-Timeout": "soon"})
+        assert response.status_code == 200
+
+    run(test)
+
+
+def test_live_feed_is_not_limited() -> None:
+    async def test(client: httpx.AsyncClient, controller: AdmissionController, release: asyncio.Event) -> None:
+        holding = asyncio.ensure_future(client.get("/panels/slow"))
+        await _until_admitted(controller.read)
+        feed = asyncio.ensure_future(client.get("/panels/events"))
+        await asyncio.sleep(0.05)
+        release.set()
+        assert (await feed).status_code == 200
+        assert (await holding).status_code == 200
+        assert controller.read.admitted == 1
+
+    run(test)
@@ -0,0 +1,93 @@
+import json
+from uuid import uuid4
+
+from app.infrastructure.settings import get_settings
+
+
+def _panel(location: str, index: int) -> dict:
+    return {
+        "name": f"Bulk panel {index}",
+        "location": location,
+        "brand": "Schneider",
+        "amperage_capacity": 100 + index,
+        "year_manufactured": 2000,
+        "year_installed": 2010
+    }
+
+
+def _items(location: str) -> list:
+    # Item 1 lacks its name, item 3 was installed before it was manufactured.
+    items = [_panel(location, index) for index in range(4)]
+    del items[1]["name"]
+    items[3]["year_installed"] = 1990
+    return items
+
+
+async def _count(client, location: str) -> int:
+    return len((await client.get("/panels", params={"location": location})).json()["panels"])
+
+
+def test_partial_mode_inserts_valid_items_and_reports_the_others(run_api) -> None:
+    async def test(client, container) -> None:
+        location = f"Bulk {uuid4()}"
+        response = await client.post("/panels:bulk", json=_items(location))
+        assert response.status_code == 201
+        result = response.json()
+        assert [item["index"] for item in result["created"]] == [0, 2]
+        assert [error["index"] for error in result["errors"]] == [1, 3]
+        assert "name" in result["errors"][0]["detail"]
+        assert result["created_count"] == 2 and result["error_count"] == 2
+        assert await _count(client, location) == 2
+        created = await client.get(f"/panels/{result['created'][1]['id']}")
+        assert created.json()["name"] == "Bulk panel 2"
+
+    run_api(test)
+
+
+def test_atomic_mode_inserts_nothing_when_an_item_is_invalid(run_api) -> None:
+    async def test(client, container) -> None:
+        location = f"Bulk {uuid4()}"
+        response = await client.post("/panels:bulk", params={"mode": "atomic"}, json=_items(location))
+        assert response.status_code == 422
+        result = response.json()
+        assert result["created"] == [] and [error["index"] for error in result["errors"]] == [1, 3]
+        assert await _count(client, location) == 0
+
+        valid = [_panel(location, index) for index in range(3)]
+        response = await client.post("/panels:bulk", params={"mode": "atomic", "chunk_size": 2}, json=valid)
+        assert response.status_code == 201 and response.json()["created_count"] == 3
+        assert await _count(client, location) == 3
+
+    run_api(test)
+
+
+def test_ndjson_body_and_all_invalid_items(run_api) -> None:
+    async def test(client, container) -> None:
+        location = f"Bulk {uuid4()}"
+        body = "\n".join(json.dumps(item) for item in _items(location)) + "\n"
+        response = await client.post("/panels:bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+        assert response.status_code == 201 and response.json()["created_count"] == 2
+
+        # Nothing valid to insert is unprocessable in partial mode too.
+        invalid = [item for index, item in enumerate(_items(location)) if index in (1, 3)]
+        response = await client.post("/panels:bulk", json=invalid)
+        assert response.status_code == 422 and response.json()["error_count"] == 2
+
+    run_api(test)
+
+
+def test_malformed_empty_and_oversized_bodies_are_refused(run_api, monkeypatch) -> None:
+    async def test(client, container) -> None:
+        location = f"Bulk {uuid4()}"
+        assert (await client.post("/panels:bulk", content=b"[{", headers={"Content-Type": "application/json"})).status_code == 400
+        assert (await client.post("/panels:bulk", json=[])).status_code == 400
+        assert (await client.post("/panels:bulk", json={"name": "Not a list"})).status_code == 400
+
+        settings = get_settings()
+        monkeypatch.setattr(settings, "bulk_max_items", 2)
+        assert (await client.post("/panels:bulk", json=[_panel(location, index) for index in range(3)])).status_code == 413
+        monkeypatch.setattr(settings, "bulk_max_bytes", 100)
+        assert (await client.post("/panels:bulk", json=[_panel(location, 0)] * 2)).status_code == 413
+        assert await _count(client, location) == 0
+
+    run_api(test)
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import tempfile
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.infrastructure import db
+from app.infrastructure.repositories.electronic_panel_coalescing_repository import CoalescingElectronicPanelRepository
+from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import ElectronicPanelSQLModelRepository
+from app.infrastructure.settings import Settings
+
+
+class GatedRepository(ElectronicPanelSQLModelRepository):
+    """
+    Holds every count() until the gate opens, so a test can keep a read in flight.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.gate = asyncio.Event()
+        self.count_calls = 0
+
+    async def count(self, filters: PanelFilter) -> int:
+        self.count_calls += 1
+        await self.gate.wait()
+        return await super().count(filters)
+
+
+def _panel() -> ElectronicPanel:
+    return ElectronicPanel(
+        id=uuid4(),
+        name="Panel",
+        location="Building A",
+        amperage_capacity=100.0,
+        year_manufactured=2000,
+        year_installed=2010
+    )
+
+
+async def _settle() -> None:
+    # Let the callers and the flight tasks they start run up to the gate.
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def run(test) -> None:
+    async def main() -> None:
+        path = os.path.join(tempfile.mkdtemp(prefix="rems-coalescing-"), "panels.db")
+        engine = db.create_engine(Settings(database_url=f"sqlite+aiosqlite:///{path}", metrics_enabled=False))
+        try:
+            await db.init_engine(engine)
+            gated = GatedRepository(async_sessionmaker(bind=engine, expire_on_commit=False))
+            await test(gated, CoalescingElectronicPanelRepository(gated))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_concurrent_identical_reads_share_one_call() -> None:
+    async def test(gated: GatedRepository, repository: CoalescingElectronicPanelRepository) -> None:
+        first = asyncio.ensure_future(repository.count(PanelFilter()))
+        second = asyncio.ensure_future(repository.count(PanelFilter()))
+        await _settle()
+        gated.gate.set()
+        assert await asyncio.gather(first, second) == [0, 0]
+        assert gated.count_calls == 1
+        assert repository.coalesced == 1
+
+    run(test)
+
+
+def test_read_started_after_a_write_is_not_coalesced_onto_an_older_read() -> None:
+    async def test(gated: GatedRepository, repository: CoalescingElectronicPanelRepository) -> None:
+        before_write = asyncio.ensure_future(repository.count(PanelFilter()))
+        await _settle()
+        await repository.create(_panel())
+        after_write = asyncio.ensure_future(repository.count(PanelFilter()))
+        await _settle()
+        # The first read is still in flight, but it started before the write finished.
+        assert not before_write.done()
+        assert gated.count_calls == 2
+        assert repository.coalesced == 0
+        gated.gate.set()
+        await before_write
+        assert await after_write == 1
+
+    run(test)
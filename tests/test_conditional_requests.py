@@ -0,0 +1,69 @@
+from uuid import uuid4
+
+
+def _panel(location: str) -> dict:
+    return {
+        "name": "Conditional panel",
+        "location": location,
+        "brand": "Schneider",
+        "amperage_capacity": 100,
+        "year_manufactured": 2000,
+        "year_installed": 2010
+    }
+
+
+def test_unchanged_panel_is_not_modified(run_api) -> None:
+    async def test(client, container) -> None:
+        panel_id = (await client.post("/panels", json=_panel(f"Conditional {uuid4()}"))).json()["id"]
+        first = await client.get(f"/panels/{panel_id}")
+        etag = first.headers["ETag"]
+
+        cached = await client.get(f"/panels/{panel_id}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304 and cached.content == b""
+        assert cached.headers["ETag"] == etag
+        assert cached.headers["Last-Modified"] == first.headers["Last-Modified"]
+        # Weak and listed tags match too.
+        assert (await client.get(f"/panels/{panel_id}", headers={"If-None-Match": f'"v0", W/{etag}'})).status_code == 304
+
+        assert (await client.put(f"/panels/{panel_id}", json={"name": "Renamed"})).status_code == 200
+        changed = await client.get(f"/panels/{panel_id}", headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+        assert changed.json()["name"] == "Renamed"
+
+    run_api(test)
+
+
+def test_unchanged_list_is_not_modified_until_a_write(run_api) -> None:
+    async def test(client, container) -> None:
+        location = f"Conditional {uuid4()}"
+        await client.post("/panels", json=_panel(location))
+        etag = (await client.get("/panels", params={"location": location})).headers["ETag"]
+
+        cached = await client.get("/panels", params={"location": location}, headers={"If-None-Match": etag})
+        assert cached.status_code == 304 and cached.headers["ETag"] == etag
+
+        # Any write moves the collection ETag, whatever panels it touched.
+        await client.post("/panels", json=_panel(f"Conditional {uuid4()}"))
+        changed = await client.get("/panels", params={"location": location}, headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+    run_api(test)
+
+
+def test_update_with_a_stale_if_match_fails_the_precondition(run_api) -> None:
+    async def test(client, container) -> None:
+        panel_id = (await client.post("/panels", json=_panel(f"Conditional {uuid4()}"))).json()["id"]
+        stale = (await client.get(f"/panels/{panel_id}")).headers["ETag"]
+
+        updated = await client.put(f"/panels/{panel_id}", json={"name": "First"}, headers={"If-Match": stale})
+        assert updated.status_code == 200 and updated.headers["ETag"] != stale
+
+        conflict = await client.put(f"/panels/{panel_id}", json={"name": "Second"}, headers={"If-Match": stale})
+        assert conflict.status_code == 412
+        assert (await client.get(f"/panels/{panel_id}")).json()["name"] == "First"
+        # A malformed tag fails the precondition as well; "*" matches any version.
+        malformed = await client.put(f"/panels/{panel_id}", json={"name": "Second"}, headers={"If-Match": "v2"})
+        assert malformed.status_code == 412
+        assert (await client.put(f"/panels/{panel_id}", json={"name": "Second"}, headers={"If-Match": "*"})).status_code == 200
+
+    run_api(test)
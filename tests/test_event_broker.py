@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
+from uuid import uuid4
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_event import PanelEvent, PanelEventType
+from app.domain.model.value_objects.panel_revision import PanelPlacement
+from app.domain.model.value_objects.panel_state import PanelState
+from app.infrastructure.event_broker import PanelEventBroker
+from app.interfaces.rest.routers.panel_events_router import _sse_stream
+
+
+def _event(
+    event_type: PanelEventType,
+    location: str = "Building A",
+    state: PanelState = PanelState.OPERATIVE,
+    previous: Optional[PanelPlacement] = None
+) -> PanelEvent:
+    panel = ElectronicPanel(
+        id=uuid4(),
+        name="Panel",
+        location=location,
+        amperage_capacity=100.0,
+        state=state,
+        year_manufactured=2000,
+        year_installed=2010
+    )
+    if event_type == PanelEventType.DELETED:
+        return PanelEvent(event_type, panel.id, None, datetime.now(timezone.utc))
+    return PanelEvent(event_type, panel.id, panel, datetime.now(timezone.utc), previous)
+
+
+async def _frames(stream: AsyncIterator[bytes], count: int) -> List[bytes]:
+    return [await asyncio.wait_for(anext(stream), 1.0) for _ in range(count)]
+
+
+def test_resume_token_replays_the_events_after_it() -> None:
+    async def test() -> None:
+        broker = PanelEventBroker(buffer_size=8)
+        events = [_event(PanelEventType.CREATED) for _ in range(3)]
+        broker.publish(events)
+
+        subscription = broker.subscribe(resume_token=broker.resume_token(1))
+        assert not subscription.reset and subscription.start_seq == 1
+        stream = _sse_stream(broker, subscription, heartbeat_seconds=5.0)
+        opening, *replayed = await _frames(stream, 3)
+        assert opening.startswith(f"id: {broker.resume_token(1)}\nevent: ready\n".encode())
+        assert [frame.split(b"\n")[0] for frame in replayed] == [
+            f"id: {broker.resume_token(seq)}".encode() for seq in (2, 3)
+        ]
+        assert str(events[1].panel_id).encode() in replayed[0]
+
+        # Live events follow the replay.
+        broker.publish([_event(PanelEventType.DELETED)])
+        assert (await _frames(stream, 1))[0].startswith(f"id: {broker.resume_token(4)}\nevent: deleted\n".encode())
+        await stream.aclose()
+        assert not broker.has_subscribers
+
+    asyncio.run(test())
+
+
+def test_unusable_resume_token_opens_with_a_reset() -> None:
+    broker = PanelEventBroker(buffer_size=2)
+    broker.publish([_event(PanelEventType.CREATED) for _ in range(4)])
+    # Token of an event no longer buffered, and one issued by another broker.
+    assert broker.subscribe(resume_token=broker.resume_token(1)).reset
+    assert broker.subscribe(resume_token=PanelEventBroker().resume_token(3)).reset
+    assert not broker.subscribe(resume_token=broker.resume_token(2)).reset
+    # A write published without events breaks replay across it.
+    broker.mark_unpublished()
+    assert broker.subscribe(resume_token=broker.resume_token(4)).reset
+
+
+def test_slow_subscriber_is_evicted_without_blocking_the_writer() -> None:
+    async def test() -> None:
+        broker = PanelEventBroker(queue_size=2)
+        slow = broker.subscribe()
+        stream = _sse_stream(broker, slow, heartbeat_seconds=5.0)
+        await _frames(stream, 1)
+        fast = broker.subscribe()
+        broker.publish([_event(PanelEventType.CREATED) for _ in range(2)])
+        assert [(await fast.next()).seq for _ in range(2)] == [1, 2]
+
+        broker.publish([_event(PanelEventType.CREATED)])
+        assert slow.evicted and broker.evicted == 1
+        assert broker.stats()["subscribers"] == 1
+        # The backlog is dropped: the client reconnects from the last token it received.
+        assert (await _frames(stream, 1))[0] == b'event: evicted\ndata: {"type":"evicted"}\n\n'
+        assert (await fast.next()).seq == 3
+
+    asyncio.run(test())
+
+
+def test_updates_match_filters_on_the_previous_placement() -> None:
+    broker = PanelEventBroker()
+    at_a = broker.subscribe(location="Building A")
+    in_maintenance = broker.subscribe(state=PanelState.MAINTENANCE)
+
+    moved_out = _event(PanelEventType.UPDATED, "Building B", previous=PanelPlacement("Building A", PanelState.OPERATIVE))
+    assert at_a.matches(moved_out) and not in_maintenance.matches(moved_out)
+    repaired = _event(
+        PanelEventType.UPDATED,
+        "Building B",
+        PanelState.OPERATIVE,
+        previous=PanelPlacement("Building B", PanelState.MAINTENANCE)
+    )
+    assert in_maintenance.matches(repaired) and not at_a.matches(repaired)
+    elsewhere = _event(PanelEventType.UPDATED, "Building B", previous=PanelPlacement("Building C", PanelState.OPERATIVE))
+    assert not at_a.matches(elsewhere) and not in_maintenance.matches(elsewhere)
+    # Creations only match where the panel is now; deletions reach everyone.
+    assert not at_a.matches(_event(PanelEventType.CREATED, "Building B"))
+    assert at_a.matches(_event(PanelEventType.DELETED)) and in_maintenance.matches(_event(PanelEventType.DELETED))
+
+    broker.publish([moved_out, repaired, elsewhere])
+    assert at_a.queue.qsize() == 1 and in_maintenance.queue.qsize() == 1
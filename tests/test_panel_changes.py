@@ -0,0 +1,110 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import httpx
+
+NO_RETENTION = timedelta(0)
+CLIENT_TTL = timedelta(days=30)
+
+
+def _panel(index: int) -> dict:
+    return {
+        "name": f"Synced panel {index}",
+        "location": f"Sync test {uuid4()}",
+        "brand": "Schneider",
+        "amperage_capacity": 100 + index,
+        "year_manufactured": 2000,
+        "year_installed": 2010
+    }
+
+
+async def _head(client: httpx.AsyncClient) -> int:
+    """
+    Sync from 0 to the end of the log and return the position reached.
+    """
+    since, has_more = 0, True
+    while has_more:
+        page = (await client.get("/panels/changes", params={"since": since, "limit": 5000})).json()
+        since, has_more = page["next_since"], page["has_more"]
+    return since
+
+
+async def _create(client: httpx.AsyncClient, index: int) -> str:
+    response = await client.post("/panels", json=_panel(index))
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_changes_are_paged_in_commit_order_with_the_latest_state(run_api) -> None:
+    async def test(client, container) -> None:
+        head = await _head(client)
+        ids = [await _create(client, index) for index in range(3)]
+        assert (await client.put(f"/panels/{ids[0]}", json={"name": "Renamed"})).status_code == 200
+
+        first = (await client.get("/panels/changes", params={"since": head, "limit": 2})).json()
+        assert [change["panel_id"] for change in first["changes"]] == ids[:2]
+        assert first["has_more"]
+        second = (await client.get("/panels/changes", params={"since": first["next_since"], "limit": 2})).json()
+        assert [change["panel_id"] for change in second["changes"]] == [ids[2], ids[0]]
+        assert not second["has_more"]
+        seqs = [change["seq"] for change in first["changes"] + second["changes"]]
+        assert seqs == sorted(seqs) and seqs[0] > head and second["next_since"] == seqs[-1]
+
+        # On one page a panel appears once, where its latest change falls.
+        page = (await client.get("/panels/changes", params={"since": head})).json()
+        assert [change["panel_id"] for change in page["changes"]] == [ids[1], ids[2], ids[0]]
+        assert page["changes"][-1]["panel"]["name"] == "Renamed"
+
+    run_api(test)
+
+
+def test_deleted_panel_is_returned_as_a_tombstone(run_api) -> None:
+    async def test(client, container) -> None:
+        head = await _head(client)
+        panel_id = await _create(client, 0)
+        assert (await client.delete(f"/panels/{panel_id}")).status_code == 200
+
+        page = (await client.get("/panels/changes", params={"since": head})).json()
+        assert len(page["changes"]) == 1
+        tombstone = page["changes"][0]
+        assert tombstone["panel_id"] == panel_id
+        assert tombstone["type"] == "delete" and tombstone["panel"] is None
+
+    run_api(test)
+
+
+def test_sync_from_before_compacted_tombstones_is_gone(run_api) -> None:
+    async def test(client, container) -> None:
+        head = await _head(client)
+        panel_id = await _create(client, 0)
+        assert (await client.delete(f"/panels/{panel_id}")).status_code == 200
+
+        # Without a recent client holding it, the tombstone is pruned at once.
+        await container.panel_service.compact_changes(NO_RETENTION, timedelta(0))
+        assert (await client.get("/panels/changes", params={"since": head})).status_code == 410
+        # A resync from 0 is always served, and ends where the next delta sync is too.
+        assert (await client.get("/panels/changes", params={"since": 0})).status_code == 200
+        resynced = await _head(client)
+        assert (await client.get("/panels/changes", params={"since": resynced})).status_code == 200
+
+    run_api(test)
+
+
+def test_lagging_sync_client_holds_back_compaction(run_api) -> None:
+    async def test(client, container) -> None:
+        client_id = f"lagging-{uuid4()}"
+        head = await _head(client)
+        await client.get("/panels/changes", params={"since": head, "client_id": client_id})
+        panel_id = await _create(client, 0)
+        assert (await client.delete(f"/panels/{panel_id}")).status_code == 200
+
+        await container.panel_service.compact_changes(NO_RETENTION, CLIENT_TTL)
+        page = (await client.get("/panels/changes", params={"since": head, "client_id": client_id})).json()
+        assert [change["type"] for change in page["changes"]] == ["delete"]
+
+        # Once the client has synced past it, the tombstone can go.
+        await client.get("/panels/changes", params={"since": page["next_since"], "client_id": client_id})
+        await container.panel_service.compact_changes(NO_RETENTION, CLIENT_TTL)
+        assert (await client.get("/panels/changes", params={"since": head})).status_code == 410
+
+    run_api(test)
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.application.internal.services.electronic_panel_service_impl import ElectronicPanelServiceImpl
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_import import PanelImportFormat, PanelImportStatus
+from app.infrastructure import db
+from app.infrastructure.panel_importer import PanelImporter, PanelImportLeaseLostError
+from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import ElectronicPanelSQLModelRepository
+from app.infrastructure.settings import Settings
+from app.infrastructure.tables import PanelImportJob
+
+CSV_HEADER = "name,location,brand,amperage_capacity,state,year_manufactured,year_installed\n"
+
+
+def _csv(location: str, rows: int, invalid=()) -> bytes:
+    lines = [CSV_HEADER]
+    for row in range(1, rows + 1):
+        # Invalid rows were installed before they were manufactured.
+        installed = 1990 if row in invalid else 2010
+        lines.append(f'"Imported, {row}",{location},Schneider,{100 + row},operative,2000,{installed}\n')
+    return "".join(lines).encode()
+
+
+async def _body(data: bytes):
+    yield data
+
+
+class StallingService(ElectronicPanelServiceImpl):
+    """
+    Inserts the panels of the `stall_at`-th create_panels call, then hangs as if the process died.
+    """
+
+    def __init__(self, *args, stall_at: int, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stall_at = stall_at
+        self.calls = 0
+        self.stalled = asyncio.Event()
+
+    async def create_panels(self, panels, chunk_size):
+        self.calls += 1
+        result = await super().create_panels(panels, chunk_size)
+        if self.calls == self.stall_at:
+            self.stalled.set()
+            await asyncio.Event().wait()
+        return result
+
+
+async def _finished(importer: PanelImporter, job_id: str) -> PanelImportJob:
+    for _ in range(500):
+        job = await importer.get(job_id)
+        if job.status in (PanelImportStatus.COMPLETED, PanelImportStatus.FAILED):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Import job {job_id} did not finish")
+
+
+def run(test) -> None:
+    async def main() -> None:
+        directory = tempfile.mkdtemp(prefix="rems-imports-")
+        engine = db.create_engine(Settings(database_url=f"sqlite+aiosqlite:///{directory}/panels.db", metrics_enabled=False))
+        try:
+            await db.init_engine(engine)
+            session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+            await test(session_factory, os.path.join(directory, "imports"))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def _importer(service, session_factory, spool_dir: str) -> PanelImporter:
+    return PanelImporter(service, session_factory, spool_dir=spool_dir, chunk_rows=4, validation_workers=0)
+
+
+def test_csv_and_ndjson_files_are_imported_with_an_error_report(run_api) -> None:
+    async def test(client, container) -> None:
+        location = f"Import {uuid4()}"
+        response = await client.post("/panels/imports", content=_csv(location, 6, invalid={2, 5}), headers={"Content-Type": "text/csv"})
+        assert response.status_code == 202
+        assert response.headers["Location"] == f"/panels/imports/{response.json()['id']}"
+        job = await _finished(container.panel_importer, response.json()["id"])
+        assert job.status == PanelImportStatus.COMPLETED
+        resource = (await client.get(response.headers["Location"])).json()
+        assert resource["rows_read"] == 6 and resource["rows_imported"] == 4 and resource["rows_rejected"] == 2
+        assert resource["progress"] == 1.0
+        assert datetime.fromisoformat(resource["finished_at"].replace("Z", "+00:00")).utcoffset() == timedelta(0)
+
+        report = await client.get(resource["error_report_url"])
+        rejected = [json.loads(line) for line in report.text.splitlines()]
+        assert [item["row"] for item in rejected] == [2, 5]
+        assert "year_installed" in rejected[0]["detail"]
+        names = sorted(panel["name"] for panel in (await client.get("/panels", params={"location": location})).json()["panels"])
+        assert names == ["Imported, 1", "Imported, 3", "Imported, 4", "Imported, 6"]
+
+        ndjson = "\n".join(
+            json.dumps({"name": f"Line {row}", "location": location, "amperage_capacity": 100, "year_manufactured": 2000, "year_installed": 2010})
+            for row in range(3)
+        ) + "\nnot json\n"
+        response = await client.post("/panels/imports", content=ndjson, headers={"Content-Type": "application/x-ndjson"})
+        job = await _finished(container.panel_importer, response.json()["id"])
+        assert (job.rows_imported, job.rows_rejected) == (3, 1)
+
+        assert (await client.post("/panels/imports", content=b"name\n", headers={"Content-Type": "text/plain"})).status_code == 415
+
+    run_api(test)
+
+
+def test_interrupted_import_resumes_without_duplicates() -> None:
+    async def test(session_factory, spool_dir: str) -> None:
+        repository = ElectronicPanelSQLModelRepository(session_factory)
+        stalling = StallingService(repository, stall_at=2)
+        first = _importer(stalling, session_factory, spool_dir)
+        await first.start()
+        job = await first.submit(PanelImportFormat.CSV, _body(_csv("Resumed", 10, invalid={3, 6})))
+        await asyncio.wait_for(stalling.stalled.wait(), 5.0)
+        # Stopped after inserting the second chunk, before recording it.
+        await first.stop()
+        interrupted = await first.get(job.id)
+        assert interrupted.status == PanelImportStatus.RUNNING and interrupted.lease_owner is None
+        assert interrupted.rows_read == 4
+
+        second = _importer(ElectronicPanelServiceImpl(repository), session_factory, spool_dir)
+        await second.start()
+        try:
+            resumed = await _finished(second, job.id)
+        finally:
+            await second.stop()
+        assert resumed.status == PanelImportStatus.COMPLETED, resumed.detail
+        assert (resumed.rows_read, resumed.rows_imported, resumed.rows_rejected) == (10, 8, 2)
+        assert await repository.count(PanelFilter(location="Resumed")) == 8
+        # Rejected rows of the re-run chunk are reported once.
+        with open(second.error_report_path(job.id)) as report:
+            assert [json.loads(line)["row"] for line in report] == [3, 6]
+
+    run(test)
+
+
+def test_worker_that_lost_its_lease_cannot_write_the_job() -> None:
+    async def test(session_factory, spool_dir: str) -> None:
+        service = ElectronicPanelServiceImpl(ElectronicPanelSQLModelRepository(session_factory))
+        stale = _importer(service, session_factory, spool_dir)
+        current = _importer(service, session_factory, spool_dir)
+        os.makedirs(spool_dir)
+        job = await stale.submit(PanelImportFormat.CSV, _body(_csv("Leased", 2)))
+
+        stale_claim = await stale._claim()
+        assert await current._claim() is None
+        async with session_factory() as session:
+            async with session.begin():
+                expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+                await session.execute(update(PanelImportJob).where(PanelImportJob.id == job.id).values(lease_expires_at=expired))
+        current_claim = await current._claim()
+        assert current_claim.id == job.id and current_claim.lease_owner != stale_claim.lease_owner
+
+        with pytest.raises(PanelImportLeaseLostError):
+            await stale._save(stale_claim, rows_read=99)
+        await stale._release(stale_claim)
+        await current._save(current_claim, rows_read=1)
+        saved = await current.get(job.id)
+        assert saved.rows_read == 1 and saved.lease_owner == current_claim.lease_owner
+
+    run(test)
@@ -0,0 +1,71 @@
+import asyncio
+import uuid
+from typing import List
+
+import pytest
+from sqlalchemy.sql import Executable
+from sqlmodel import func, select
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_state import PanelState
+from app.infrastructure import db
+from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import apply_panel_filter, page_statement
+
+PAGE_SIZE = 51
+
+
+async def _run(statement: Executable) -> List[str]:
+    try:
+        return await db.explain_query_plan(statement)
+    finally:
+        # Each test runs its own event loop; pooled connections must not outlive it.
+        await db.dispose_engines()
+
+
+def query_plan(statement: Executable) -> str:
+    return "\n".join(asyncio.run(_run(statement)))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def database() -> None:
+    async def init() -> None:
+        await db.init_db()
+        await db.dispose_engines()
+
+    asyncio.run(init())
+
+
+@pytest.mark.parametrize(
+    ("filters", "index"),
+    [
+        (PanelFilter(state=PanelState.OPERATIVE), "ix_electronic_panels_state_id"),
+        (PanelFilter(location="Building A - Basement"), "ix_electronic_panels_location_id"),
+        (PanelFilter(brand="Siemens"), "ix_electronic_panels_brand_id"),
+    ]
+)
+@pytest.mark.parametrize("after_id", [None, uuid.UUID(int=1)])
+def test_keyset_page_uses_filter_index(filters: PanelFilter, index: str, after_id: uuid.UUID) -> None:
+    plan = query_plan(page_statement(filters, PAGE_SIZE, after_id))
+    assert f"USING INDEX {index}" in plan
+    # The (column, id) index delivers rows in page order, so no sort is needed.
+    assert "TEMP B-TREE" not in plan
+
+
+def test_year_manufactured_range_page_uses_index() -> None:
+    filters = PanelFilter(year_manufactured_from=2000, year_manufactured_to=2004)
+    plan = query_plan(page_statement(filters, PAGE_SIZE))
+    assert "USING INDEX ix_electronic_panels_year_manufactured" in plan
+
+
+@pytest.mark.parametrize(
+    ("filters", "index"),
+    [
+        (PanelFilter(year_manufactured_from=2000, year_manufactured_to=2004), "ix_electronic_panels_year_manufactured"),
+        (PanelFilter(year_installed_from=2010, year_installed_to=2015), "ix_electronic_panels_year_installed"),
+    ]
+)
+def test_year_range_count_uses_index(filters: PanelFilter, index: str) -> None:
+    statement = apply_panel_filter(select(func.count()).select_from(ElectronicPanel), filters)
+    plan = query_plan(statement)
+    assert f"USING COVERING INDEX {index}" in plan or f"USING INDEX {index}" in plan
@@ -0,0 +1,93 @@
+import gzip
+from uuid import uuid4
+
+from app.infrastructure.response_cache import GZIP_MIN_BYTES, ResponseCache
+
+
+def _panel(location: str, index: int) -> dict:
+    return {
+        "name": f"Cached panel {index}",
+        "location": location,
+        "brand": "Schneider",
+        "amperage_capacity": 100 + index,
+        "year_manufactured": 2000,
+        "year_installed": 2010
+    }
+
+
+def test_least_recently_used_entries_are_evicted_over_the_byte_budget() -> None:
+    cache = ResponseCache(max_bytes=400)
+    for key in ("a", "b", "c"):
+        cache.put(key, 1, b"x" * 100)
+    assert cache.get("a", 1) is not None
+    for key in ("d", "e", "f"):
+        cache.put(key, 1, b"x" * 100)
+    # "b" and "c" were used least recently; "a" was read after them.
+    assert cache.get("b", 1) is None and cache.get("c", 1) is None
+    assert all(cache.get(key, 1) is not None for key in ("a", "d", "e", "f"))
+    assert cache.stats()["bytes"] <= 400 and cache.evictions == 2
+    # Entries over a quarter of the budget are served but never stored.
+    cache.put("large", 1, b"x" * 101)
+    assert cache.get("large", 1) is None
+
+
+def test_newer_generation_replaces_every_entry() -> None:
+    cache = ResponseCache(max_bytes=1000)
+    cache.put("a", 1, b"old")
+    assert cache.get("a", 2) is None
+    cache.put("b", 2, b"new")
+    assert cache.get("a", 1) is None
+    # A page encoded for an older generation is not kept.
+    cache.put("a", 1, b"old")
+    assert cache.get("a", 2) is None and cache.get("b", 2).body == b"new"
+
+
+def test_large_bodies_are_kept_gzip_encoded() -> None:
+    cache = ResponseCache(max_bytes=1 << 20)
+    body = b'{"panels": [' + b'{"name": "Panel"},' * 200 + b']}'
+    entry = cache.put("list", 1, body)
+    assert len(body) >= GZIP_MIN_BYTES
+    assert gzip.decompress(entry.gzip_body) == body
+    assert cache.put("small", 1, b"{}").gzip_body is None
+
+
+def test_list_is_not_served_from_cache_after_a_write(run_api) -> None:
+    location = f"Cache test {uuid4()}"
+
+    async def test(client, container) -> None:
+        cache = container.response_cache
+        for index in range(2):
+            assert (await client.post("/panels", json=_panel(location, index))).status_code == 201
+        first = await client.get("/panels", params={"location": location})
+        hits = cache.hits
+        again = await client.get("/panels", params={"location": location})
+        assert cache.hits == hits + 1
+        assert again.content == first.content and again.headers["ETag"] == first.headers["ETag"]
+
+        assert (await client.post("/panels", json=_panel(location, 2))).status_code == 201
+        after_write = await client.get("/panels", params={"location": location})
+        assert cache.hits == hits + 1
+        assert after_write.headers["ETag"] != first.headers["ETag"]
+        assert len(after_write.json()["panels"]) == 3
+
+    run_api(test)
+
+
+def test_list_is_gzip_encoded_for_clients_that_accept_it(run_api) -> None:
+    location = f"Gzip test {uuid4()}"
+
+    async def test(client, container) -> None:
+        for index in range(10):
+            await client.post("/panels", json=_panel(location, index))
+        for _ in range(2):
+            # Encoded on the miss and served from the cache on the hit, the same way.
+            response = await client.get("/panels", params={"location": location}, headers={"Accept-Encoding": "gzip"})
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert response.headers["Vary"] == "Accept-Encoding"
+            assert len(response.json()["panels"]) == 10
+        identity = await client.get("/panels", params={"location": location}, headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in identity.headers
+        assert identity.headers["Vary"] == "Accept-Encoding"
+        assert identity.json() == response.json()
+
+    run_api(test)
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import tempfile
+from datetime import timedelta
+from typing import Dict, List
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_change import PanelChangeType
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_state import PanelState
+from app.infrastructure import db
+from app.infrastructure.repositories.electronic_panel_sharded_repository import (
+    ShardedElectronicPanelRepository,
+    main_metadata
+)
+from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import ElectronicPanelSQLModelRepository
+from app.infrastructure.settings import Settings
+
+SHARD_COUNT = 3
+
+
+def _panel(index: int) -> ElectronicPanel:
+    return ElectronicPanel(
+        id=uuid4(),
+        name=f"Panel {index}",
+        location=f"Building {index % 2}",
+        amperage_capacity=100.0,
+        state=PanelState.OPERATIVE,
+        year_manufactured=2000,
+        year_installed=2010
+    )
+
+
+def _engine(directory: str, name: str) -> AsyncEngine:
+    url = f"sqlite+aiosqlite:///{os.path.join(directory, name)}"
+    return db.create_engine(Settings(database_url=url, metrics_enabled=False))
+
+
+def _session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def run(test) -> None:
+    async def main() -> None:
+        directory = tempfile.mkdtemp(prefix="rems-shards-")
+        main_engine = _engine(directory, "main.db")
+        shard_engines = [_engine(directory, f"shard{index}.db") for index in range(SHARD_COUNT)]
+        try:
+            for engine in [main_engine, *shard_engines]:
+                await db.init_engine(engine)
+            async with main_engine.begin() as conn:
+                await conn.run_sync(main_metadata.create_all)
+            repository = ShardedElectronicPanelRepository(
+                [ElectronicPanelSQLModelRepository(_session_factory(engine)) for engine in shard_engines],
+                _session_factory(main_engine)
+            )
+            await repository.init_change_cursors()
+            await test(repository)
+        finally:
+            for engine in [main_engine, *shard_engines]:
+                await engine.dispose()
+
+    asyncio.run(main())
+
+
+async def _shard_counts(repository: ShardedElectronicPanelRepository) -> List[int]:
+    return [await shard.count(PanelFilter()) for shard in repository._shards]
+
+
+def test_keyset_pages_merge_across_shards() -> None:
+    async def test(repository: ShardedElectronicPanelRepository) -> None:
+        panels = [_panel(index) for index in range(40)]
+        await repository.create_many(panels, 10)
+        assert all(await _shard_counts(repository))
+        for filters in (PanelFilter(), PanelFilter(location="Building 1")):
+            expected = sorted(panel.id for panel in panels if filters.location in (None, panel.location))
+            seen: List[UUID] = []
+            after_id = None
+            while True:
+                page = await repository.list_page(filters, 7, after_id)
+                seen.extend(view.id for view in page)
+                if len(page) < 7:
+                    break
+                after_id = page[-1].id
+            assert seen == expected
+            assert await repository.count(filters) == len(expected)
+
+    run(test)
+
+
+def test_failed_bulk_create_rolls_back_the_other_shards() -> None:
+    async def test(repository: ShardedElectronicPanelRepository) -> None:
+        existing = _panel(0)
+        await repository.create(existing)
+        panels = [_panel(index) for index in range(1, 30)] + [existing]
+        assert len({repository.shard_of(panel.id) for panel in panels}) == SHARD_COUNT
+        with pytest.raises(IntegrityError):
+            await repository.create_many(panels, 10)
+        assert sum(await _shard_counts(repository)) == 1
+        assert await repository.get_by_id(existing.id) is not None
+
+    run(test)
+
+
+def test_panel_is_found_on_its_shard_until_deleted() -> None:
+    async def test(repository: ShardedElectronicPanelRepository) -> None:
+        panel = _panel(0)
+        await repository.create(panel)
+        counts = await _shard_counts(repository)
+        assert counts[repository.shard_of(panel.id)] == 1 and sum(counts) == 1
+        revision = await repository.patch(panel.id, {"name": "Renamed"}, expected_version=1)
+        assert revision.panel.name == "Renamed"
+        assert await repository.delete(panel.id)
+        assert await repository.get_by_id(panel.id) is None
+        assert not await repository.exists(panel.id)
+        assert await repository.get_version(panel.id) is None
+        assert not await repository.delete(panel.id)
+
+    run(test)
+
+
+def test_delta_sync_reads_the_merged_change_log() -> None:
+    async def test(repository: ShardedElectronicPanelRepository) -> None:
+        panels = [_panel(index) for index in range(12)]
+        await repository.create_many(panels, 5)
+        await repository.patch(panels[0].id, {"name": "Renamed"})
+        await repository.delete(panels[1].id)
+        # Sync reads serve only what has been merged.
+        assert (await repository.list_changes(0, 100))[1] == []
+        assert await repository.merge_changes() == 14
+        assert await repository.merge_changes() == 0
+
+        _, changes = await repository.list_changes(0, 100)
+        assert [change.seq for change in changes] == sorted(change.seq for change in changes)
+        state: Dict[UUID, str] = {}
+        for change in changes:
+            if change.type == PanelChangeType.DELETE:
+                state.pop(change.panel_id, None)
+            elif change.panel is not None:
+                # An upsert of a panel deleted since carries no panel; its tombstone follows.
+                state[change.panel_id] = change.panel.name
+        assert state == {panel.id: panel.name for panel in panels[2:]} | {panels[0].id: "Renamed"}
+        # Each panel's own changes keep the order its shard committed them in.
+        deleted = [change.type for change in changes if change.panel_id == panels[1].id]
+        assert deleted[-1] == PanelChangeType.DELETE
+
+        await repository.compact_changes(timedelta(days=1), timedelta(days=30))
+        assert [len((await shard.list_changes(0, 100))[1]) for shard in repository._shards] == [0] * SHARD_COUNT
+        _, compacted = await repository.list_changes(0, 100)
+        assert {change.panel_id for change in compacted} == {panel.id for panel in panels}
+
+    run(test)
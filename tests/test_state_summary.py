@@ -0,0 +1,61 @@
+import asyncio
+import os
+import tempfile
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.domain.model.entities.electronic_panel import ElectronicPanel
+from app.domain.model.value_objects.panel_filter import PanelFilter
+from app.domain.model.value_objects.panel_state import PanelState
+from app.domain.model.value_objects.panel_stats import PanelStatsDimension
+from app.infrastructure import db
+from app.infrastructure.repositories.electronic_panel_sqlmodel_repository import ElectronicPanelSQLModelRepository
+from app.infrastructure.settings import Settings
+
+
+def _panel(amperage: float) -> ElectronicPanel:
+    return ElectronicPanel(
+        id=uuid4(),
+        name="Panel",
+        location="Building A",
+        amperage_capacity=amperage,
+        year_manufactured=2000,
+        year_installed=2010
+    )
+
+
+def run(test) -> None:
+    async def main() -> None:
+        path = os.path.join(tempfile.mkdtemp(prefix="rems-summary-"), "panels.db")
+        engine = db.create_engine(Settings(database_url=f"sqlite+aiosqlite:///{path}", metrics_enabled=False))
+        try:
+            await db.init_engine(engine)
+            await test(ElectronicPanelSQLModelRepository(async_sessionmaker(bind=engine, expire_on_commit=False)))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_summary_totals_do_not_drift_through_updates_and_deletes() -> None:
+    async def test(repository: ElectronicPanelSQLModelRepository) -> None:
+        panels = [_panel(amperage) for amperage in (0.1, 0.2, 100.25)]
+        await repository.create_many(panels, 10)
+        for amperage in (0.3, 0.7, 63.1, 0.1):
+            await repository.patch(panels[0].id, {"amperage_capacity": amperage})
+        await repository.patch(panels[1].id, {"state": PanelState.MAINTENANCE})
+
+        # Unfiltered figures come from the summary, filtered ones from a scan; they agree.
+        [summary] = await repository.stats(PanelFilter(), [])
+        [scanned] = await repository.stats(PanelFilter(location="Building A"), [])
+        assert summary.panel_count == scanned.panel_count == 3
+        assert summary.amperage_total == round(scanned.amperage_total, 3) == 100.55
+        by_state = {group.dimensions["state"]: group.amperage_total for group in await repository.stats(PanelFilter(), [PanelStatsDimension.STATE])}
+        assert by_state == {PanelState.OPERATIVE: 100.35, PanelState.MAINTENANCE: 0.2}
+
+        assert await repository.delete_many([panel.id for panel in panels]) == 3
+        [emptied] = await repository.stats(PanelFilter(), [])
+        assert emptied.panel_count == 0 and emptied.amperage_total == 0
+
+    run(test)
@@ -0,0 +1,135 @@
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, List
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.infrastructure import db
+from app.infrastructure.settings import Settings
+from app.infrastructure.write_batcher import WriteBatcher, WriteBatcherClosedError
+
+
+def _engine() -> AsyncEngine:
+    path = os.path.join(tempfile.mkdtemp(prefix="rems-batcher-"), "batcher.db")
+    engine = db.create_engine(Settings(database_url=f"sqlite+aiosqlite:///{path}", metrics_enabled=False))
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record) -> None:
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    return engine
+
+
+async def _setup(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE parent (id INTEGER PRIMARY KEY)"))
+        # Checked at COMMIT, which lets a test make a whole batch fail to commit.
+        await conn.execute(text(
+            "CREATE TABLE child (id INTEGER PRIMARY KEY, "
+            "parent_id INTEGER REFERENCES parent (id) DEFERRABLE INITIALLY DEFERRED)"
+        ))
+
+
+def _insert(table: str, **values: Any):
+    async def operation(session: AsyncSession) -> int:
+        columns = ", ".join(values)
+        params = ", ".join(f":{name}" for name in values)
+        await session.execute(text(f"INSERT INTO {table} ({columns}) VALUES ({params})"), values)
+        return values["id"]
+
+    return operation
+
+
+async def _failing(session: AsyncSession) -> None:
+    await session.execute(text("INSERT INTO parent (id) VALUES (100)"))
+    raise ValueError("rejected")
+
+
+async def _ids(engine: AsyncEngine, table: str) -> List[int]:
+    async with engine.connect() as conn:
+        return list((await conn.execute(text(f"SELECT id FROM {table} ORDER BY id"))).scalars())
+
+
+def run(test) -> None:
+    async def main() -> None:
+        engine = _engine()
+        try:
+            await _setup(engine)
+            batcher = WriteBatcher(async_sessionmaker(bind=engine, expire_on_commit=False), max_wait_ms=50)
+            await batcher.start()
+            try:
+                await test(engine, batcher)
+            finally:
+                await batcher.stop()
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_failing_operation_only_fails_its_own_caller() -> None:
+    async def test(engine: AsyncEngine, batcher: WriteBatcher) -> None:
+        results = await asyncio.gather(
+            batcher.submit(_insert("parent", id=1)),
+            batcher.submit(_failing),
+            batcher.submit(_insert("parent", id=2)),
+            return_exceptions=True
+        )
+        assert results[0] == 1 and results[2] == 2
+        assert isinstance(results[1], ValueError)
+        assert batcher.batches == 1
+        # The failed operation's insert was rolled back to its savepoint; the others committed.
+        assert await _ids(engine, "parent") == [1, 2]
+
+    run(test)
+
+
+def test_commit_failure_fails_the_whole_batch() -> None:
+    async def test(engine: AsyncEngine, batcher: WriteBatcher) -> None:
+        results = await asyncio.gather(
+            batcher.submit(_insert("parent", id=1)),
+            batcher.submit(_insert("child", id=1, parent_id=999)),
+            return_exceptions=True
+        )
+        assert all(isinstance(result, Exception) for result in results)
+        assert batcher.failed_operations == 2
+        assert await _ids(engine, "parent") == []
+        # The batcher keeps serving later writes.
+        assert await batcher.submit(_insert("parent", id=3)) == 3
+
+    run(test)
+
+
+def test_submit_while_stopping_is_rejected_and_queued_writes_are_applied() -> None:
+    async def test(engine: AsyncEngine, batcher: WriteBatcher) -> None:
+        queued = asyncio.ensure_future(batcher.submit(_insert("parent", id=1)))
+        await asyncio.sleep(0)
+        stopping = asyncio.ensure_future(batcher.stop())
+        await asyncio.sleep(0)
+        with pytest.raises(WriteBatcherClosedError):
+            await batcher.submit(_insert("parent", id=2))
+        await asyncio.wait_for(stopping, 5)
+        assert await asyncio.wait_for(queued, 5) == 1
+        # A submit after stop() neither hangs nor restarts the batcher.
+        with pytest.raises(WriteBatcherClosedError):
+            await asyncio.wait_for(batcher.submit(_insert("parent", id=3)), 5)
+        assert not batcher.running
+        assert await _ids(engine, "parent") == [1]
+
+    run(test)
+
+
+def test_items_queued_behind_the_stop_marker_are_failed() -> None:
+    async def test(engine: AsyncEngine, batcher: WriteBatcher) -> None:
+        future = asyncio.get_running_loop().create_future()
+        batcher._queue.put_nowait(None)
+        batcher._queue.put_nowait((_insert("parent", id=1), future, time.perf_counter()))
+        with pytest.raises(WriteBatcherClosedError):
+            await asyncio.wait_for(future, 5)
+        assert await _ids(engine, "parent") == []
+
+    run(test)